@@ -9,10 +9,13 @@ Clean Architecture:
 - KISS: Simple capture loop, no complex logic
 """
 
+import os
 import sys
 import cv2
 import time
 import logging
+import argparse
+import numpy as np
 from pathlib import Path
 from datetime import datetime
 from typing import Optional
@@ -22,6 +25,10 @@ from pathlib import Path
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
+# Frame trace + arrival notifications (no external dependencies — always available)
+from common.frame_trace import FrameTrace
+from common.frame_events import FrameNotifier, FRAME_EVENT_PORT
+
 # Import database logger
 try:
     from common.db_logger import system_logger
@@ -35,11 +42,23 @@ except ImportError:
 CAMERA_ID = 0  # USB webcam (0 = default, 1 = external)
 BASE_DIR = Path(__file__).resolve().parent
 OUTPUT_DIR = BASE_DIR / "images" 
-OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 OUTPUT_FILE = OUTPUT_DIR / "latest.jpg"
 CAPTURE_INTERVAL = 1.0  # seconds
 IMAGE_WIDTH = 640
 IMAGE_HEIGHT = 480
+JPEG_QUALITY = 95  # cv2.imwrite default
+
+# MJPEG pass-through: ask the webcam for MJPG and write its JPEG bytes as-is
+# (no decode → BGR → re-encode). Falls back to decode mode automatically if
+# the backend still hands out pixels. False = classic decode + imencode.
+MJPEG_PASSTHROUGH = True
+CPU_REPORT_EVERY = 100  # frames between CPU-per-frame log lines
+NOTIFY_VISION_AI = True  # UDP "new frame" event so vision-ai detects on arrival
+
+# Replay (python camera_server.py --replay <video|image dir>)
+REPLAY_PACE = "recorded"  # "recorded" timestamps, fixed "fps", or "fast" (no waiting)
+REPLAY_FPS = 10.0         # used by "fps", and by "recorded" when a video has no timestamps
+REPLAY_MAX_GAP_S = 5.0    # "recorded": longer pauses in the recording are shortened to this
 
 # Logging setup
 logging.basicConfig(
@@ -49,6 +68,118 @@ logging.basicConfig(
 logger = logging.getLogger("camera")
 
 
+def _standard_huffman_tables() -> bytes:
+    """
+    DHT segments with the standard JPEG (Annex K) Huffman tables.
+
+    libjpeg emits exactly these tables when optimize_coding is off, so they
+    are taken from a tiny imencode() result instead of being hard-coded.
+    """
+    data = cv2.imencode(".jpg", np.zeros((8, 8, 3), np.uint8))[1].tobytes()
+    segments, pos = [], 2
+    while pos + 4 <= len(data) and data[pos + 1] != 0xDA:
+        length = int.from_bytes(data[pos + 2:pos + 4], "big")
+        if data[pos + 1] == 0xC4:
+            segments.append(data[pos:pos + 2 + length])
+        pos += 2 + length
+    return b"".join(segments)
+
+
+_STANDARD_DHT = _standard_huffman_tables()
+
+
+def ensure_huffman_tables(jpeg: bytes) -> bytes:
+    """
+    Make a webcam MJPEG frame a standalone JPEG.
+
+    Many UVC cameras omit the DHT segment (the tables are implied by the
+    MJPEG format). libjpeg-turbo copes, stricter decoders (e.g. the
+    dashboard's image viewers) reject the file. Only header markers are
+    scanned — the entropy-coded data is never touched.
+    """
+    pos = 2
+    while pos + 4 <= len(jpeg):
+        if jpeg[pos] != 0xFF:
+            return jpeg  # malformed — leave as is
+        marker = jpeg[pos + 1]
+        if marker == 0xC4:
+            return jpeg  # tables present
+        if marker == 0xDA:
+            return jpeg[:pos] + _STANDARD_DHT + jpeg[pos:]
+        pos += 2 + int.from_bytes(jpeg[pos + 2:pos + 4], "big")
+    return jpeg
+
+
+class Frame:
+    """
+    One captured frame: compressed JPEG bytes and/or BGR pixels.
+
+    Each representation is produced only when asked for:
+    - MJPEG pass-through → jpeg set, pixels decoded on first `.pixels` access
+    - Decode mode        → pixels set, JPEG encoded on first `to_jpeg()`
+
+    camera_server itself only ever needs the JPEG, so in pass-through mode
+    a frame is never decoded.
+    """
+
+    def __init__(self, jpeg: Optional[bytes] = None, pixels: Optional[np.ndarray] = None):
+        self._jpeg = jpeg
+        self._pixels = pixels
+
+    @property
+    def is_passthrough(self) -> bool:
+        """True if the JPEG bytes came straight from the camera."""
+        return self._jpeg is not None
+
+    @property
+    def pixels(self) -> Optional[np.ndarray]:
+        """BGR image (decoded lazily from the JPEG)."""
+        if self._pixels is None and self._jpeg is not None:
+            self._pixels = cv2.imdecode(np.frombuffer(self._jpeg, np.uint8), cv2.IMREAD_COLOR)
+        return self._pixels
+
+    def to_jpeg(self, quality: int = JPEG_QUALITY) -> Optional[bytes]:
+        """JPEG bytes (encoded lazily from the pixels)."""
+        if self._jpeg is None and self._pixels is not None:
+            ok, encoded = cv2.imencode(".jpg", self._pixels, [cv2.IMWRITE_JPEG_QUALITY, quality])
+            if ok:
+                self._jpeg = encoded.tobytes()
+        return self._jpeg
+
+
+class CpuMeter:
+    """
+    Camera-process CPU time per frame (time.process_time, all threads).
+
+    Compare MJPEG_PASSTHROUGH = True vs False: the log line every
+    CPU_REPORT_EVERY frames shows the saving directly.
+    """
+
+    def __init__(self):
+        self.frames = 0
+        self.cpu_s = 0.0
+        self._window_frames = 0
+        self._window_cpu_s = 0.0
+
+    def add(self, cpu_s: float) -> None:
+        self.frames += 1
+        self.cpu_s += cpu_s
+        self._window_frames += 1
+        self._window_cpu_s += cpu_s
+
+    def take_window_ms(self) -> Optional[float]:
+        """Mean CPU ms/frame since the previous call."""
+        if self._window_frames == 0:
+            return None
+        mean_ms = self._window_cpu_s / self._window_frames * 1000
+        self._window_frames = 0
+        self._window_cpu_s = 0.0
+        return round(mean_ms, 3)
+
+    def mean_ms(self) -> Optional[float]:
+        return round(self.cpu_s / self.frames * 1000, 3) if self.frames else None
+
+
 class CameraCapture:
     """
     Handles USB webcam capture following SRP (Single Responsibility Principle).
@@ -63,7 +194,8 @@ class CameraCapture:
     
     def __init__(self, camera_id: int = CAMERA_ID, 
                  width: int = IMAGE_WIDTH, 
-                 height: int = IMAGE_HEIGHT):
+                 height: int = IMAGE_HEIGHT,
+                 mjpeg_passthrough: bool = MJPEG_PASSTHROUGH):
         """
         Initialize camera with specified parameters.
         
@@ -71,10 +203,12 @@ class CameraCapture:
             camera_id: OpenCV camera index (0 for default webcam)
             width: Frame width in pixels
             height: Frame height in pixels
+            mjpeg_passthrough: Request MJPG and skip OpenCV's decode
         """
         self.camera_id = camera_id
         self.width = width
         self.height = height
+        self.mjpeg_passthrough = mjpeg_passthrough
         self.cap: Optional[cv2.VideoCapture] = None
         
     def open(self) -> bool:
@@ -93,6 +227,14 @@ class CameraCapture:
             logger.error(f"Failed to open camera {self.camera_id}")
             return False
         
+        # MJPG must be requested before the resolution (UVC mode selection);
+        # CONVERT_RGB=0 makes read() return the compressed buffer
+        if self.mjpeg_passthrough:
+            self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*"MJPG"))
+            if not self.cap.set(cv2.CAP_PROP_CONVERT_RGB, 0):
+                logger.warning("Backend cannot disable RGB conversion — using decode mode")
+                self.mjpeg_passthrough = False
+
         # Set camera resolution
         self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
         self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
@@ -100,28 +242,52 @@ class CameraCapture:
         # Verify settings
         actual_width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
         actual_height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-        logger.info(f"Camera opened: {actual_width}x{actual_height}")
+        logger.info(f"Camera opened: {actual_width}x{actual_height} "
+                    f"({'MJPEG pass-through' if self.mjpeg_passthrough else 'decode'})")
         
         return True
-    
-    def capture_frame(self) -> Optional[cv2.Mat]:
+
+    def capture(self) -> Optional[Frame]:
         """
-        Capture a single frame from camera.
+        Capture a single frame, compressed if the camera delivers MJPEG.
         
         Returns:
-            Frame as numpy array, or None if capture failed
+            Frame (JPEG bytes in pass-through mode, else pixels), or None
         """
         if self.cap is None or not self.cap.isOpened():
             logger.error("Camera not opened")
             return None
         
-        ret, frame = self.cap.read()
+        ret, data = self.cap.read()
         
-        if not ret:
+        if not ret or data is None:
             logger.error("Failed to read frame")
             return None
+
+        # Pass-through: a flat uint8 buffer holding one JPEG
+        if self.mjpeg_passthrough and data.ndim <= 2 and data.size > 4:
+            buffer = data.reshape(-1)
+            if buffer[0] == 0xFF and buffer[1] == 0xD8:
+                return Frame(jpeg=ensure_huffman_tables(buffer.tobytes()))
+
+        if data.ndim != 3:
+            # Raw buffer that is not a JPEG (e.g. YUYV): let OpenCV convert
+            logger.warning("Camera did not deliver MJPEG — switching to decode mode")
+            self.mjpeg_passthrough = False
+            self.cap.set(cv2.CAP_PROP_CONVERT_RGB, 1)
+            return None
+
+        return Frame(pixels=data)
+    
+    def capture_frame(self) -> Optional[cv2.Mat]:
+        """
+        Capture a single frame from camera.
         
-        return frame
+        Returns:
+            Frame as numpy array, or None if capture failed
+        """
+        frame = self.capture()
+        return frame.pixels if frame is not None else None
     
     def close(self) -> None:
         """Release camera resources."""
@@ -130,6 +296,155 @@ class CameraCapture:
             logger.info("Camera closed")
 
 
+class ReplaySource:
+    """
+    Recorded footage with the CameraCapture interface (open/capture/close).
+
+    Sources:
+    - Video file: decoded by cv2.VideoCapture, timestamps from CAP_PROP_POS_MSEC
+    - Image directory: files in name order; JPEGs are passed through
+      without decoding (like MJPEG pass-through), timestamps parsed from
+      save_timestamped() names (capture_YYYYmmdd_HHMMSS) or file mtime
+
+    Pacing (capture() sleeps until the frame is due):
+    - "recorded": original inter-frame gaps (capped at REPLAY_MAX_GAP_S)
+    - "fps":      fixed rate
+    - "fast":     as fast as the pipeline accepts frames (throughput tests)
+
+    Frames are never skipped when behind schedule — a replay always
+    publishes every recorded frame, so incidents reproduce exactly.
+    """
+
+    IMAGE_SUFFIXES = (".jpg", ".jpeg", ".png", ".bmp")
+
+    def __init__(self, path: Path, pace: str = REPLAY_PACE,
+                 fps: float = REPLAY_FPS, loop: bool = False):
+        """
+        Args:
+            path: Video file or directory of images
+            pace: "recorded", "fps" or "fast"
+            fps: Frame rate for "fps" (and videos without timestamps)
+            loop: Start over at the end instead of finishing
+        """
+        if pace not in ("recorded", "fps", "fast"):
+            raise ValueError(f"Unknown replay pace: {pace}")
+        self.path = Path(path)
+        self.pace = pace
+        self.fps = fps
+        self.loop = loop
+        self.exhausted = False
+        self.frames_read = 0
+        self.cap: Optional[cv2.VideoCapture] = None
+        self._images: list[Path] = []
+        self._index = 0
+        self._next_due: Optional[float] = None   # monotonic release time
+        self._last_ts: Optional[float] = None
+
+    def open(self) -> bool:
+        """Open the video / list the image directory."""
+        if self.path.is_dir():
+            self._images = sorted(p for p in self.path.iterdir()
+                                  if p.suffix.lower() in self.IMAGE_SUFFIXES)
+            if not self._images:
+                logger.error(f"No images in {self.path}")
+                return False
+            logger.info(f"Replaying {len(self._images)} images from {self.path} (pace: {self.pace})")
+            return True
+
+        self.cap = cv2.VideoCapture(str(self.path))
+        if not self.cap.isOpened():
+            logger.error(f"Failed to open video {self.path}")
+            return False
+        frame_count = int(self.cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        logger.info(f"Replaying video {self.path}: {frame_count} frames (pace: {self.pace})")
+        return True
+
+    @staticmethod
+    def _image_timestamp(path: Path) -> float:
+        """Capture time from a save_timestamped() name, else file mtime."""
+        try:
+            return datetime.strptime(path.stem[:23], "capture_%Y%m%d_%H%M%S").timestamp()
+        except ValueError:
+            return path.stat().st_mtime
+
+    def _read_next(self) -> Optional[tuple[Frame, float]]:
+        """Next recorded (frame, timestamp_s), or None at the end."""
+        if self.cap is not None:
+            ret, pixels = self.cap.read()
+            if not ret:
+                return None
+            timestamp = self.cap.get(cv2.CAP_PROP_POS_MSEC) / 1000
+            if timestamp <= 0 and self.frames_read > 0:
+                timestamp = self.frames_read / self.fps  # container without timestamps
+            return Frame(pixels=pixels), timestamp
+
+        while self._index < len(self._images):
+            path = self._images[self._index]
+            self._index += 1
+            if path.suffix.lower() in (".jpg", ".jpeg"):
+                frame = Frame(jpeg=path.read_bytes())
+            else:
+                pixels = cv2.imread(str(path))
+                if pixels is None:
+                    logger.warning(f"Skipping unreadable image {path}")
+                    continue
+                frame = Frame(pixels=pixels)
+            return frame, self._image_timestamp(path)
+        return None
+
+    def _rewind(self) -> None:
+        if self.cap is not None:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+        self._index = 0
+        self.frames_read = 0
+        self._next_due = None  # restart pacing on the new pass
+
+    def _wait_until_due(self, timestamp: float) -> None:
+        """Sleep until the frame's slot on the schedule (never drifts with load)."""
+        now = time.monotonic()
+        if self._next_due is None:
+            self._next_due = now
+        elif self.pace == "recorded":
+            self._next_due += min(max(timestamp - self._last_ts, 0.0), REPLAY_MAX_GAP_S)
+        else:
+            self._next_due += 1 / self.fps
+        self._last_ts = timestamp
+        if self._next_due > now:
+            time.sleep(self._next_due - now)
+
+    def capture(self) -> Optional[Frame]:
+        """
+        Next frame, released at its due time.
+
+        Returns:
+            Frame, or None at the end (`exhausted` is then True)
+        """
+        item = self._read_next()
+        if item is None and self.loop and self.frames_read > 0:
+            self._rewind()
+            item = self._read_next()
+        if item is None:
+            self.exhausted = True
+            return None
+
+        frame, timestamp = item
+        if self.pace != "fast":
+            self._wait_until_due(timestamp)
+        self.frames_read += 1
+        return frame
+
+    def capture_frame(self) -> Optional[cv2.Mat]:
+        """Next frame as pixels (decoded on demand)."""
+        frame = self.capture()
+        return frame.pixels if frame is not None else None
+
+    def close(self) -> None:
+        """Release the video file."""
+        if self.cap is not None:
+            self.cap.release()
+        logger.info(f"Replay closed after {self.frames_read} frames")
+
+
 class ImageSaver:
     """
     Handles image saving operations (SRP: Separate concern from capture).
@@ -155,28 +470,60 @@ class ImageSaver:
         self.output_dir.mkdir(parents=True, exist_ok=True)
         logger.info(f"Output directory: {self.output_dir.absolute()}")
     
-    def save(self, frame: cv2.Mat, filename: str = "latest.jpg") -> bool:
+    def save(self, frame, filename: str = "latest.jpg",
+             trace: Optional[FrameTrace] = None) -> bool:
         """
         Save frame to file.
         
         Args:
-            frame: Image frame to save
+            frame: Frame (pass-through JPEG written as-is) or BGR image
             filename: Output filename
+            trace: Frame trace to embed in the JPEG (COM segment)
             
         Returns:
             True if save successful, False otherwise
         """
         filepath = self.output_dir / filename
+        if not isinstance(frame, Frame):
+            frame = Frame(pixels=frame)
         
         try:
-            cv2.imwrite(str(filepath), frame)
+            data = frame.to_jpeg(JPEG_QUALITY)
+            if data is None:
+                logger.error(f"Failed to encode frame for {filepath}")
+                return False
+
+            if trace is not None:
+                trace.mark("encoded")
+                data = trace.embed_in_jpeg(data)
+
+            self._write_atomic(filepath, data)
             logger.info(f"Saved: {filepath}")
             return True
         except Exception as e:
             logger.error(f"Failed to save {filepath}: {e}")
             return False
+
+    @staticmethod
+    def _write_atomic(filepath: Path, data: bytes, retries: int = 3) -> None:
+        """
+        Write via temp file + os.replace so readers never see a torn JPEG.
+
+        On Windows os.replace fails while vision-ai has the file open,
+        so retry briefly before giving up.
+        """
+        tmp_path = filepath.with_name(filepath.name + ".tmp")
+        tmp_path.write_bytes(data)
+        for attempt in range(retries):
+            try:
+                os.replace(tmp_path, filepath)
+                return
+            except PermissionError:
+                if attempt == retries - 1:
+                    raise
+                time.sleep(0.005)
     
-    def save_timestamped(self, frame: cv2.Mat) -> bool:
+    def save_timestamped(self, frame) -> bool:
         """
         Save frame with timestamp in filename.
         
@@ -187,20 +534,31 @@ class ImageSaver:
         return self.save(frame, filename)
 
 
-def main():
+def main(source: Optional[ReplaySource] = None,
+         output_dir: Path = OUTPUT_DIR,
+         notify_port: int = FRAME_EVENT_PORT):
     """
     Main capture loop.
     
     DRY Principle: Reusable components (Camera, Saver)
     KISS Principle: Simple infinite loop, no overengineering
+
+    Args:
+        source: Replay source instead of the live camera. Same output path
+            (latest.jpg + frame trace); pacing is done by the source.
+        output_dir: Where latest.jpg is written (tests and benchmarks use a
+            temp dir so they never overwrite the live frame)
+        notify_port: UDP port of the vision-ai frame event listener
     """
     logger.info("=" * 60)
     logger.info("AGV Camera Capture Server")
     logger.info("=" * 60)
     
     # Initialize components (Dependency Injection pattern)
-    camera = CameraCapture(CAMERA_ID, IMAGE_WIDTH, IMAGE_HEIGHT)
-    saver = ImageSaver(OUTPUT_DIR)
+    camera = source or CameraCapture(CAMERA_ID, IMAGE_WIDTH, IMAGE_HEIGHT)
+    capture_interval = 0.0 if source is not None else CAPTURE_INTERVAL
+    saver = ImageSaver(output_dir)
+    notifier = FrameNotifier(port=notify_port) if NOTIFY_VISION_AI else None
     
     # Log startup to database
     if DB_ENABLED:
@@ -211,7 +569,11 @@ def main():
             details={
                 'camera_id': CAMERA_ID,
                 'resolution': f'{IMAGE_WIDTH}x{IMAGE_HEIGHT}',
-                'capture_interval': CAPTURE_INTERVAL
+                'capture_interval': CAPTURE_INTERVAL,
+                'mjpeg_passthrough': MJPEG_PASSTHROUGH,
+                'replay': None if source is None else {
+                    'path': str(source.path), 'pace': source.pace, 'loop': source.loop,
+                },
             }
         )
     
@@ -228,18 +590,27 @@ def main():
             )
         return
     
-    logger.info(f"Capture interval: {CAPTURE_INTERVAL}s")
+    logger.info(f"Capture interval: {CAPTURE_INTERVAL}s" if source is None
+                else f"Replay pace: {source.pace}")
     logger.info("Press Ctrl+C to stop")
     logger.info("-" * 60)
     
+    cpu_meter = CpuMeter()
+    started_at = time.monotonic()
     try:
         frame_count = 0
         error_count = 0
         
         while True:
-            # Capture frame
-            frame = camera.capture_frame()
+            # Capture frame (trace starts here: frame id + capture timestamp)
+            cpu_start = time.process_time()
+            frame = camera.capture()
+            trace = FrameTrace(frame_id=frame_count + 1)
             
+            if frame is None and getattr(camera, "exhausted", False):
+                logger.info("Replay finished")
+                break
+
             if frame is None:
                 logger.warning("Skipping frame due to capture failure")
                 error_count += 1
@@ -253,13 +624,21 @@ def main():
                         details={'total_errors': error_count, 'frames_captured': frame_count}
                     )
                 
-                time.sleep(CAPTURE_INTERVAL)
+                time.sleep(capture_interval or CAPTURE_INTERVAL)
                 continue
             
             # Save frame (overwrite latest.jpg for Vision AI to read)
-            if saver.save(frame):
+            if saver.save(frame, trace=trace):
+                if notifier is not None:
+                    notifier.notify(saver.output_dir / "latest.jpg", trace.frame_id)
+                cpu_meter.add(time.process_time() - cpu_start)
                 frame_count += 1
                 logger.info(f"Frame #{frame_count} captured successfully")
+
+                if frame_count % CPU_REPORT_EVERY == 0:
+                    cpu_ms = cpu_meter.take_window_ms()
+                    logger.info(f"CPU per frame: {cpu_ms} ms "
+                                f"({'pass-through' if frame.is_passthrough else 'decode+encode'})")
                 
                 # Log milestone to database (every 100 frames)
                 if DB_ENABLED and frame_count % 100 == 0:
@@ -267,11 +646,14 @@ def main():
                         component='camera',
                         message=f'Camera milestone: {frame_count} frames captured',
                         event_type='capture_milestone',
-                        details={'frames_captured': frame_count, 'errors': error_count}
+                        details={'frames_captured': frame_count, 'errors': error_count,
+                                 'cpu_ms_per_frame': cpu_meter.mean_ms(),
+                                 'passthrough': frame.is_passthrough}
                     )
             
-            # Wait for next capture
-            time.sleep(CAPTURE_INTERVAL)
+            # Wait for next capture (replay sources pace themselves)
+            if capture_interval:
+                time.sleep(capture_interval)
             
     except KeyboardInterrupt:
         logger.info("\nShutdown requested by user")
@@ -296,8 +678,27 @@ def main():
             )
     finally:
         camera.close()
-        logger.info("Camera server stopped")
+        if notifier is not None:
+            notifier.close()
+        elapsed_s = time.monotonic() - started_at
+        logger.info(f"Camera server stopped: {frame_count} frames in {elapsed_s:.1f}s "
+                    f"({frame_count / elapsed_s if elapsed_s else 0:.1f} fps), "
+                    f"mean CPU per frame: {cpu_meter.mean_ms()} ms")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="AGV camera capture server")
+    parser.add_argument("--replay", type=Path,
+                        help="Replay a video file or image directory instead of the camera")
+    parser.add_argument("--pace", choices=("recorded", "fps", "fast"), default=REPLAY_PACE,
+                        help="Replay pacing (default: recorded timestamps)")
+    parser.add_argument("--fps", type=float, default=REPLAY_FPS, help="Rate for --pace fps")
+    parser.add_argument("--loop", action="store_true", help="Restart the replay at the end")
+    parser.add_argument("--output-dir", type=Path, default=OUTPUT_DIR,
+                        help=f"Directory for latest.jpg (default: {OUTPUT_DIR})")
+    parser.add_argument("--notify-port", type=int, default=FRAME_EVENT_PORT,
+                        help=f"UDP port for vision-ai frame events (default: {FRAME_EVENT_PORT})")
+    args = parser.parse_args()
+
+    main(ReplaySource(args.replay, args.pace, args.fps, args.loop) if args.replay else None,
+         output_dir=args.output_dir, notify_port=args.notify_port)
\ No newline at end of file
@@ -10,10 +10,17 @@ Design Principles:
 """
 
 import psycopg2
-from psycopg2.extras import Json
+from psycopg2.extras import Json, execute_values
 from typing import Optional, List, Dict, Any
+from pathlib import Path
+import os
+import json
+import time
+import queue
+import atexit
 import logging
-from datetime import datetime
+import threading
+from datetime import datetime, timezone
 from contextlib import contextmanager
 
 logger = logging.getLogger(__name__)
@@ -25,9 +32,57 @@ DB_CONFIG = {
     'port': 5432,
     'database': 'agv_control_db',
     'user': 'postgres',
-    'password': '1111'  # CHANGE IN PRODUCTION!
+    'password': '1111',  # CHANGE IN PRODUCTION!
+    'connect_timeout': 3,  # seconds — bounds the wait when PostgreSQL is down
 }
 
+# Circuit breaker — stop reconnect attempts while PostgreSQL is down
+CIRCUIT_BACKOFF_INITIAL_S = 1.0
+CIRCUIT_BACKOFF_MAX_S = 60.0
+
+# Offline journal — rows written while the circuit is open, replayed later
+JOURNAL_PATH = Path(__file__).resolve().parent / "journal" / "db_offline.jsonl"
+JOURNAL_MAX_BYTES = 100 * 1024 * 1024
+JOURNAL_REPLAY_BATCH = 500
+JOURNAL_JSON_COLUMNS = frozenset({'details', 'waypoints'})  # lists elsewhere are SQL arrays
+
+# SQLSTATEs outside class 08 that still mean the server dropped us
+CONNECTION_LOST_SQLSTATES = frozenset({
+    '57P01',  # admin_shutdown
+    '57P02',  # crash_shutdown
+    '57P03',  # cannot_connect_now
+})
+
+
+def _json_dumps(value) -> str:
+    """json.dumps for details: non-JSON values (Path, Decimal, …) become str."""
+    return json.dumps(value, default=str)
+
+
+class CircuitOpenError(psycopg2.OperationalError):
+    """Raised instead of connecting while the circuit breaker is open."""
+
+
+def is_connection_error(error: Exception,
+                        connection: Optional[psycopg2.extensions.connection] = None) -> bool:
+    """
+    True for errors that mean 'database unreachable' (not bad data).
+
+    OperationalError alone is not enough: deadlocks (40P01), serialization
+    failures (40001) and statement timeouts (57014) are OperationalErrors
+    on a healthy connection and must not open the circuit. Connection loss
+    is an error without a SQLSTATE (raised client-side), class 08, a server
+    shutdown code, or a connection psycopg2 has already marked closed.
+    """
+    if isinstance(error, (CircuitOpenError, psycopg2.InterfaceError)):
+        return True
+    if connection is not None and connection.closed:
+        return True
+    if not isinstance(error, psycopg2.OperationalError):
+        return False
+    pgcode = error.pgcode
+    return pgcode is None or pgcode.startswith('08') or pgcode in CONNECTION_LOST_SQLSTATES
+
 
 class DatabaseConnection:
     """
@@ -36,7 +91,23 @@ class DatabaseConnection:
     Why Singleton?
     - Only one connection pool per application
     - Avoid multiple connection overhead
-    - Thread-safe connection reuse
+    - Thread-safe connection reuse: one psycopg2 connection is shared by
+      request threads, the logger writer threads and journal replay, so
+      get_cursor() holds _conn_lock from cursor() to commit/rollback —
+      transactions from different threads never interleave. Connecting
+      happens outside _conn_lock, by one thread at a time (_connect_lock,
+      taken without blocking): a caller never queues behind a
+      connect_timeout wait, it gets CircuitOpenError and journals instead
+
+    Circuit breaker:
+    - closed:    normal operation
+    - open:      a connection failed — get_cursor() raises CircuitOpenError
+                 immediately (no psycopg2.connect, no connect_timeout wait)
+                 until the backoff window ends; backoff doubles per failure
+                 up to CIRCUIT_BACKOFF_MAX_S
+    - half_open: window ended — exactly one caller tries to reconnect,
+                 everyone else still fails fast
+    On reconnect, the offline journal is replayed in the background.
     """
     
     _instance: Optional['DatabaseConnection'] = None
@@ -45,7 +116,15 @@ class DatabaseConnection:
     def __new__(cls):
         """Singleton pattern implementation."""
         if cls._instance is None:
-            cls._instance = super().__new__(cls)
+            instance = super().__new__(cls)
+            instance._state_lock = threading.Lock()
+            instance._conn_lock = threading.RLock()  # re-entrant: nested get_cursor() in one thread
+            instance._connect_lock = threading.Lock()  # held by the one thread (re)connecting
+            instance._circuit_state = 'closed'
+            instance._failures = 0
+            instance._open_until = 0.0
+            instance._last_error: Optional[str] = None
+            cls._instance = instance
         return cls._instance
     
     def __init__(self):
@@ -57,20 +136,102 @@ class DatabaseConnection:
     def _is_connection_open(self) -> bool:
         """Return True when psycopg2 connection exists and is open."""
         return self._connection is not None and self._connection.closed == 0
+
+    # -----------------------------------------------------------------------
+    # Circuit breaker
+    # -----------------------------------------------------------------------
+    def _before_connect(self) -> None:
+        """
+        Gate a connection attempt through the circuit breaker.
+
+        Raises:
+            CircuitOpenError: While open, or half-open with a probe in flight
+        """
+        with self._state_lock:
+            if self._circuit_state == 'closed':
+                return
+            if self._circuit_state == 'open' and time.monotonic() >= self._open_until:
+                self._circuit_state = 'half_open'  # this caller is the probe
+                return
+            raise CircuitOpenError(
+                f"Database circuit {self._circuit_state} "
+                f"(retry in {max(0.0, self._open_until - time.monotonic()):.1f}s)"
+            )
+
+    def _record_failure(self, error: Exception) -> None:
+        """Open the circuit and extend the backoff window."""
+        with self._state_lock:
+            self._failures += 1
+            backoff = min(CIRCUIT_BACKOFF_INITIAL_S * 2 ** (self._failures - 1),
+                          CIRCUIT_BACKOFF_MAX_S)
+            self._open_until = time.monotonic() + backoff
+            self._last_error = str(error).strip()
+            if self._circuit_state != 'open':
+                logger.warning(f"Database circuit OPEN for {backoff:.0f}s: {self._last_error}")
+            self._circuit_state = 'open'
+        if self._connection is not None:
+            try:
+                self._connection.close()
+            except Exception:
+                pass
+
+    def _record_success(self) -> None:
+        """Close the circuit; replay the journal if we were offline."""
+        with self._state_lock:
+            recovered = self._circuit_state != 'closed'
+            self._circuit_state = 'closed'
+            self._failures = 0
+            self._last_error = None
+        if recovered:
+            logger.info("Database circuit CLOSED — connection restored")
+        offline_journal.replay_in_background(self)
+
+    def status(self) -> Dict[str, Any]:
+        """Circuit state for /health."""
+        with self._state_lock:
+            return {
+                'circuit': self._circuit_state,
+                'consecutive_failures': self._failures,
+                'retry_in_s': round(max(0.0, self._open_until - time.monotonic()), 1)
+                              if self._circuit_state != 'closed' else 0.0,
+                'last_error': self._last_error,
+                'journal': offline_journal.status(),
+            }
+
+    def is_available(self) -> bool:
+        """False while the circuit is open (callers can skip straight to journal)."""
+        with self._state_lock:
+            return not (self._circuit_state == 'open' and time.monotonic() < self._open_until)
          
     def connect(self) -> None:
         """
         Establish database connection.
         
+        Only one thread connects at a time; the others fail fast instead of
+        waiting out connect_timeout behind it.
+
         Raises:
-            psycopg2.Error: If connection fails
+            psycopg2.Error: If connection fails (or circuit is open)
+            CircuitOpenError: Another thread is connecting right now
         """
+        if not self._connect_lock.acquire(blocking=False):
+            raise CircuitOpenError("Database reconnect in progress")
         try:
-            self._connection = psycopg2.connect(**DB_CONFIG)
-            logger.info(f"✓ Connected to database: {DB_CONFIG['database']}")
-        except psycopg2.Error as e:
-            logger.error(f"✗ Database connection failed: {e}")
-            raise
+            if self._is_connection_open():
+                return  # another thread connected meanwhile
+            self._before_connect()
+            try:
+                connection = psycopg2.connect(**DB_CONFIG)
+                logger.info(f"✓ Connected to database: {DB_CONFIG['database']}")
+            except psycopg2.Error as e:
+                logger.error(f"✗ Database connection failed: {e}")
+                self._record_failure(e)
+                raise
+            with self._conn_lock:
+                self._connection = connection
+        finally:
+            self._connect_lock.release()
+        self._record_success()
     
     @contextmanager
     def get_cursor(self):
@@ -85,26 +246,181 @@ class DatabaseConnection:
         - Automatic commit on success
         - Automatic rollback on error
         - Automatic cursor cleanup
+        - Fails fast (CircuitOpenError) while the database is down
+        - Serialized: other threads wait until this transaction commits,
+          but never for a reconnect (see connect())
         """
         if not self._is_connection_open():
             self.connect()
-        
-        cursor = self._connection.cursor()
-        try:
-            yield cursor
-            self._connection.commit()
-        except Exception as e:
-            self._connection.rollback()
-            logger.error(f"Database error: {e}")
-            raise
-        finally:
-            cursor.close()
+
+        with self._conn_lock:
+            cursor = self._connection.cursor()
+            try:
+                yield cursor
+                self._connection.commit()
+            except Exception as e:
+                try:
+                    self._connection.rollback()
+                except psycopg2.Error:
+                    pass  # connection already gone
+                logger.error(f"Database error: {e}")
+                if is_connection_error(e, self._connection):
+                    self._record_failure(e)
+                raise
+            finally:
+                try:
+                    cursor.close()
+                except psycopg2.Error:
+                    pass
     
     def close(self) -> None:
         """Close database connection."""
-        if self._is_connection_open():
-            self._connection.close()
-            logger.info("Database connection closed")
+        with self._conn_lock:
+            if self._is_connection_open():
+                self._connection.close()
+                logger.info("Database connection closed")
+
+
+class OfflineJournal:
+    """
+    Append-only JSONL journal for rows that could not reach PostgreSQL.
+
+    Business Case: "DB was down for 10 minutes — did we lose the detections?"
+
+    - append(): one JSON line {table, columns, values}, flushed immediately
+    - replay_in_background(): after reconnect, the journal is renamed to
+      *.replaying (new appends go to a fresh file) and inserted in bulk,
+      JOURNAL_REPLAY_BATCH rows per statement, original timestamps kept
+    - A failed replay leaves *.replaying in place; it is retried first
+      on the next reconnect
+    """
+
+    def __init__(self, path: Path = JOURNAL_PATH, max_bytes: int = JOURNAL_MAX_BYTES):
+        self.path = path
+        self.replay_path = path.with_name(path.name + ".replaying")
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._replay_thread: Optional[threading.Thread] = None
+        self.appended = 0
+        self.replayed = 0
+        self.dropped = 0
+
+    def append(self, table: str, columns: tuple, values: tuple) -> bool:
+        """Journal one row. Returns False if the journal is full or unwritable."""
+        record = json.dumps(
+            {'table': table, 'columns': list(columns), 'values': list(values)},
+            default=self._encode,
+        )
+        with self._lock:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                if self.path.exists() and self.path.stat().st_size >= self.max_bytes:
+                    self.dropped += 1
+                    return False
+                with self.path.open('a', encoding='utf-8') as f:
+                    f.write(record + '\n')
+                self.appended += 1
+                return True
+            except OSError as e:
+                self.dropped += 1
+                logger.error(f"Offline journal write failed: {e}")
+                return False
+
+    @staticmethod
+    def _encode(value):
+        if isinstance(value, datetime):
+            return value.isoformat()
+        if isinstance(value, Json):
+            return value.adapted
+        return str(value)  # Path, Decimal, … — same as _json_dumps
+
+    def pending_rows(self) -> int:
+        """Count journaled rows not yet replayed."""
+        count = 0
+        for path in (self.replay_path, self.path):
+            try:
+                with path.open('rb') as f:
+                    count += sum(1 for _ in f)
+            except OSError:
+                pass
+        return count
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            'pending_rows': self.pending_rows(),
+            'appended': self.appended,
+            'replayed': self.replayed,
+            'dropped': self.dropped,
+            'replaying': self._replay_thread is not None and self._replay_thread.is_alive(),
+        }
+
+    def replay_in_background(self, db: 'DatabaseConnection') -> None:
+        """Start a replay thread if there is anything to replay."""
+        if not (self.path.exists() or self.replay_path.exists()):
+            return
+        with self._lock:
+            if self._replay_thread is not None and self._replay_thread.is_alive():
+                return
+            self._replay_thread = threading.Thread(
+                target=self._replay, args=(db,), name="db-journal-replay", daemon=True
+            )
+            self._replay_thread.start()
+
+    def _replay(self, db: 'DatabaseConnection') -> None:
+        with self._lock:
+            if not self.replay_path.exists():
+                if not self.path.exists():
+                    return
+                os.replace(self.path, self.replay_path)
+
+        try:
+            with self.replay_path.open('r', encoding='utf-8') as f:
+                records = [json.loads(line) for line in f if line.strip()]
+        except (OSError, ValueError) as e:
+            logger.error(f"Offline journal unreadable, keeping {self.replay_path}: {e}")
+            return
+
+        done = 0
+        try:
+            while done < len(records):
+                # Batch consecutive rows with the same (table, columns)
+                table, columns = records[done]['table'], records[done]['columns']
+                batch_end = done
+                while (batch_end < len(records)
+                       and batch_end - done < JOURNAL_REPLAY_BATCH
+                       and records[batch_end]['table'] == table
+                       and records[batch_end]['columns'] == columns):
+                    batch_end += 1
+
+                rows = [
+                    tuple(
+                        Json(v) if isinstance(v, dict)
+                        or (isinstance(v, list) and column in JOURNAL_JSON_COLUMNS) else v
+                        for column, v in zip(columns, record['values'])
+                    )
+                    for record in records[done:batch_end]
+                ]
+                query = f"INSERT INTO {table} ({', '.join(columns)}) VALUES %s"
+                with db.get_cursor() as cur:
+                    execute_values(cur, query, rows)
+                done = batch_end
+        except Exception as e:
+            # Keep only the rows not yet inserted; retried on next reconnect
+            logger.error(f"Offline journal replay stopped after {done} rows, will retry: {e}")
+            self._rewrite_replay_file(records[done:])
+            self.replayed += done
+            return
+
+        self.replay_path.unlink(missing_ok=True)
+        self.replayed += len(records)
+        logger.info(f"Offline journal replayed: {len(records)} rows")
+
+    def _rewrite_replay_file(self, records: List[Dict[str, Any]]) -> None:
+        tmp_path = self.replay_path.with_name(self.replay_path.name + ".tmp")
+        with tmp_path.open('w', encoding='utf-8') as f:
+            for record in records:
+                f.write(json.dumps(record) + '\n')
+        os.replace(tmp_path, self.replay_path)
 
 
 class DetectionLogger:
@@ -112,7 +428,18 @@ class DetectionLogger:
     Handles logging to 'detections' table.
     
     Business Case: "AGV collided. Did AI detect the obstacle?"
+
+    While the database is unreachable, rows go to the offline journal
+    (with their original timestamp) and are replayed on reconnect.
     """
+
+    COLUMNS = (
+        'timestamp', 'image_path', 'processing_time_ms',
+        'object_class', 'confidence',
+        'bbox_x1', 'bbox_y1', 'bbox_x2', 'bbox_y2',
+        'distance_meters', 'triggered_stop',
+        'frame_id', 'frame_age_ms',
+    )
     
     def __init__(self):
         self.db = DatabaseConnection()
@@ -124,7 +451,9 @@ class DetectionLogger:
                      distance_meters: Optional[float] = None,
                      processing_time_ms: Optional[int] = None,
                      image_path: Optional[str] = None,
-                     triggered_stop: bool = False) -> Optional[int]:
+                     triggered_stop: bool = False,
+                     frame_id: Optional[int] = None,
+                     frame_age_ms: Optional[int] = None) -> Optional[int]:
         """
         Insert detection result into database.
         
@@ -136,6 +465,8 @@ class DetectionLogger:
             processing_time_ms: YOLO inference time
             image_path: Path to source image
             triggered_stop: Did this detection trigger emergency stop?
+            frame_id: Camera frame number from the frame trace
+            frame_age_ms: Time from camera capture to detection result
             
         Returns:
             Detection ID if successful, None if failed
@@ -150,43 +481,50 @@ class DetectionLogger:
                 triggered_stop=True
             )
         """
-        query = """
-        INSERT INTO detections (
-            timestamp, image_path, processing_time_ms,
-            object_class, confidence,
-            bbox_x1, bbox_y1, bbox_x2, bbox_y2,
-            distance_meters, triggered_stop
+        row = (
+            datetime.now(timezone.utc),
+            image_path,
+            processing_time_ms,
+            object_class,
+            confidence,
+            bbox.get('x1'),
+            bbox.get('y1'),
+            bbox.get('x2'),
+            bbox.get('y2'),
+            distance_meters,
+            triggered_stop,
+            frame_id,
+            frame_age_ms
         )
+        query = f"""
+        INSERT INTO detections ({', '.join(self.COLUMNS)})
         VALUES (
-            NOW(), %s, %s,
+            %s, %s, %s,
             %s, %s,
             %s, %s, %s, %s,
+            %s, %s,
             %s, %s
         )
         RETURNING id;
         """
         
+        if not self.db.is_available():
+            offline_journal.append('detections', self.COLUMNS, row)
+            return None
+
         try:
             with self.db.get_cursor() as cur:
-                cur.execute(query, (
-                    image_path,
-                    processing_time_ms,
-                    object_class,
-                    confidence,
-                    bbox.get('x1'),
-                    bbox.get('y1'),
-                    bbox.get('x2'),
-                    bbox.get('y2'),
-                    distance_meters,
-                    triggered_stop
-                ))
+                cur.execute(query, row)
                 
                 detection_id = cur.fetchone()[0]
                 logger.debug(f"Logged detection #{detection_id}: {object_class} (conf={confidence:.2f})")
                 return detection_id
                 
         except Exception as e:
-            logger.error(f"Failed to log detection: {e}")
+            if is_connection_error(e):
+                offline_journal.append('detections', self.COLUMNS, row)
+            else:
+                logger.error(f"Failed to log detection: {e}")
             return None
     
     def log_batch_detections(self, detections: List[Dict[str, Any]]) -> int:
@@ -197,43 +535,211 @@ class DetectionLogger:
             detections: List of detection dicts
             
         Returns:
-            Number of detections logged
+            Number of detections logged (journaled rows are not counted)
             
         More efficient than calling log_detection() multiple times.
         """
-        query = """
-        INSERT INTO detections (
-            timestamp, object_class, confidence,
-            bbox_x1, bbox_y1, bbox_x2, bbox_y2,
-            distance_meters, processing_time_ms, triggered_stop
-        )
-        VALUES (NOW(), %s, %s, %s, %s, %s, %s, %s, %s, %s);
-        """
-        
-        count = 0
+        now = datetime.now(timezone.utc)
+        rows = []
+        for det in detections:
+            bbox = det.get('bbox', {})
+            rows.append((
+                now,
+                det.get('image_path'),
+                det.get('processing_time_ms'),
+                det.get('object_class'),
+                det.get('confidence'),
+                bbox.get('x1'),
+                bbox.get('y1'),
+                bbox.get('x2'),
+                bbox.get('y2'),
+                det.get('distance_meters'),
+                det.get('triggered_stop', False),
+                det.get('frame_id'),
+                det.get('frame_age_ms')
+            ))
+        if not rows:
+            return 0
+
+        if not self.db.is_available():
+            for row in rows:
+                offline_journal.append('detections', self.COLUMNS, row)
+            return 0
+
+        query = f"INSERT INTO detections ({', '.join(self.COLUMNS)}) VALUES %s"
         try:
             with self.db.get_cursor() as cur:
-                for det in detections:
-                    bbox = det.get('bbox', {})
-                    cur.execute(query, (
-                        det.get('object_class'),
-                        det.get('confidence'),
-                        bbox.get('x1'),
-                        bbox.get('y1'),
-                        bbox.get('x2'),
-                        bbox.get('y2'),
-                        det.get('distance_meters'),
-                        det.get('processing_time_ms'),
-                        det.get('triggered_stop', False)
-                    ))
-                    count += 1
+                execute_values(cur, query, rows)
                 
-                logger.info(f"Batch logged {count} detections")
-                return count
+                logger.info(f"Batch logged {len(rows)} detections")
+                return len(rows)
                 
         except Exception as e:
-            logger.error(f"Batch logging failed: {e}")
-            return count
+            if is_connection_error(e):
+                for row in rows:
+                    offline_journal.append('detections', self.COLUMNS, row)
+            else:
+                logger.error(f"Batch logging failed: {e}")
+            return 0
+
+
+class FrameLogger:
+    """
+    Handles logging to 'detection_frames' table (one row per processed frame).
+
+    Business Case: "Log every frame at full rate, not just the interesting ones"
+
+    Compared to DetectionLogger:
+    - One row per frame, detections packed into arrays (no per-box row,
+      no per-box index entries, no RETURNING round trip)
+    - Non-blocking: log_frame() only enqueues; a background worker writes
+      up to WRITE_CHUNK_SIZE frames per execute_values() statement, every
+      FLUSH_INTERVAL_S or as soon as a full chunk is queued
+    - Database down → rows go to the offline journal, like the other loggers
+
+    Per-detection queries: the detections_all view unpacks the arrays.
+    """
+
+    FLUSH_INTERVAL_S = 1.0
+    WRITE_CHUNK_SIZE = 200
+    QUEUE_SIZE = 10000              # beyond this, frames are dropped (counted)
+
+    COLUMNS = (
+        'timestamp', 'image_path', 'processing_time_ms', 'frame_id', 'frame_age_ms',
+        'object_classes', 'confidences', 'boxes', 'distances', 'triggered_stops',
+        'in_detections',
+    )
+
+    def __init__(self):
+        self.db = DatabaseConnection()
+        self._queue: "queue.Queue[tuple]" = queue.Queue(maxsize=self.QUEUE_SIZE)
+        self._wakeup = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+        self._worker_lock = threading.Lock()
+        self.written_frames = 0
+        self.dropped_frames = 0
+        atexit.register(self.flush)
+
+    @staticmethod
+    def pack(detections: List[Dict[str, Any]]) -> tuple:
+        """
+        Detection dicts → (classes, confidences, flat boxes, distances, stops).
+
+        distances/stops are None when no element carries information, so
+        the common frame stores NULL instead of an array of NULL/FALSE.
+        """
+        classes = [d['object_class'] for d in detections]
+        confidences = [float(d['confidence']) for d in detections]
+        boxes = [float(d['bbox'][k]) for d in detections for k in ('x1', 'y1', 'x2', 'y2')]
+        distances = [d.get('distance_meters') for d in detections]
+        stops = [bool(d.get('triggered_stop', False)) for d in detections]
+        return (
+            classes, confidences, boxes,
+            distances if any(v is not None for v in distances) else None,
+            stops if any(stops) else None,
+        )
+
+    def log_frame(self,
+                  detections: List[Dict[str, Any]],
+                  processing_time_ms: Optional[int] = None,
+                  image_path: Optional[str] = None,
+                  frame_id: Optional[int] = None,
+                  frame_age_ms: Optional[int] = None,
+                  in_detections: bool = False) -> None:
+        """
+        Queue one processed frame (never blocks on DB).
+
+        Args:
+            detections: Detection dicts as returned by vision-ai
+                (object_class, confidence, bbox{x1..y2}, distance_meters,
+                optional triggered_stop); may be empty
+            processing_time_ms: YOLO inference time
+            image_path: Path to source image
+            frame_id: Camera frame number from the frame trace
+            frame_age_ms: Time from camera capture to detection result
+            in_detections: The caller also logs these boxes to detections
+                (DETECTION_STORAGE = "both"); detections_all then skips
+                this frame so no box is counted twice
+        """
+        row = (datetime.now(timezone.utc), image_path, processing_time_ms,
+               frame_id, frame_age_ms) + self.pack(detections) + (in_detections,)
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            self.dropped_frames += 1
+            return
+        if self._queue.qsize() >= self.WRITE_CHUNK_SIZE:
+            self._wakeup.set()
+
+    # -----------------------------------------------------------------------
+    # Background writer
+    # -----------------------------------------------------------------------
+    def _ensure_worker(self) -> None:
+        """Start the writer thread on first use (import stays side-effect free)."""
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._worker_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(
+                    target=self._run, name="frame-logger", daemon=True
+                )
+                self._worker.start()
+
+    def _run(self) -> None:
+        while True:
+            self._wakeup.wait(timeout=self.FLUSH_INTERVAL_S)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Frame log writer error: {e}")
+
+    def _drain(self, limit: int) -> List[tuple]:
+        rows = []
+        while len(rows) < limit:
+            try:
+                rows.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return rows
+
+    def _insert_rows(self, rows: List[tuple]) -> None:
+        """Multi-row INSERT in one round trip; journal if the DB is down."""
+        if not self.db.is_available():
+            self._journal(rows)
+            return
+
+        query = f"INSERT INTO detection_frames ({', '.join(self.COLUMNS)}) VALUES %s"
+        try:
+            with self.db.get_cursor() as cur:
+                execute_values(cur, query, rows)
+            self.written_frames += len(rows)
+            logger.debug(f"Wrote {len(rows)} detection frames")
+        except Exception as e:
+            if is_connection_error(e):
+                self._journal(rows)
+            else:
+                logger.error(f"Failed to log {len(rows)} detection frames: {e}")
+
+    def _journal(self, rows: List[tuple]) -> None:
+        for row in rows:
+            offline_journal.append('detection_frames', self.COLUMNS, row)
+
+    def flush(self) -> None:
+        """Write everything queued now (called at exit)."""
+        while True:
+            rows = self._drain(self.WRITE_CHUNK_SIZE)
+            if not rows:
+                return
+            self._insert_rows(rows)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'queued': self._queue.qsize(),
+            'written_frames': self.written_frames,
+            'dropped_frames': self.dropped_frames,
+        }
 
 
 class SystemLogger:
@@ -241,10 +747,41 @@ class SystemLogger:
     Handles logging to 'system_logs' table.
     
     Business Case: "Daily report: trips, errors, battery warnings?"
+
+    Non-blocking: log_event() never touches the database. A background
+    worker thread does the INSERTs.
+    - Bulk lane (DEBUG/INFO/WARNING): events with the same
+      (component, event_type) are aggregated in memory over
+      AGGREGATION_WINDOW_S and flushed as ONE summary row with a count.
+      A camera flapping at 30 fps costs one row per window, not 150.
+    - Priority lane (ERROR/CRITICAL): never aggregated, written as soon as
+      the worker wakes, and checked again between bulk write chunks so a
+      large flush never delays an error.
     """
+
+    AGGREGATION_WINDOW_S = 5.0
+    PRIORITY_LEVELS = frozenset({'ERROR', 'CRITICAL'})
+    PRIORITY_QUEUE_SIZE = 1000      # beyond this, priority events are dropped (counted)
+    MAX_PENDING_KEYS = 500          # distinct (component, event_type) per window
+    WRITE_CHUNK_SIZE = 100          # bulk rows per INSERT statement
+
+    COLUMNS = (
+        'timestamp', 'level', 'component', 'event_type', 'message', 'details',
+        'agv_speed_mms', 'battery_percentage', 'position_x', 'position_y',
+        'path_id', 'detection_id',
+    )
     
     def __init__(self):
         self.db = DatabaseConnection()
+        self._priority: "queue.Queue[tuple]" = queue.Queue(maxsize=self.PRIORITY_QUEUE_SIZE)
+        self._pending: Dict[tuple, Dict[str, Any]] = {}
+        self._pending_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+        self._worker_lock = threading.Lock()
+        self.dropped_events = 0
+        self.aggregated_events = 0
+        atexit.register(self.flush)
     
     def log_event(self,
                   level: str,
@@ -257,9 +794,9 @@ class SystemLogger:
                   position_x: Optional[float] = None,
                   position_y: Optional[float] = None,
                   path_id: Optional[int] = None,
-                  detection_id: Optional[int] = None) -> Optional[int]:
+                  detection_id: Optional[int] = None) -> None:
         """
-        Insert system event into logs.
+        Queue system event for the background writer (never blocks on DB).
         
         Args:
             level: Log level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
@@ -274,7 +811,8 @@ class SystemLogger:
             detection_id: Related detection ID (FK)
             
         Returns:
-            Log ID if successful, None if failed
+            None (before the background writer, this returned the row ID) —
+            use log_event_sync() when the log ID is needed
             
         Example:
             logger.log_event(
@@ -286,20 +824,47 @@ class SystemLogger:
                 agv_speed_mms=0
             )
         """
-        query = """
-        INSERT INTO system_logs (
-            timestamp, level, component, event_type, message, details,
-            agv_speed_mms, battery_percentage, position_x, position_y,
-            path_id, detection_id
-        )
-        VALUES (
-            NOW(), %s, %s, %s, %s, %s,
-            %s, %s, %s, %s,
-            %s, %s
-        )
+        now = datetime.now(timezone.utc)
+        row = (now, level, component, event_type, message, details,
+               agv_speed_mms, battery_percentage, position_x, position_y,
+               path_id, detection_id)
+        self._ensure_worker()
+
+        if level in self.PRIORITY_LEVELS:
+            try:
+                self._priority.put_nowait(row)
+            except queue.Full:
+                self.dropped_events += 1
+                return
+            self._wakeup.set()
+            return
+
+        key = (component, event_type)
+        with self._pending_lock:
+            entry = self._pending.get(key)
+            if entry is None:
+                if len(self._pending) >= self.MAX_PENDING_KEYS:
+                    self.dropped_events += 1
+                    return
+                self._pending[key] = {'first': row, 'last': row, 'count': 1}
+            else:
+                entry['last'] = row
+                entry['count'] += 1
+                self.aggregated_events += 1
+
+    def log_event_sync(self, level: str, component: str, event_type: str,
+                       message: str, **kwargs) -> Optional[int]:
+        """
+        Insert one event immediately and return its ID (bypasses the queue).
+
+        For callers that need the row ID (e.g. tests, FK references).
+        """
+        query = f"""
+        INSERT INTO system_logs ({', '.join(self.COLUMNS)})
+        VALUES (NOW(), %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
         RETURNING id;
         """
-        
+        details = kwargs.get('details')
         try:
             with self.db.get_cursor() as cur:
                 cur.execute(query, (
@@ -307,13 +872,13 @@ class SystemLogger:
                     component,
                     event_type,
                     message,
-                    Json(details) if details else None,
-                    agv_speed_mms,
-                    battery_percentage,
-                    position_x,
-                    position_y,
-                    path_id,
-                    detection_id
+                    Json(details, dumps=_json_dumps) if details else None,
+                    kwargs.get('agv_speed_mms'),
+                    kwargs.get('battery_percentage'),
+                    kwargs.get('position_x'),
+                    kwargs.get('position_y'),
+                    kwargs.get('path_id'),
+                    kwargs.get('detection_id')
                 ))
                 
                 log_id = cur.fetchone()[0]
@@ -323,32 +888,155 @@ class SystemLogger:
         except Exception as e:
             logger.error(f"Failed to log system event: {e}")
             return None
+
+    # -----------------------------------------------------------------------
+    # Background writer
+    # -----------------------------------------------------------------------
+    def _ensure_worker(self) -> None:
+        """Start the writer thread on first use (import stays side-effect free)."""
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._worker_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(
+                    target=self._run, name="system-logger", daemon=True
+                )
+                self._worker.start()
+
+    def _run(self) -> None:
+        """Writer loop: priority lane on every wakeup, bulk lane every window."""
+        next_flush = time.monotonic() + self.AGGREGATION_WINDOW_S
+        while True:
+            self._wakeup.wait(timeout=max(0.0, next_flush - time.monotonic()))
+            self._wakeup.clear()
+            try:
+                self._write_priority()
+                if time.monotonic() >= next_flush:
+                    self._write_aggregated()
+                    next_flush = time.monotonic() + self.AGGREGATION_WINDOW_S
+            except Exception as e:
+                logger.error(f"System log writer error: {e}")
+
+    def _drain_priority(self) -> List[tuple]:
+        rows = []
+        while True:
+            try:
+                rows.append(self._priority.get_nowait())
+            except queue.Empty:
+                return rows
+
+    def _write_priority(self) -> None:
+        rows = self._drain_priority()
+        if rows:
+            self._insert_rows(rows)
+
+    def _write_aggregated(self) -> None:
+        """Swap out the aggregation table and write one row per key."""
+        with self._pending_lock:
+            pending, self._pending = self._pending, {}
+
+        rows = [self._summary_row(entry) for entry in pending.values()]
+        for start in range(0, len(rows), self.WRITE_CHUNK_SIZE):
+            # Errors raised meanwhile go first — never queued behind bulk rows
+            self._write_priority()
+            self._insert_rows(rows[start:start + self.WRITE_CHUNK_SIZE])
+
+    def _summary_row(self, entry: Dict[str, Any]) -> tuple:
+        """
+        Collapse an aggregation entry into one row.
+
+        Single events are written unchanged. Repeated events keep the first
+        timestamp and the latest message/state, plus an 'aggregate' block
+        in details: {count, first_at, last_at, window_s}.
+        """
+        first, last, count = entry['first'], entry['last'], entry['count']
+        if count == 1:
+            return first
+        details = dict(last[5] or {})
+        details['aggregate'] = {
+            'count': count,
+            'first_at': first[0].isoformat(),
+            'last_at': last[0].isoformat(),
+            'window_s': self.AGGREGATION_WINDOW_S,
+        }
+        message = f"{last[4]} (x{count})"
+        return (first[0], last[1], last[2], last[3], message, details) + last[6:]
+
+    def _insert_rows(self, rows: List[tuple]) -> None:
+        """
+        Multi-row INSERT in one round trip (no RETURNING).
+
+        Database down → rows go to the offline journal instead.
+        """
+        if not self.db.is_available():
+            self._journal(rows)
+            return
+
+        query = f"INSERT INTO system_logs ({', '.join(self.COLUMNS)}) VALUES %s"
+        values = [
+            row[:5] + (Json(row[5], dumps=_json_dumps) if row[5] else None,) + row[6:]
+            for row in rows
+        ]
+        try:
+            with self.db.get_cursor() as cur:
+                execute_values(cur, query, values)
+            logger.debug(f"Wrote {len(rows)} system log rows")
+        except Exception as e:
+            if is_connection_error(e):
+                self._journal(rows)
+            else:
+                logger.error(f"Failed to log {len(rows)} system events: {e}")
+
+    def _journal(self, rows: List[tuple]) -> None:
+        for row in rows:
+            offline_journal.append('system_logs', self.COLUMNS, row)
+
+    def flush(self) -> None:
+        """Write everything queued or aggregated now (called at exit)."""
+        try:
+            self._write_priority()
+            self._write_aggregated()
+        except Exception as e:
+            logger.error(f"System log flush failed: {e}")
+
+    def stats(self) -> Dict[str, int]:
+        """Queue depth and dedup counters."""
+        with self._pending_lock:
+            pending_keys = len(self._pending)
+        return {
+            'priority_queued': self._priority.qsize(),
+            'pending_keys': pending_keys,
+            'aggregated_events': self.aggregated_events,
+            'dropped_events': self.dropped_events,
+        }
  
     # Convenience methods for different log levels
 
-    def debug(self, component: str, message: str, **kwargs):
+    def debug(self, component: str, message: str, **kwargs) -> None:
         """Log DEBUG level event."""
         return self.log_event('DEBUG', component, kwargs.pop('event_type', 'debug'), message, **kwargs)
     
-    def info(self, component: str, message: str, **kwargs):
+    def info(self, component: str, message: str, **kwargs) -> None:
         """Log INFO level event."""
         return self.log_event('INFO', component, kwargs.pop('event_type', 'info'), message, **kwargs)
     
-    def warning(self, component: str, message: str, **kwargs):
+    def warning(self, component: str, message: str, **kwargs) -> None:
         """Log WARNING level event."""
         return self.log_event('WARNING', component, kwargs.pop('event_type', 'warning'), message, **kwargs)
     
-    def error(self, component: str, message: str, **kwargs):
+    def error(self, component: str, message: str, **kwargs) -> None:
         """Log ERROR level event."""
         return self.log_event('ERROR', component, kwargs.pop('event_type', 'error'), message, **kwargs)
     
-    def critical(self, component: str, message: str, **kwargs):
+    def critical(self, component: str, message: str, **kwargs) -> None:
         """Log CRITICAL level event."""
         return self.log_event('CRITICAL', component, kwargs.pop('event_type', 'critical'), message, **kwargs)
 
 
 # Singleton instances for easy import
+offline_journal = OfflineJournal()
 detection_logger = DetectionLogger()
+frame_logger = FrameLogger()
 system_logger = SystemLogger()
 
 
@@ -368,10 +1056,11 @@ if __name__ == "__main__":
         triggered_stop=True
     )
 
-    system_log_id = system_logger.info(
-        component='vision-ai',
-        message='Vision AI module started successfully',
-        event_type='startup',
+    system_log_id = system_logger.log_event_sync(
+        'INFO',
+        'vision-ai',
+        'startup',
+        'Vision AI module started successfully',
         details={'model': 'yolo11n.pt', 'confidence_threshold': 0.5}
     )
 
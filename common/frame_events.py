@@ -0,0 +1,110 @@
+"""
+Frame Events Module
+===================
+"New frame written" notifications from camera_server to vision-ai.
+
+Flow:
+    camera_server → ImageSaver writes latest.jpg → FrameNotifier.notify()
+                  → one UDP datagram to 127.0.0.1:FRAME_EVENT_PORT
+    vision-ai     → FrameEventListener.wait() wakes up → detect immediately
+
+Why UDP on localhost instead of inotify?
+- Works the same on Windows and Linux (inotify is Linux-only, and
+  ReadDirectoryChangesW needs another dependency)
+- Fire-and-forget: camera_server never blocks or fails if vision-ai is
+  down — the datagram is simply dropped
+- Carries the frame id, so the receiver can count superseded frames
+
+Listeners should still poll the file mtime as a fallback (old camera
+builds, replays from other tools, dropped datagrams).
+"""
+
+import json
+import socket
+import logging
+from pathlib import Path
+from typing import Optional
+
+FRAME_EVENT_HOST = "127.0.0.1"
+FRAME_EVENT_PORT = 8010
+MAX_DATAGRAM_BYTES = 4096
+
+logger = logging.getLogger(__name__)
+
+
+class FrameNotifier:
+    """
+    Sender side (camera_server).
+
+    Usage:
+        notifier = FrameNotifier()
+        notifier.notify(path, frame_id=42)
+    """
+
+    def __init__(self, host: str = FRAME_EVENT_HOST, port: int = FRAME_EVENT_PORT):
+        self.address = (host, port)
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sent = 0
+        self.failed = 0
+
+    def notify(self, path: Path, frame_id: Optional[int] = None) -> None:
+        """Announce a new frame; never raises."""
+        payload = json.dumps({"path": str(path), "frame_id": frame_id},
+                             separators=(",", ":")).encode()
+        try:
+            self._sock.sendto(payload, self.address)
+            self.sent += 1
+        except OSError:
+            # Nobody listening (Windows reports ICMP port unreachable) — fine
+            self.failed += 1
+
+    def close(self) -> None:
+        self._sock.close()
+
+
+class FrameEventListener:
+    """
+    Receiver side (vision-ai).
+
+    wait() blocks until at least one event arrives (or timeout), then
+    drains everything already queued — a burst of frames becomes one
+    wake-up, which is how superseded frames get dropped.
+    """
+
+    def __init__(self, host: str = FRAME_EVENT_HOST, port: int = FRAME_EVENT_PORT):
+        """
+        Raises:
+            OSError: If the port cannot be bound (e.g. a second vision-ai)
+        """
+        self.address = (host, port)
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._sock.bind(self.address)
+        self.received = 0
+
+    def wait(self, timeout_s: float) -> list[dict]:
+        """
+        Events received within timeout_s, oldest first (empty on timeout).
+        """
+        events = []
+        self._sock.settimeout(timeout_s)
+        try:
+            events.append(self._sock.recv(MAX_DATAGRAM_BYTES))
+            self._sock.setblocking(False)
+            while True:
+                events.append(self._sock.recv(MAX_DATAGRAM_BYTES))
+        except (BlockingIOError, socket.timeout):
+            pass
+        except OSError as e:
+            logger.debug(f"Frame event socket error: {e}")
+
+        parsed = []
+        for data in events:
+            try:
+                parsed.append(json.loads(data))
+            except ValueError:
+                continue
+        self.received += len(parsed)
+        return parsed
+
+    def close(self) -> None:
+        self._sock.close()
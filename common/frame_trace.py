@@ -0,0 +1,172 @@
+"""
+Frame Trace Module
+==================
+Trace context that follows one camera frame from capture to DB row.
+
+Flow:
+    camera_server  → FrameTrace created at capture (frame_id, capture time)
+                   → embedded in latest.jpg as a JPEG COM segment
+    vision-ai      → read back from the bytes (file or upload), stages added
+                   → returned in the API response, frame_age_ms → detections
+
+Why embed in the JPEG instead of a sidecar file?
+- Trace and pixels can never disagree (no race between two files)
+- Survives agv-control reading latest.jpg and re-uploading it to /detect
+- Decoders ignore COM segments, so the image is unchanged for everyone else
+
+Clocks:
+- capture_mono_ns uses time.monotonic_ns() — system-wide on Linux/Windows,
+  so comparable across processes on the SAME host, immune to NTP steps
+- capture_wall_ns uses time.time_ns() — fallback when the trace crosses
+  hosts, and for frames without a trace (file mtime)
+"""
+
+import json
+import time
+import socket
+from datetime import datetime, timezone
+from typing import Optional, Dict
+
+# COM segment payloads start with this tag so foreign comments are ignored
+TRACE_TAG = b"AGVTRACE"
+
+# Stages are stored as monotonic ns; responses report ms since capture
+STAGE_CAPTURED = "captured"
+
+
+class FrameTrace:
+    """
+    Frame id + capture timestamps + per-stage monotonic timestamps.
+
+    Usage:
+        trace = FrameTrace(frame_id=42)      # at capture
+        trace.mark("encoded")
+        data = trace.embed_in_jpeg(jpeg_bytes)
+
+        trace = FrameTrace.from_jpeg(data)   # in vision-ai
+        trace.mark("received")
+        trace.age_ms()
+    """
+
+    def __init__(self, frame_id: Optional[int],
+                 capture_mono_ns: Optional[int] = None,
+                 capture_wall_ns: Optional[int] = None,
+                 host: Optional[str] = None,
+                 stages: Optional[Dict[str, int]] = None):
+        self.frame_id = frame_id
+        self.capture_mono_ns = time.monotonic_ns() if capture_mono_ns is None else capture_mono_ns
+        self.capture_wall_ns = time.time_ns() if capture_wall_ns is None else capture_wall_ns
+        self.host = host or socket.gethostname()
+        self.stages: Dict[str, int] = stages or {STAGE_CAPTURED: self.capture_mono_ns}
+
+    @classmethod
+    def from_wall_time(cls, frame_id: Optional[int], wall_ns: int) -> 'FrameTrace':
+        """
+        Trace for a frame that carries no embedded context (e.g. file mtime).
+
+        Monotonic capture time is reconstructed from the wall-clock offset,
+        so age_ms() still works; stages before "received" are unknown.
+        """
+        offset_ns = time.time_ns() - wall_ns
+        mono_ns = time.monotonic_ns() - offset_ns
+        return cls(frame_id, capture_mono_ns=mono_ns, capture_wall_ns=wall_ns,
+                   stages={STAGE_CAPTURED: mono_ns})
+
+    # -----------------------------------------------------------------------
+    # Stages and age
+    # -----------------------------------------------------------------------
+    def mark(self, stage: str) -> None:
+        """Record the current monotonic time for a pipeline stage."""
+        self.stages[stage] = time.monotonic_ns()
+
+    def age_ms(self) -> float:
+        """
+        Milliseconds since capture.
+
+        Uses the monotonic clock when the trace was created on this host,
+        wall clock otherwise.
+        """
+        if self.host == socket.gethostname():
+            return (time.monotonic_ns() - self.capture_mono_ns) / 1e6
+        return (time.time_ns() - self.capture_wall_ns) / 1e6
+
+    def to_response(self) -> dict:
+        """JSON-friendly view: stages as ms since capture."""
+        return {
+            "frame_id": self.frame_id,
+            "captured_at": datetime.fromtimestamp(
+                self.capture_wall_ns / 1e9, tz=timezone.utc
+            ).isoformat(),
+            "stages_ms": {
+                stage: round((mono_ns - self.capture_mono_ns) / 1e6, 2)
+                for stage, mono_ns in sorted(self.stages.items(), key=lambda kv: kv[1])
+            },
+            "frame_age_ms": round(self.age_ms(), 2),
+        }
+
+    # -----------------------------------------------------------------------
+    # Serialization (JPEG COM segment / HTTP header)
+    # -----------------------------------------------------------------------
+    def to_payload(self) -> bytes:
+        """Compact JSON payload (shared by JPEG COM and X-Frame-Trace)."""
+        return json.dumps({
+            "frame_id": self.frame_id,
+            "mono_ns": self.capture_mono_ns,
+            "wall_ns": self.capture_wall_ns,
+            "host": self.host,
+            "stages": self.stages,
+        }, separators=(",", ":")).encode()
+
+    @classmethod
+    def from_payload(cls, payload) -> Optional['FrameTrace']:
+        """Parse a payload; returns None if it is malformed."""
+        try:
+            data = json.loads(bytes(payload))
+            return cls(
+                frame_id=None if data["frame_id"] is None else int(data["frame_id"]),
+                capture_mono_ns=int(data["mono_ns"]),
+                capture_wall_ns=int(data["wall_ns"]),
+                host=str(data.get("host", "")),
+                stages={str(k): int(v) for k, v in data.get("stages", {}).items()},
+            )
+        except (ValueError, KeyError, TypeError):
+            return None
+
+    def embed_in_jpeg(self, jpeg_bytes: bytes) -> bytes:
+        """Insert the trace as a COM (0xFFFE) segment right after SOI."""
+        body = TRACE_TAG + self.to_payload()
+        if jpeg_bytes[:2] != b"\xff\xd8" or len(body) + 2 > 0xFFFF:
+            return jpeg_bytes
+        segment = b"\xff\xfe" + (len(body) + 2).to_bytes(2, "big") + body
+        return jpeg_bytes[:2] + segment + jpeg_bytes[2:]
+
+    @classmethod
+    def from_jpeg(cls, data) -> Optional['FrameTrace']:
+        """
+        Find the trace COM segment in JPEG bytes.
+
+        Only the header segments before the first SOF/SOS are scanned,
+        so this costs microseconds regardless of image size.
+        """
+        view = memoryview(data)
+        size = len(view)
+        if size < 4 or view[0] != 0xFF or view[1] != 0xD8:
+            return None
+
+        pos = 2
+        while pos + 4 <= size:
+            if view[pos] != 0xFF:
+                return None
+            marker = view[pos + 1]
+            if marker == 0xFF:
+                pos += 1
+                continue
+            if marker == 0xDA or 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xCC):
+                return None  # reached image data — no trace
+            length = (view[pos + 2] << 8) | view[pos + 3]
+            if marker == 0xFE:
+                body = view[pos + 4:pos + 2 + length]
+                if bytes(body[:len(TRACE_TAG)]) == TRACE_TAG:
+                    return cls.from_payload(body[len(TRACE_TAG):])
+            pos += 2 + length
+        return None
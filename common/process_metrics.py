@@ -0,0 +1,91 @@
+"""
+Process Metrics Module
+======================
+Resident memory, open file descriptors and thread count of a process.
+
+Used by:
+- vision-ai GET /debug/memory (own process)
+- vision-ai/benchmarks/soak_test.py (child processes, sampled for hours)
+
+Uses psutil when installed (works on Windows and Linux); otherwise reads
+/proc (Linux only). Values this platform cannot provide are None, so
+callers never need to care which backend answered.
+"""
+
+import os
+import logging
+from pathlib import Path
+from typing import Optional
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+PROC_DIR = Path("/proc")
+
+logger = logging.getLogger(__name__)
+
+
+def sample_process(pid: Optional[int] = None) -> dict:
+    """
+    One sample of a process (default: this process).
+
+    Returns:
+        {"rss_bytes", "open_fds", "threads"} — each an int or None.
+        open_fds counts handles on Windows.
+
+    Raises:
+        ProcessLookupError: If the process does not exist (anymore)
+    """
+    pid = os.getpid() if pid is None else pid
+    if PSUTIL_AVAILABLE:
+        return _sample_psutil(pid)
+    if PROC_DIR.is_dir():
+        return _sample_proc(pid)
+    return {"rss_bytes": None, "open_fds": None, "threads": None}
+
+
+def _sample_psutil(pid: int) -> dict:
+    try:
+        process = psutil.Process(pid)
+        with process.oneshot():
+            open_fds = process.num_fds() if hasattr(process, "num_fds") else process.num_handles()
+            return {
+                "rss_bytes": process.memory_info().rss,
+                "open_fds": open_fds,
+                "threads": process.num_threads(),
+            }
+    except psutil.NoSuchProcess as e:
+        raise ProcessLookupError(pid) from e
+    except psutil.AccessDenied as e:
+        logger.debug(f"Cannot sample process {pid}: {e}")
+        return {"rss_bytes": None, "open_fds": None, "threads": None}
+
+
+def _sample_proc(pid: int) -> dict:
+    """Linux fallback: /proc/<pid>/status (VmRSS, Threads) + /proc/<pid>/fd."""
+    proc = PROC_DIR / str(pid)
+    try:
+        status = (proc / "status").read_text()
+    except FileNotFoundError as e:
+        raise ProcessLookupError(pid) from e
+
+    fields = {}
+    for line in status.splitlines():
+        key, _, value = line.partition(":")
+        fields[key] = value.split()
+
+    try:
+        open_fds = len(os.listdir(proc / "fd"))
+    except PermissionError:
+        open_fds = None  # another user's process
+
+    rss = fields.get("VmRSS")  # ["12345", "kB"]; absent for zombies
+    threads = fields.get("Threads")
+    return {
+        "rss_bytes": int(rss[0]) * 1024 if rss else None,
+        "open_fds": open_fds,
+        "threads": int(threads[0]) if threads else None,
+    }
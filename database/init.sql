@@ -8,6 +8,8 @@
 -- ============================================================================
 
 -- Clean slate (be careful in production!)
+DROP VIEW IF EXISTS detections_all CASCADE;
+DROP TABLE IF EXISTS detection_frames CASCADE;
 DROP TABLE IF EXISTS detections CASCADE;
 DROP TABLE IF EXISTS paths CASCADE;
 DROP TABLE IF EXISTS system_logs CASCADE;
@@ -25,6 +27,8 @@ CREATE TABLE detections (
     -- Detection metadata
     image_path VARCHAR(255),
     processing_time_ms INTEGER,  -- YOLO inference latency
+    frame_id BIGINT,             -- camera frame number (from frame trace)
+    frame_age_ms INTEGER,        -- capture → detection result (clamped to >= 0 by vision-ai)
     
     -- Object detection results
     object_class VARCHAR(50) NOT NULL,  -- 'box', 'person', 'forklift', 'pallet'
@@ -53,6 +57,78 @@ CREATE INDEX idx_detections_high_confidence ON detections(confidence DESC) WHERE
 COMMENT ON TABLE detections IS 'Vision AI detection logs for obstacle analysis';
 COMMENT ON COLUMN detections.confidence IS 'YOLO confidence score (0-1). Threshold typically 0.5-0.7';
 COMMENT ON COLUMN detections.triggered_stop IS 'Did this detection trigger emergency stop?';
+COMMENT ON COLUMN detections.frame_age_ms IS 'Time from camera capture to detection result (includes time on disk)';
+
+-- ============================================================================
+-- TABLE: detection_frames
+-- ============================================================================
+-- Purpose: Compact alternative to detections — ONE row per processed frame
+-- Business Case: "Log every frame at full rate without write amplification"
+--   - 1 row + 1 index entry per frame instead of per box
+--   - Boxes as packed REAL arrays, no DECIMAL/CHECK cost per value
+--   - Frames with zero detections are stored too ("AI saw nothing")
+--   - Written in bulk by common/db_logger.py (frame_logger), no RETURNING
+-- Element i of every array belongs to detection i.
+-- ============================================================================
+CREATE TABLE detection_frames (
+    id BIGSERIAL PRIMARY KEY,
+    timestamp TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+
+    -- Frame metadata
+    image_path VARCHAR(255),
+    processing_time_ms INTEGER,
+    frame_id BIGINT,
+    frame_age_ms INTEGER,
+
+    -- Packed detections
+    object_classes TEXT[] NOT NULL DEFAULT '{}',
+    confidences REAL[] NOT NULL DEFAULT '{}',
+    boxes REAL[] NOT NULL DEFAULT '{}',   -- x1,y1,x2,y2 per detection (normalized 0-1), flattened
+    distances REAL[],                     -- NULL element = unknown distance
+    triggered_stops BOOLEAN[],            -- NULL = no detection triggered a stop
+
+    -- Same boxes also written to detections (DETECTION_STORAGE = "both")
+    in_detections BOOLEAN NOT NULL DEFAULT FALSE
+);
+
+CREATE INDEX idx_detection_frames_timestamp ON detection_frames(timestamp DESC);
+
+COMMENT ON TABLE detection_frames IS 'Frame-level detection log (packed arrays); per-detection shape via detections_all';
+COMMENT ON COLUMN detection_frames.boxes IS 'Flattened [x1,y1,x2,y2, x1,y1,x2,y2, ...], 4 values per detection';
+COMMENT ON COLUMN detection_frames.in_detections IS 'Boxes also logged to detections; detections_all skips this frame';
+
+-- ============================================================================
+-- VIEW: detections_all
+-- ============================================================================
+-- Per-detection shape of BOTH tables, so existing detection queries keep
+-- working whichever storage vision-ai writes to: replace
+-- "FROM detections" with "FROM detections_all".
+-- Rows from detection_frames have id NULL (source = 'frames'). Frames
+-- written with DETECTION_STORAGE = "both" (in_detections) are skipped:
+-- their boxes are already in detections, each box appears once.
+-- ============================================================================
+CREATE VIEW detections_all AS
+SELECT
+    d.id, d.timestamp, d.image_path, d.processing_time_ms, d.frame_id, d.frame_age_ms,
+    d.object_class, d.confidence,
+    d.bbox_x1, d.bbox_y1, d.bbox_x2, d.bbox_y2,
+    d.distance_meters, d.triggered_stop,
+    'rows'::TEXT AS source
+FROM detections d
+UNION ALL
+SELECT
+    NULL::BIGINT, f.timestamp, f.image_path, f.processing_time_ms, f.frame_id, f.frame_age_ms,
+    u.object_class::VARCHAR(50), u.confidence::DECIMAL(5,4),
+    f.boxes[u.n::INT * 4 - 3]::DECIMAL(6,5), f.boxes[u.n::INT * 4 - 2]::DECIMAL(6,5),
+    f.boxes[u.n::INT * 4 - 1]::DECIMAL(6,5), f.boxes[u.n::INT * 4]::DECIMAL(6,5),
+    f.distances[u.n::INT]::DECIMAL(5,2), COALESCE(f.triggered_stops[u.n::INT], FALSE),
+    'frames'::TEXT
+FROM detection_frames f
+CROSS JOIN LATERAL unnest(f.object_classes, f.confidences)
+    WITH ORDINALITY AS u(object_class, confidence, n)
+WHERE NOT f.in_detections;
+
+COMMENT ON VIEW detections_all IS 'detections + unpacked detection_frames in the per-detection shape';
 
 -- ============================================================================
 -- TABLE: paths
@@ -187,7 +263,7 @@ VALUES
 --     confidence,
 --     distance_meters,
 --     triggered_stop
--- FROM detections
+-- FROM detections_all   -- covers both per-detection and frame-level storage
 -- WHERE timestamp BETWEEN '2024-01-15 14:28:00' AND '2024-01-15 14:31:00'
 -- ORDER BY timestamp;
 
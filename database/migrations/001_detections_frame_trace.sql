@@ -0,0 +1,20 @@
+-- ============================================================================
+-- Migration 001: frame trace columns on detections
+-- ============================================================================
+-- For databases created before detections had frame_id / frame_age_ms.
+-- init.sql drops every table, so run this instead on a database that
+-- already holds detection history. Safe to run more than once.
+--
+--   \c agv_control_db
+--   \i migrations/001_detections_frame_trace.sql
+-- ============================================================================
+
+ALTER TABLE detections ADD COLUMN IF NOT EXISTS frame_id BIGINT;
+ALTER TABLE detections ADD COLUMN IF NOT EXISTS frame_age_ms INTEGER;
+
+-- An early init.sql had CHECK (frame_age_ms >= 0). Camera and vision-ai
+-- clocks can disagree by a few ms, and a rejected row loses the detection
+-- itself, so vision-ai clamps the value instead.
+ALTER TABLE detections DROP CONSTRAINT IF EXISTS detections_frame_age_ms_check;
+
+COMMENT ON COLUMN detections.frame_age_ms IS 'Time from camera capture to detection result (includes time on disk)';
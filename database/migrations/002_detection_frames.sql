@@ -0,0 +1,71 @@
+-- ============================================================================
+-- Migration 002: detection_frames table + detections_all view
+-- ============================================================================
+-- For databases created before DETECTION_STORAGE = "frames" existed.
+-- Needed before switching vision-ai to "both" or "frames". The existing
+-- detections table is untouched. Safe to run more than once. Run 001 first:
+-- the view reads detections.frame_id / frame_age_ms.
+--
+--   \c agv_control_db
+--   \i migrations/002_detection_frames.sql
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS detection_frames (
+    id BIGSERIAL PRIMARY KEY,
+    timestamp TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+
+    -- Frame metadata
+    image_path VARCHAR(255),
+    processing_time_ms INTEGER,
+    frame_id BIGINT,
+    frame_age_ms INTEGER,
+
+    -- Packed detections
+    object_classes TEXT[] NOT NULL DEFAULT '{}',
+    confidences REAL[] NOT NULL DEFAULT '{}',
+    boxes REAL[] NOT NULL DEFAULT '{}',   -- x1,y1,x2,y2 per detection (normalized 0-1), flattened
+    distances REAL[],                     -- NULL element = unknown distance
+    triggered_stops BOOLEAN[],            -- NULL = no detection triggered a stop
+
+    -- Same boxes also written to detections (DETECTION_STORAGE = "both")
+    in_detections BOOLEAN NOT NULL DEFAULT FALSE
+);
+
+-- Databases that ran an earlier version of this migration
+ALTER TABLE detection_frames
+    ADD COLUMN IF NOT EXISTS in_detections BOOLEAN NOT NULL DEFAULT FALSE;
+
+CREATE INDEX IF NOT EXISTS idx_detection_frames_timestamp ON detection_frames(timestamp DESC);
+
+COMMENT ON TABLE detection_frames IS 'Frame-level detection log (packed arrays); per-detection shape via detections_all';
+COMMENT ON COLUMN detection_frames.boxes IS 'Flattened [x1,y1,x2,y2, x1,y1,x2,y2, ...], 4 values per detection';
+COMMENT ON COLUMN detection_frames.in_detections IS 'Boxes also logged to detections; detections_all skips this frame';
+
+-- Per-detection shape of BOTH tables, so existing detection queries keep
+-- working whichever storage vision-ai writes to: replace
+-- "FROM detections" with "FROM detections_all".
+-- Rows from detection_frames have id NULL (source = 'frames'). Frames
+-- written with DETECTION_STORAGE = "both" (in_detections) are skipped:
+-- their boxes are already in detections, each box appears once.
+CREATE OR REPLACE VIEW detections_all AS
+SELECT
+    d.id, d.timestamp, d.image_path, d.processing_time_ms, d.frame_id, d.frame_age_ms,
+    d.object_class, d.confidence,
+    d.bbox_x1, d.bbox_y1, d.bbox_x2, d.bbox_y2,
+    d.distance_meters, d.triggered_stop,
+    'rows'::TEXT AS source
+FROM detections d
+UNION ALL
+SELECT
+    NULL::BIGINT, f.timestamp, f.image_path, f.processing_time_ms, f.frame_id, f.frame_age_ms,
+    u.object_class::VARCHAR(50), u.confidence::DECIMAL(5,4),
+    f.boxes[u.n::INT * 4 - 3]::DECIMAL(6,5), f.boxes[u.n::INT * 4 - 2]::DECIMAL(6,5),
+    f.boxes[u.n::INT * 4 - 1]::DECIMAL(6,5), f.boxes[u.n::INT * 4]::DECIMAL(6,5),
+    f.distances[u.n::INT]::DECIMAL(5,2), COALESCE(f.triggered_stops[u.n::INT], FALSE),
+    'frames'::TEXT
+FROM detection_frames f
+CROSS JOIN LATERAL unnest(f.object_classes, f.confidences)
+    WITH ORDINALITY AS u(object_class, confidence, n)
+WHERE NOT f.in_detections;
+
+COMMENT ON VIEW detections_all IS 'detections + unpacked detection_frames in the per-detection shape';
@@ -12,20 +12,36 @@ Integration:
 - Reads images from camera/images/latest.jpg (or uploaded file)
 - Logs detections to PostgreSQL via common/db_logger.py
 - Returns JSON for agv-control (C#) to consume
+- Co-located clients: same API on a Unix socket, or gRPC (grpc_transport.py)
 """
 
+import os
 import sys
+import copy
+import math
 import time
+import hashlib
+import socket
 import logging
+import threading
+import tracemalloc
+from collections import OrderedDict, deque
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional
-from contextlib import asynccontextmanager
+from typing import Optional, Callable, ContextManager
+from contextlib import asynccontextmanager, contextmanager, nullcontext
 
 import cv2
 import numpy as np
-from fastapi import FastAPI, File, UploadFile, Query, HTTPException
+from fastapi import FastAPI, File, UploadFile, Query, HTTPException, Request, Header
 from fastapi.responses import JSONResponse
-from ultralytics import YOLO
+from starlette.concurrency import run_in_threadpool
+
+try:
+    from ultralytics import YOLO
+    ULTRALYTICS_AVAILABLE = True
+except ImportError:  # benchmarks/tests with load_test.StubDetector need no model stack
+    ULTRALYTICS_AVAILABLE = False
 
 # ---------------------------------------------------------------------------
 # Path Setup — allow importing common/ from project root
@@ -33,13 +49,104 @@ from ultralytics import YOLO
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
+from common.frame_trace import FrameTrace  # no external deps — always available
+from common.frame_events import FrameEventListener, FRAME_EVENT_HOST, FRAME_EVENT_PORT
+from common.process_metrics import sample_process
+from calibration import CameraCalibration
+
 # ---------------------------------------------------------------------------
 # Configuration
 # ---------------------------------------------------------------------------
 MODEL_NAME = Path(__file__).parent / "best.pt"  # Fine-tuned YOLOv11s for warehouse objects
 DEFAULT_CONFIDENCE_THRESHOLD = 0.5
+MODEL_INPUT_SIZE = 640  # YOLO imgsz — long side of the letterboxed model input
 CAMERA_IMAGE_PATH = PROJECT_ROOT / "camera" / "images" / "latest.jpg"
 
+# /detect/raw — request body buffers
+RAW_BODY_MAX_BYTES = 32 * 1024 * 1024   # 4K BGR frame ≈ 25 MB
+RAW_BODY_INITIAL_BYTES = 1024 * 1024    # 640×480 BGR ≈ 0.9 MB
+RAW_BODY_POOL_SIZE = 4                  # idle buffers kept for reuse
+
+# Result cache — identical bytes (client retries, test rigs) skip inference
+RESULT_CACHE_MAX_ENTRIES = 256
+RESULT_CACHE_TTL_S = 30.0
+
+# Tiled (sliced) inference — opt-in, for small distant obstacles in hi-res frames
+TILED_INFERENCE = False
+TILE_SIZE = 640                      # tile edge in source pixels (= imgsz per tile)
+TILE_OVERLAP = 0.2                   # fraction of a tile shared with its neighbour
+TILE_MAX_COUNT = 6                   # latency bound: region is downscaled to fit
+TILE_INCLUDE_FULL_FRAME = True       # extra whole-frame pass for large objects
+TILE_REGION = (0.0, 0.35, 1.0, 1.0)  # normalized x1,y1,x2,y2 (floor ahead); None = all
+TILE_NMS_IOU = 0.5                   # cross-tile NMS IoU threshold
+
+# Region of interest — infer only on the part of the frame the route can occupy.
+# Normalized x1,y1,x2,y2 of the source frame; None = whole frame. Requests override it
+# with ?roi=x1,y1,x2,y2 or ?corridor=half_width_m,range_m[,lateral_offset_m[,near_m]].
+ROI_REGION: Optional[tuple[float, float, float, float]] = None   # e.g. (0.0, 0.35, 1.0, 1.0)
+ROI_MARGIN = 0.03             # normalized padding around a corridor ROI (box edges need context)
+ROI_STRIDE_PX = 32            # YOLO stride — ROI imgsz is rounded up to a multiple of it
+
+# Camera mounting — projects a floor corridor (path ahead) into the image for ?corridor=
+CAMERA_MOUNT_HEIGHT_M = 0.25  # lens above the floor
+CAMERA_PITCH_DEG = 10.0       # downward tilt of the optical axis
+CORRIDOR_NEAR_M = 0.3         # closest floor distance that matters (bumper); per request: near_m
+ROI_OBSTACLE_HEIGHT_M = 0.5   # corridor is extruded this high — whole obstacles, not footprints
+                              # (capped at CAMERA_MOUNT_HEIGHT_M: the top edge stops at the horizon)
+
+# Hot model reload — POST /admin/model/reload, or replace MODEL_NAME on disk
+MODEL_WATCH_INTERVAL_S: Optional[float] = 2.0   # poll MODEL_NAME mtime; None = endpoint only
+RELOAD_WARMUP_RUNS = 3                           # warm-up inferences before the swap
+RELOAD_SMOKE_IMAGE_PATH = Path(__file__).parent / "smoke.jpg"  # missing = gray frame
+
+# Recent detections — in-memory ring for GET /detections/recent (no DB load)
+RECENT_DETECTIONS_CAPACITY = 20_000   # rows (~1.2 MB); oldest overwritten first
+RECENT_QUERY_MAX_WINDOW_S = 3600.0
+RECENT_QUERY_DEFAULT_LIMIT = 500
+
+# Event-driven precompute — detect latest.jpg on arrival, before anyone polls
+PRECOMPUTE_ON_ARRIVAL = True
+FRAME_EVENTS_ENABLED = True          # UDP events from camera_server (else mtime polling only)
+PRECOMPUTE_POLL_INTERVAL_S = 0.05    # mtime check when no event arrives
+PRECOMPUTE_WAIT_MS = 1000.0          # a poll for the frame being precomputed waits for it
+
+# Memory debugging — GET /debug/memory (tracemalloc snapshot diff, process RSS/FDs/threads)
+TRACEMALLOC_AT_STARTUP = False   # trace from startup; else the first GET /debug/memory starts it
+TRACEMALLOC_FRAMES = 10          # stack depth kept per allocation (deeper = slower, more memory)
+MEMORY_DEBUG_MAX_TOP = 100
+
+# Admission control — priority classes share the inference slots (strict order).
+# Cache hits bypass admission; only decode + inference take a slot.
+INFERENCE_CONCURRENCY = 1                        # one model, one device — parallel runs only contend
+PRIORITY_CLASSES = ("critical", "normal", "low")  # highest first; X-Priority header picks one
+PRIORITY_QUEUE_LIMITS = {"critical": 8, "normal": 16, "low": 16}
+# Default deadline per class (ms from arrival), overridden by X-Deadline-Ms; None = no deadline.
+# critical = agv-control VisionClient timeout: answer 503 now rather than time out later.
+DEFAULT_DEADLINE_MS: dict[str, Optional[float]] = {"critical": 2000.0, "normal": None, "low": None}
+
+# Detection storage — "rows" = one detections row per box (what existing queries
+# read), "frames" = one detection_frames row per frame (arrays, bulk async insert,
+# empty frames included), "both" = write both while readers move to the view
+# detections_all (which counts each box once in "both"). Switch to "frames" only
+# once nothing reads `detections` directly.
+DETECTION_STORAGE = "rows"
+
+# Frame age — reject frames older than this (capture → request), None = off.
+# agv-control treats the HTTP 409 like any failed poll (safe halt).
+MAX_FRAME_AGE_MS: Optional[float] = None
+
+# Transports — `python app.py` serves HTTP on TCP and, for co-located clients
+# (agv-control on this machine), on a Unix domain socket: same API, no TCP stack.
+HTTP_HOST = "0.0.0.0"
+HTTP_PORT = 8000
+HTTP_UDS_PATH: Optional[str] = "/tmp/agv-vision-ai.sock"   # None = TCP only (always on Windows)
+
+# gRPC (proto/vision.proto) — typed messages, StreamLatest pushes each new frame.
+# Needs grpcio + grpcio-tools; skipped with a warning if missing.
+GRPC_ENABLED = True
+GRPC_ADDRESSES = ("127.0.0.1:50051", "unix:/tmp/agv-vision-ai-grpc.sock")
+GRPC_MAX_WORKERS = 16   # concurrent RPCs — each StreamLatest subscriber holds one
+
 # ---------------------------------------------------------------------------
 # Distance Estimation — Pinhole Camera Model
 # ---------------------------------------------------------------------------
@@ -49,9 +156,15 @@ CAMERA_IMAGE_PATH = PROJECT_ROOT / "camera" / "images" / "latest.jpg"
 # For typical 640×480 webcam with ~60° horizontal FOV:
 #   focal_length ≈ 640 / (2 × tan(30°)) ≈ 554 pixels
 #
-# Adjust FOCAL_LENGTH_PX if using a different camera.
+# Adjust FOCAL_LENGTH_PX if using a different camera — or better, calibrate:
+# calibration.py writes CALIBRATION_PATH, and its fy replaces this guess.
 # ---------------------------------------------------------------------------
 FOCAL_LENGTH_PX = 554.0
+FOCAL_LENGTH_REFERENCE_SIZE = (640, 480)  # frame size FOCAL_LENGTH_PX applies to
+
+# Lens calibration (vision-ai/calibration.py); file missing = FOCAL_LENGTH_PX, no undistortion
+CALIBRATION_PATH = Path(__file__).parent / "calibration.json"
+UNDISTORT_MODE = "points"  # "points" = box corners only, "frame" = remap whole frame, "off" = fy only
 
 # Known real-world heights for each trained class (meters)
 # Used by DistanceEstimator to convert bbox size → distance
@@ -73,13 +186,22 @@ logger = logging.getLogger("vision-ai")
 # Database Logger (optional — graceful degradation)
 # ---------------------------------------------------------------------------
 try:
-    from common.db_logger import detection_logger, system_logger
+    from common.db_logger import detection_logger, frame_logger, system_logger, DatabaseConnection
     DB_AVAILABLE = True
     logger.info("Database logger loaded — detections will be logged to PostgreSQL")
 except ImportError:
     DB_AVAILABLE = False
     logger.warning("common.db_logger not found — running without database logging")
 
+# ---------------------------------------------------------------------------
+# gRPC Transport (optional — graceful degradation)
+# ---------------------------------------------------------------------------
+try:
+    from grpc_transport import GrpcTransport, VisionDetectionServicer
+    GRPC_AVAILABLE = True
+except (ImportError, NotImplementedError):  # grpcio / grpcio-tools (runtime .proto compile) missing
+    GRPC_AVAILABLE = False
+
 
 # ===========================================================================
 # DistanceEstimator — Single Responsibility: Distance calculation ONLY
@@ -129,6 +251,468 @@ class DistanceEstimator:
 
         return round(distance, 2)
 
+    def estimate_batch(self, object_classes: list[str], bbox_heights_px: np.ndarray,
+                       focal_length_px: float | None = None) -> list[float | None]:
+        """
+        Vectorized estimate() for all boxes of a frame.
+
+        Args:
+            object_classes: YOLO class name per box
+            bbox_heights_px: Bounding box heights in pixels, shape (N,)
+            focal_length_px: Override (calibrated fy at the frame size)
+
+        Returns:
+            Distance in meters per box, None where the height is invalid
+        """
+        heights = np.asarray(bbox_heights_px, dtype=np.float64)
+        real_heights = np.array(
+            [self.known_heights.get(name, self.default_height) for name in object_classes],
+            dtype=np.float64,
+        )
+        focal = self.focal_length_px if focal_length_px is None else focal_length_px
+        valid = heights > 0
+        distances = np.round(real_heights * focal / np.where(valid, heights, 1.0), 2)
+        return [float(d) if ok else None for d, ok in zip(distances, valid)]
+
+
+# ===========================================================================
+# CorridorProjector — Single Responsibility: floor corridor → image ROI ONLY
+# ===========================================================================
+class CorridorProjector:
+    """
+    Project the floor corridor the AGV is about to drive through into a
+    normalized image region (for ROI inference).
+
+    Geometry: pinhole camera CAMERA_MOUNT_HEIGHT_M above a flat floor,
+    pitched down CAMERA_PITCH_DEG. The corridor is a floor rectangle
+    (lateral_offset ± half_width, CORRIDOR_NEAR_M … range) extruded up to
+    ROI_OBSTACLE_HEIGHT_M; the ROI is the image bounding box of its 8
+    corners plus ROI_MARGIN. Extruding matters: cutting an obstacle at its
+    footprint would shrink its bbox height and overestimate its distance.
+
+    The extrusion is capped at the mount height. A point above the lens
+    close to the camera projects far above the frame, so an uncapped
+    corridor starting at the bumper always reached y1 = 0. Capped, the top
+    edge is the horizon row. Anything taller is cut there, which close
+    up is where the frame edge cuts it anyway.
+    """
+
+    def __init__(self, focal_length_px: float = FOCAL_LENGTH_PX,
+                 image_size: tuple[int, int] = FOCAL_LENGTH_REFERENCE_SIZE,
+                 principal_point: tuple[float, float] | None = None,
+                 mount_height_m: float = CAMERA_MOUNT_HEIGHT_M,
+                 pitch_deg: float = CAMERA_PITCH_DEG,
+                 obstacle_height_m: float = ROI_OBSTACLE_HEIGHT_M,
+                 margin: float = ROI_MARGIN):
+        self.focal_length_px = focal_length_px
+        self.image_size = image_size
+        self.principal_point = principal_point or (image_size[0] / 2, image_size[1] / 2)
+        self.mount_height_m = mount_height_m
+        self.pitch_rad = math.radians(pitch_deg)
+        self.obstacle_height_m = obstacle_height_m
+        self.margin = margin
+
+    @classmethod
+    def from_calibration(cls, calibration: CameraCalibration | None) -> 'CorridorProjector':
+        """Use calibrated intrinsics (rectified fy, principal point) when available."""
+        if calibration is None:
+            return cls()
+        size = calibration.image_size
+        matrix = calibration.rectified_matrix(size)
+        return cls(float(matrix[1, 1]), size, (float(matrix[0, 2]), float(matrix[1, 2])))
+
+    def project(self, half_width_m: float, range_m: float, lateral_offset_m: float = 0.0,
+                near_m: float = CORRIDOR_NEAR_M) -> tuple[float, float, float, float] | None:
+        """
+        Corridor → normalized (x1, y1, x2, y2), or None if it is not in view
+        (caller then uses the whole frame — never skip pixels on a guess).
+
+        Args:
+            half_width_m: Half the swept width (AGV half width + clearance)
+            range_m: How far ahead the corridor reaches (stopping distance + margin)
+            lateral_offset_m: Corridor centre right (+) / left (-) of the optical axis
+            near_m: Where the corridor starts; the near edge spans the widest
+                part of the image, so a larger value crops more
+        """
+        lateral = np.array([lateral_offset_m - half_width_m, lateral_offset_m + half_width_m])
+        ahead = np.array([max(near_m, 0.01), max(range_m, near_m + 0.01)])
+        heights = np.array([0.0, min(self.obstacle_height_m, self.mount_height_m)])
+        x, z, h = (grid.ravel() for grid in np.meshgrid(lateral, ahead, heights))
+
+        # Level camera frame (y down, z forward), then pitch the camera down
+        y = self.mount_height_m - h
+        cos_p, sin_p = math.cos(self.pitch_rad), math.sin(self.pitch_rad)
+        y_cam = y * cos_p - z * sin_p
+        z_cam = y * sin_p + z * cos_p
+        in_front = z_cam > 1e-3
+        if not in_front.any():
+            return None
+
+        cx, cy = self.principal_point
+        u = cx + self.focal_length_px * x[in_front] / z_cam[in_front]
+        v = cy + self.focal_length_px * y_cam[in_front] / z_cam[in_front]
+        width, height = self.image_size
+        x1 = max(0.0, float(u.min()) / width - self.margin)
+        y1 = max(0.0, float(v.min()) / height - self.margin)
+        x2 = min(1.0, float(u.max()) / width + self.margin)
+        y2 = min(1.0, float(v.max()) / height + self.margin)
+        if x2 <= x1 or y2 <= y1:
+            return None
+        return round(x1, 4), round(y1, 4), round(x2, 4), round(y2, 4)
+
+
+# ===========================================================================
+# ImageDecoder — Single Responsibility: JPEG/PNG bytes → BGR array ONLY
+# ===========================================================================
+class ImageDecoder:
+    """
+    Decode image bytes, using libjpeg's DCT-domain downscaling when possible.
+
+    YOLO letterboxes every frame to MODEL_INPUT_SIZE on its long side, so
+    decoding a 1920×1080 JPEG at full resolution only to throw 3/4 of the
+    pixels away is wasted work. cv2.IMREAD_REDUCED_COLOR_2/4/8 let libjpeg
+    skip most of the IDCT for those pixels.
+
+    Rule: pick the largest factor (8, 4, 2) whose decoded long side is still
+    >= model input size, so YOLO never has to upsample. Non-JPEG input (PNG)
+    or a JPEG whose header cannot be parsed falls back to a full decode.
+    """
+
+    # Reduction factor → OpenCV imread flag
+    REDUCED_FLAGS = {
+        8: cv2.IMREAD_REDUCED_COLOR_8,
+        4: cv2.IMREAD_REDUCED_COLOR_4,
+        2: cv2.IMREAD_REDUCED_COLOR_2,
+    }
+
+    # SOFn markers carry frame dimensions (C4 = DHT, C8 = JPG, CC = DAC are not SOF)
+    _SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+    def __init__(self, model_input_size: int | None = MODEL_INPUT_SIZE):
+        # None = always full resolution (tiled inference needs every pixel)
+        self.model_input_size = model_input_size
+
+    @classmethod
+    def jpeg_dimensions(cls, data) -> tuple[int, int] | None:
+        """
+        Read (width, height) from a JPEG header without decoding pixels.
+
+        Walks the marker segments until the first SOFn marker.
+
+        Returns:
+            (width, height), or None if data is not a parseable JPEG
+        """
+        view = memoryview(data)
+        size = len(view)
+        if size < 4 or view[0] != 0xFF or view[1] != 0xD8:
+            return None
+
+        pos = 2
+        while pos + 4 <= size:
+            if view[pos] != 0xFF:
+                return None
+            marker = view[pos + 1]
+            if marker == 0xFF:          # fill byte
+                pos += 1
+                continue
+            if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7:
+                pos += 2                # standalone markers have no length
+                continue
+            segment_length = (view[pos + 2] << 8) | view[pos + 3]
+            if marker in cls._SOF_MARKERS:
+                if pos + 9 > size:
+                    return None
+                height = (view[pos + 5] << 8) | view[pos + 6]
+                width = (view[pos + 7] << 8) | view[pos + 8]
+                return (width, height) if width and height else None
+            pos += 2 + segment_length
+        return None
+
+    def choose_reduction(self, width: int, height: int) -> int:
+        """Largest reduction factor that keeps the long side >= model input."""
+        if self.model_input_size is None:
+            return 1
+        long_side = max(width, height)
+        for factor in self.REDUCED_FLAGS:
+            if long_side // factor >= self.model_input_size:
+                return factor
+        return 1
+
+    def decode(self, image_bytes) -> tuple[np.ndarray | None, tuple[int, int] | None]:
+        """
+        Decode image bytes into a BGR array.
+
+        Args:
+            image_bytes: Encoded image (bytes, bytearray or memoryview)
+
+        Returns:
+            (image, original_size) where original_size is (width, height) of
+            the source image as displayed (EXIF orientation applied, like the
+            decoded pixels). image is None if the bytes cannot be decoded.
+        """
+        nparr = np.frombuffer(image_bytes, np.uint8)
+
+        dims = self.jpeg_dimensions(image_bytes)
+        factor = self.choose_reduction(*dims) if dims else 1
+        flag = self.REDUCED_FLAGS.get(factor, cv2.IMREAD_COLOR)
+
+        image = cv2.imdecode(nparr, flag)
+        if image is None:
+            return None, None
+
+        img_height, img_width = image.shape[:2]
+        if dims is None:
+            dims = (img_width, img_height)
+        elif (abs(img_width * factor - dims[1]) + abs(img_height * factor - dims[0])
+              < abs(img_width * factor - dims[0]) + abs(img_height * factor - dims[1])):
+            # imdecode applied an EXIF 90°/270° rotation — the SOF header has the
+            # stored (unrotated) size; boxes are in the decoded orientation
+            dims = (dims[1], dims[0])
+        return image, dims
+
+
+# ===========================================================================
+# BufferPool — Single Responsibility: Reusable request-body buffers ONLY
+# ===========================================================================
+class BufferPool:
+    """
+    Small pool of bytearrays reused across /detect/raw requests.
+
+    Why?
+    - Avoids allocating a fresh ~1 MB buffer per call from agv-control
+    - The body is decoded in place (np.frombuffer → no copy)
+
+    Buffers are never resized in place: numpy views may still reference a
+    buffer when it returns to the pool, and resizing an exported bytearray
+    raises BufferError. Growing always allocates a new buffer instead.
+    """
+
+    def __init__(self, max_buffers: int = RAW_BODY_POOL_SIZE,
+                 initial_size: int = RAW_BODY_INITIAL_BYTES):
+        self.max_buffers = max_buffers
+        self.initial_size = initial_size
+        self._free: list[bytearray] = []
+        self._lock = threading.Lock()
+
+    def acquire(self, size: int = 0) -> bytearray:
+        """Return a buffer of at least `size` bytes (pooled when possible)."""
+        with self._lock:
+            buffer = self._free.pop() if self._free else None
+        if buffer is None or len(buffer) < size:
+            buffer = bytearray(max(size, self.initial_size))
+        return buffer
+
+    def release(self, buffer: bytearray) -> None:
+        """Return a buffer to the pool (dropped if the pool is full)."""
+        with self._lock:
+            if len(self._free) < self.max_buffers:
+                self._free.append(buffer)
+
+
+# ===========================================================================
+# ResultCache — Single Responsibility: Memoize detection results ONLY
+# ===========================================================================
+class ResultCache:
+    """
+    Bounded LRU cache of detection results keyed by image content.
+
+    Business Case: agv-control retries POST /detect with the same bytes after
+    a timeout; test rigs resend identical images. Both should not pay for a
+    second decode + inference.
+
+    Key = blake2b(image bytes) + threshold + model version (+ raw frame shape),
+    so a new model or a different threshold never returns a stale result.
+    Entries expire after ttl_s; the least recently used entry is evicted
+    when max_entries is reached.
+    """
+
+    def __init__(self, max_entries: int = RESULT_CACHE_MAX_ENTRIES,
+                 ttl_s: float = RESULT_CACHE_TTL_S):
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self._entries: OrderedDict[tuple, tuple[float, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @staticmethod
+    def make_key(image_bytes, threshold: float, model_version: str, *extra) -> tuple:
+        """Build cache key from a fast content hash plus request parameters."""
+        digest = hashlib.blake2b(image_bytes, digest_size=16).digest()
+        return (digest, round(threshold, 4), model_version, *extra)
+
+    def get(self, key: tuple) -> dict | None:
+        """Return a copy of the cached result, or None on miss/expiry."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            stored_at, result = entry
+            if now - stored_at > self.ttl_s:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return copy.deepcopy(result)
+
+    def put(self, key: tuple, result: dict) -> None:
+        """Store a copy of result, evicting least recently used entries."""
+        if self.max_entries <= 0:
+            return
+        stored = copy.deepcopy(result)
+        with self._lock:
+            self._entries[key] = (time.monotonic(), stored)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop all entries (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """Hit/miss counters for /stats."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_s": self.ttl_s,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+# ===========================================================================
+# TilePlanner — Single Responsibility: Tile layout + cross-tile merge ONLY
+# ===========================================================================
+class TilePlanner:
+    """
+    Cut a frame into overlapping tiles for sliced inference and merge results.
+
+    Why?
+    - Downscaling a 1920×1080 frame to 640 shrinks a distant 20 px obstacle
+      to ~7 px — below what YOLO reliably detects
+    - Tiles at native resolution keep it at 20 px
+
+    Latency bound:
+    - At most max_tiles tiles (+1 whole-frame pass). If the region needs
+      more at native resolution, it is downscaled until the grid fits, so
+      worst-case cost is one batched forward pass of max_tiles + 1 images.
+
+    Region:
+    - Only the region (normalized x1, y1, x2, y2) is tiled — e.g. the floor
+      band ahead of the AGV. Ceiling and far walls are never sliced.
+    """
+
+    def __init__(self, tile_size: int = TILE_SIZE, overlap: float = TILE_OVERLAP,
+                 max_tiles: int = TILE_MAX_COUNT, region: tuple | None = TILE_REGION,
+                 include_full_frame: bool = TILE_INCLUDE_FULL_FRAME,
+                 nms_iou: float = TILE_NMS_IOU):
+        self.tile_size = tile_size
+        self.overlap = overlap
+        self.max_tiles = max_tiles
+        self.region = region
+        self.include_full_frame = include_full_frame
+        self.nms_iou = nms_iou
+
+    def _grid(self, width: int, height: int) -> tuple[int, int]:
+        """Tiles needed per axis to cover width × height with overlap."""
+        stride = self.tile_size * (1 - self.overlap)
+
+        def count(length: int) -> int:
+            if length <= self.tile_size:
+                return 1
+            return int(np.ceil((length - self.tile_size) / stride)) + 1
+
+        return count(width), count(height)
+
+    def plan(self, image: np.ndarray, region: tuple | None = None) -> dict:
+        """
+        Build the tile list for an image.
+
+        Args:
+            region: Per-frame region (normalized), overrides self.region
+
+        Returns:
+            Dict with:
+            - tiles: list of BGR arrays (views or resized copies)
+            - origins: (N, 2) array of tile (x, y) in region-scaled pixels
+            - scale: region downscale factor (1.0 = native)
+            - offset: (x, y) of the region in the source image
+            - grid: (cols, rows)
+        """
+        img_height, img_width = image.shape[:2]
+        rx1, ry1, rx2, ry2 = region or self.region or (0.0, 0.0, 1.0, 1.0)
+        x0, y0 = int(rx1 * img_width), int(ry1 * img_height)
+        x1, y1 = int(rx2 * img_width), int(ry2 * img_height)
+        region = image[y0:y1, x0:x1]
+
+        # Downscale the region until the grid fits within max_tiles
+        scale = 1.0
+        region_w, region_h = x1 - x0, y1 - y0
+        cols, rows = self._grid(region_w, region_h)
+        while cols * rows > self.max_tiles:
+            scale *= 0.9
+            cols, rows = self._grid(int(region_w * scale), int(region_h * scale))
+        if scale < 1.0:
+            region = cv2.resize(region, (int(region_w * scale), int(region_h * scale)),
+                                interpolation=cv2.INTER_AREA)
+
+        scaled_h, scaled_w = region.shape[:2]
+        tile_w, tile_h = min(self.tile_size, scaled_w), min(self.tile_size, scaled_h)
+        xs = np.linspace(0, scaled_w - tile_w, cols).round().astype(int)
+        ys = np.linspace(0, scaled_h - tile_h, rows).round().astype(int)
+
+        tiles, origins = [], []
+        for ty in ys:
+            for tx in xs:
+                tiles.append(region[ty:ty + tile_h, tx:tx + tile_w])
+                origins.append((tx, ty))
+
+        return {
+            "tiles": tiles,
+            "origins": np.asarray(origins, dtype=np.float32),
+            "scale": scale,
+            "offset": (x0, y0),
+            "grid": (cols, rows),
+        }
+
+    def to_frame(self, boxes: np.ndarray, origin: np.ndarray,
+                 plan: dict) -> np.ndarray:
+        """Map tile-local xyxy boxes to source-image pixels."""
+        offset_x, offset_y = plan["offset"]
+        shifted = boxes + np.tile(origin, 2)
+        return shifted / plan["scale"] + np.array([offset_x, offset_y, offset_x, offset_y])
+
+    def merge(self, boxes: np.ndarray, scores: np.ndarray,
+              class_ids: np.ndarray) -> np.ndarray:
+        """
+        Class-aware NMS across tiles.
+
+        Returns:
+            Indices of boxes to keep
+        """
+        if len(boxes) == 0:
+            return np.empty(0, dtype=int)
+        xywh = np.column_stack([boxes[:, :2], boxes[:, 2:] - boxes[:, :2]])
+        keep = cv2.dnn.NMSBoxesBatched(
+            xywh.tolist(), scores.tolist(), class_ids.astype(int).tolist(),
+            score_threshold=0.0, nms_threshold=self.nms_iou,
+        )
+        return np.asarray(keep, dtype=int).reshape(-1)
+
 
 # ===========================================================================
 # YoloDetector — Single Responsibility: Model inference ONLY
@@ -148,16 +732,31 @@ class YoloDetector:
     - Model loaded once at init, not per-request
     """
 
-    def __init__(self, model_name: str = MODEL_NAME):
+    def __init__(self, model_name: str = MODEL_NAME, input_size: int = MODEL_INPUT_SIZE,
+                 tile_planner: TilePlanner | None = None,
+                 calibration: CameraCalibration | None = None,
+                 undistort_mode: str = UNDISTORT_MODE):
         """
         Load YOLO model and initialize distance estimator.
 
         Args:
             model_name: Model filename (auto-downloads from ultralytics hub)
+            input_size: Model input size (imgsz) passed to every inference call
+            tile_planner: Enables tiled (sliced) inference when given
+            calibration: Lens calibration; boxes and distances use its
+                rectified pixel space and focal length when given
+            undistort_mode: "points", "frame" or "off" (see UNDISTORT_MODE)
         """
         self.model_name = model_name
+        self.input_size = input_size
+        self.tile_planner = tile_planner
+        self.calibration = calibration
+        self.undistort_mode = undistort_mode if calibration is not None else "off"
+        self.model_version = self._model_version(model_name)
         self.distance_estimator = DistanceEstimator()
         logger.info(f"Loading YOLO model: {model_name}...")
+        if not ULTRALYTICS_AVAILABLE:
+            raise ImportError("ultralytics is not installed (pip install -r vision-ai/requirements.txt)")
 
         try:
             self.model = YOLO(model_name)
@@ -166,73 +765,988 @@ class YoloDetector:
             logger.critical(f"Failed to load YOLO model: {e}")
             raise
 
-    def detect(self, image: np.ndarray, confidence_threshold: float = DEFAULT_CONFIDENCE_THRESHOLD) -> dict:
+    @staticmethod
+    def _model_version(model_name) -> str:
+        """
+        Identify the weights: file stem + short content hash.
+
+        Two different best.pt files get different versions, so cached
+        results never leak across a model change.
+        """
+        path = Path(model_name)
+        if not path.is_file():
+            return path.stem  # hub name, e.g. "yolo11s"
+        digest = hashlib.blake2b(path.read_bytes(), digest_size=4).hexdigest()
+        return f"{path.stem}-{digest}"
+
+    def detect(self, image: np.ndarray,
+               confidence_threshold: float = DEFAULT_CONFIDENCE_THRESHOLD,
+               original_size: tuple[int, int] | None = None,
+               trace: FrameTrace | None = None,
+               roi: tuple[float, float, float, float] | None = None) -> dict:
         """
         Run object detection on an image.
 
         Args:
             image: OpenCV image (BGR numpy array)
             confidence_threshold: Minimum confidence to include detection (0-1)
+            original_size: (width, height) of the source image when `image`
+                was decoded at reduced scale. Boxes are mapped back to these
+                dimensions so bbox_pixels and distances stay in source pixels.
+            trace: Frame trace of the source frame; "inferred" stage is marked
+            roi: Normalized (x1, y1, x2, y2) region to infer on; boxes are
+                still reported in full-frame coordinates. None = whole frame
 
         Returns:
             Dict with:
             - detections: list of detected objects
             - processing_time_ms: inference time in milliseconds
             - total_objects: count of detected objects
+            - timing_ms: per-stage breakdown (inference, postprocess)
+            - tiling: tile count/grid/NMS report (tiled mode only)
+            - roi: region used, skipped_fraction, imgsz, estimated_speedup
+              (ROI only)
         """
-        start_time = time.time()
-
-        # Run YOLO inference
-        results = self.model(image, conf=confidence_threshold, verbose=False)
-
-        processing_time_ms = int((time.time() - start_time) * 1000)
+        # Rectify the whole frame (remap tables are precomputed per size)
+        undistort_start = time.perf_counter()
+        if self.undistort_mode == "frame":
+            image = self.calibration.undistort_frame(image)
+
+        start_time = time.perf_counter()
+
+        # Run YOLO inference (boxes as xyxy in decoded-image pixels)
+        roi_report = None
+        if self.tile_planner is not None:
+            boxes, scores, class_ids, names, tiling = self._infer_tiled(
+                image, confidence_threshold, roi
+            )
+            if roi is not None:
+                roi_report = self._roi_report(image, roi)
+        else:
+            model_input, imgsz, offset = image, self.input_size, (0, 0)
+            if roi is not None:
+                model_input, imgsz, offset = self._crop_roi(image, roi)
+                roi_report = self._roi_report(image, roi, imgsz)
+            results = self.model(model_input, conf=confidence_threshold, imgsz=imgsz, verbose=False)
+            boxes, scores, class_ids, names = self._boxes_to_arrays(results[0])
+            boxes = boxes + np.array([*offset, *offset])  # crop → full-frame pixels
+            tiling = None
+
+        inference_done = time.perf_counter()
+        processing_time_ms = int((inference_done - start_time) * 1000)
+        if trace is not None:
+            trace.mark("inferred")
+
+        # Decoded size vs source size (differs after reduced-scale decode)
+        decoded_height, decoded_width = image.shape[:2]
+        img_width, img_height = original_size or (decoded_width, decoded_height)
+        scale_x = img_width / decoded_width
+        scale_y = img_height / decoded_height
+
+        # Bounding boxes in source-image pixels
+        boxes = boxes * np.array([scale_x, scale_y, scale_x, scale_y])
+        if self.undistort_mode == "points":
+            boxes = self.calibration.undistort_boxes(boxes, (img_width, img_height))
+
+        # Estimate distances from bounding box heights (pinhole camera model)
+        object_classes = [names[int(class_id)] for class_id in class_ids.tolist()]
+        focal_length_px = (self.calibration.focal_length_px((img_width, img_height))
+                           if self.calibration is not None else None)
+        bbox_heights_px = boxes[:, 3].astype(int) - boxes[:, 1].astype(int)
+        distances = self.distance_estimator.estimate_batch(
+            object_classes, bbox_heights_px, focal_length_px
+        )
 
         # Parse results
         detections = []
-        if results and len(results) > 0:
-            result = results[0]
-            img_height, img_width = image.shape[:2]
-
-            for box in result.boxes:
-                # Get bounding box (normalized 0-1 for DB storage)
-                x1, y1, x2, y2 = box.xyxy[0].tolist()
-                bbox_normalized = {
-                    "x1": round(x1 / img_width, 4),
-                    "y1": round(y1 / img_height, 4),
-                    "x2": round(x2 / img_width, 4),
-                    "y2": round(y2 / img_height, 4),
-                }
+        for (x1, y1, x2, y2), score, object_class, distance_meters in zip(
+                boxes.tolist(), scores.tolist(), object_classes, distances):
+            # Normalized 0-1 for DB storage
+            bbox_normalized = {
+                "x1": round(x1 / img_width, 4),
+                "y1": round(y1 / img_height, 4),
+                "x2": round(x2 / img_width, 4),
+                "y2": round(y2 / img_height, 4),
+            }
+
+            # Get pixel bounding box (for display/debugging)
+            bbox_pixels = {
+                "x1": int(x1),
+                "y1": int(y1),
+                "x2": int(x2),
+                "y2": int(y2),
+            }
+
+            confidence = round(float(score), 4)
+
+            detections.append({
+                "object_class": object_class,
+                "confidence": confidence,
+                "bbox": bbox_normalized,
+                "bbox_pixels": bbox_pixels,
+                "distance_meters": distance_meters,
+            })
+
+        postprocess_ms = (time.perf_counter() - inference_done) * 1000
+
+        response = {
+            "detections": detections,
+            "processing_time_ms": processing_time_ms,
+            "total_objects": len(detections),
+            "timing_ms": {
+                "inference": round((inference_done - start_time) * 1000, 2),
+                "postprocess": round(postprocess_ms, 2),
+            },
+        }
+        if self.undistort_mode == "frame":
+            response["timing_ms"]["undistort"] = round((start_time - undistort_start) * 1000, 2)
+        if tiling is not None:
+            response["tiling"] = tiling
+        if roi_report is not None:
+            response["roi"] = roi_report
+        return response
+
+    @staticmethod
+    def _roi_pixels(image: np.ndarray, roi: tuple) -> tuple[int, int, int, int]:
+        """Normalized ROI → pixel (x0, y0, x1, y1), at least one stride cell."""
+        height, width = image.shape[:2]
+        x0, y0 = int(roi[0] * width), int(roi[1] * height)
+        x1 = max(math.ceil(roi[2] * width), min(width, x0 + ROI_STRIDE_PX))
+        y1 = max(math.ceil(roi[3] * height), min(height, y0 + ROI_STRIDE_PX))
+        return x0, y0, x1, y1
+
+    def _roi_imgsz(self, image: np.ndarray, crop_w: int, crop_h: int) -> int:
+        """
+        Model input size that keeps the crop at full-frame resolution.
+
+        Ultralytics letterboxes every input up to imgsz: a half-frame crop
+        at imgsz=640 would be upscaled 2× and cost as much as the whole
+        frame. Shrinking imgsz with the crop keeps pixels per object
+        unchanged and makes the cost proportional to the crop.
+        """
+        full_scale = self.input_size / max(image.shape[:2])
+        imgsz = math.ceil(max(crop_w, crop_h) * full_scale / ROI_STRIDE_PX) * ROI_STRIDE_PX
+        return int(min(self.input_size, max(ROI_STRIDE_PX, imgsz)))
+
+    def _crop_roi(self, image: np.ndarray, roi: tuple) -> tuple[np.ndarray, int, tuple[int, int]]:
+        """ROI crop (a view, no copy), its imgsz and its offset in the frame."""
+        x0, y0, x1, y1 = self._roi_pixels(image, roi)
+        return image[y0:y1, x0:x1], self._roi_imgsz(image, x1 - x0, y1 - y0), (x0, y0)
+
+    @staticmethod
+    def _letterboxed_pixels(width: int, height: int, imgsz: int) -> int:
+        """Model input pixels after rect letterboxing (long side = imgsz, stride padding)."""
+        scale = imgsz / max(width, height)
+        return (math.ceil(width * scale / ROI_STRIDE_PX) * ROI_STRIDE_PX
+                * math.ceil(height * scale / ROI_STRIDE_PX) * ROI_STRIDE_PX)
+
+    def _roi_report(self, image: np.ndarray, roi: tuple, imgsz: int | None = None) -> dict:
+        """
+        What the ROI saved: fraction of the frame never looked at, and the
+        speedup estimated from model input pixels (YOLO cost ~ pixels).
+        Measured speedup: benchmarks/roi_benchmark.py.
+        """
+        height, width = image.shape[:2]
+        x0, y0, x1, y1 = self._roi_pixels(image, roi)
+        report = {
+            "region": [round(x0 / width, 4), round(y0 / height, 4),
+                       round(x1 / width, 4), round(y1 / height, 4)],
+            "skipped_fraction": round(1 - (x1 - x0) * (y1 - y0) / (width * height), 3),
+        }
+        if imgsz is not None:
+            full_px = self._letterboxed_pixels(width, height, self.input_size)
+            report["imgsz"] = imgsz
+            report["estimated_speedup"] = round(
+                full_px / self._letterboxed_pixels(x1 - x0, y1 - y0, imgsz), 2
+            )
+        return report
+
+    @staticmethod
+    def _boxes_to_arrays(result) -> tuple[np.ndarray, np.ndarray, np.ndarray, dict]:
+        """Ultralytics Results → (xyxy, scores, class_ids, names) as numpy."""
+        boxes = result.boxes
+        return (
+            boxes.xyxy.cpu().numpy().reshape(-1, 4),
+            boxes.conf.cpu().numpy().reshape(-1),
+            boxes.cls.cpu().numpy().reshape(-1),
+            result.names,
+        )
 
-                # Get pixel bounding box (for display/debugging)
-                bbox_pixels = {
-                    "x1": int(x1),
-                    "y1": int(y1),
-                    "x2": int(x2),
-                    "y2": int(y2),
+    def _infer_tiled(self, image: np.ndarray, confidence_threshold: float,
+                     roi: tuple | None = None):
+        """
+        Sliced inference: all tiles (+ optional whole frame) in ONE batched
+        forward pass, then cross-tile NMS. A ROI replaces TILE_REGION, and
+        the whole-frame pass then covers only the ROI crop.
+
+        Returns:
+            (xyxy, scores, class_ids, names, tiling_report)
+        """
+        planner = self.tile_planner
+        plan = planner.plan(image, roi)
+        batch = list(plan["tiles"])
+        full_offset = np.zeros(4)
+        if planner.include_full_frame:
+            if roi is not None:
+                x0, y0, x1, y1 = self._roi_pixels(image, roi)
+                batch.append(image[y0:y1, x0:x1])
+                full_offset = np.array([x0, y0, x0, y0])
+            else:
+                batch.append(image)
+
+        results = self.model(batch, conf=confidence_threshold,
+                             imgsz=planner.tile_size, verbose=False)
+
+        all_boxes, all_scores, all_classes = [], [], []
+        names = results[0].names if results else {}
+        for index, result in enumerate(results):
+            boxes, scores, class_ids, names = self._boxes_to_arrays(result)
+            if index < len(plan["tiles"]):
+                boxes = planner.to_frame(boxes, plan["origins"][index], plan)
+            else:
+                boxes = boxes + full_offset
+            all_boxes.append(boxes)
+            all_scores.append(scores)
+            all_classes.append(class_ids)
+
+        boxes = np.concatenate(all_boxes) if all_boxes else np.empty((0, 4))
+        scores = np.concatenate(all_scores) if all_scores else np.empty(0)
+        class_ids = np.concatenate(all_classes) if all_classes else np.empty(0)
+        keep = planner.merge(boxes, scores, class_ids)
+
+        tiling = {
+            "tiles": len(plan["tiles"]),
+            "batch_size": len(batch),
+            "max_batch_size": planner.max_tiles + int(planner.include_full_frame),
+            "grid": list(plan["grid"]),
+            "full_frame_pass": planner.include_full_frame,
+            "region_scale": round(plan["scale"], 3),
+            "boxes_before_nms": int(len(boxes)),
+            "boxes_after_nms": int(len(keep)),
+        }
+        return boxes[keep], scores[keep], class_ids[keep], names, tiling
+
+
+# ===========================================================================
+# RecentDetections — Single Responsibility: bounded in-memory detection history
+# ===========================================================================
+class RecentDetections:
+    """
+    Ring buffer of recent detections as one NumPy structured array.
+
+    Why not a list of dicts?
+    - Fixed memory: capacity × 60 bytes, no per-detection Python objects
+    - Queries are vectorized boolean masks over whole columns
+      (window, class, min confidence) — microseconds for 20k rows
+
+    Class names are stored as small ints (per-process name table), so a
+    class filter is one integer comparison per row.
+    """
+
+    DTYPE = np.dtype([
+        ("timestamp", "f8"),       # wall clock, seconds since epoch
+        ("class_id", "i2"),
+        ("confidence", "f4"),
+        ("x1", "f4"), ("y1", "f4"), ("x2", "f4"), ("y2", "f4"),  # normalized 0-1
+        ("distance_m", "f4"),      # NaN = unknown
+        ("frame_id", "i8"),        # -1 = no trace
+    ])
+
+    def __init__(self, capacity: int = RECENT_DETECTIONS_CAPACITY):
+        self.capacity = capacity
+        self._rows = np.zeros(capacity, dtype=self.DTYPE)
+        self._next = 0       # write position
+        self._size = 0       # valid rows
+        self._total = 0      # rows ever added
+        self._class_ids: dict[str, int] = {}
+        self._class_names: list[str] = []
+        self._lock = threading.Lock()
+
+    def _class_id(self, name: str) -> int:
+        class_id = self._class_ids.get(name)
+        if class_id is None:
+            class_id = len(self._class_names)
+            self._class_ids[name] = class_id
+            self._class_names.append(name)
+        return class_id
+
+    def add(self, detections: list, timestamp: Optional[float] = None,
+            frame_id: Optional[int] = None) -> None:
+        """Append one frame's detections (as returned by YoloDetector.detect)."""
+        count = len(detections)
+        if count == 0:
+            return
+        block = np.empty(count, dtype=self.DTYPE)
+        block["timestamp"] = time.time() if timestamp is None else timestamp
+        block["frame_id"] = -1 if frame_id is None else frame_id
+        block["confidence"] = [d["confidence"] for d in detections]
+        for field in ("x1", "y1", "x2", "y2"):
+            block[field] = [d["bbox"][field] for d in detections]
+        block["distance_m"] = [np.nan if d["distance_meters"] is None else d["distance_meters"]
+                               for d in detections]
+
+        with self._lock:
+            block["class_id"] = [self._class_id(d["object_class"]) for d in detections]
+            self._total += count
+            if count > self.capacity:
+                block = block[-self.capacity:]
+                count = self.capacity
+            # Write in at most two slices (wrap-around)
+            first = min(count, self.capacity - self._next)
+            self._rows[self._next:self._next + first] = block[:first]
+            self._rows[:count - first] = block[first:]
+            self._next = (self._next + count) % self.capacity
+            self._size = min(self._size + count, self.capacity)
+
+    def query(self, window_s: float, object_class: Optional[str] = None,
+              min_confidence: float = 0.0,
+              limit: int = RECENT_QUERY_DEFAULT_LIMIT) -> dict:
+        """
+        Detections from the last `window_s` seconds, newest first.
+
+        Returns:
+            Dict with count (all matches), by_class counts, and up to
+            `limit` detections
+        """
+        with self._lock:
+            if object_class is not None and object_class not in self._class_ids:
+                rows = self._rows[:0]
+            else:
+                rows = self._rows[:self._size].copy()
+            names = list(self._class_names)
+            class_id = self._class_ids.get(object_class)
+
+        mask = rows["timestamp"] >= time.time() - window_s
+        mask &= rows["confidence"] >= min_confidence
+        if class_id is not None:
+            mask &= rows["class_id"] == class_id
+        matched = rows[mask]
+        matched = matched[np.argsort(matched["timestamp"], kind="stable")[::-1]]
+
+        by_class = np.bincount(matched["class_id"], minlength=len(names)) if len(matched) else []
+        return {
+            "count": int(len(matched)),
+            "by_class": {names[i]: int(n) for i, n in enumerate(by_class) if n},
+            "detections": [self._to_dict(row, names) for row in matched[:limit]],
+        }
+
+    @staticmethod
+    def _to_dict(row, names: list[str]) -> dict:
+        distance = float(row["distance_m"])
+        return {
+            "timestamp": datetime.fromtimestamp(float(row["timestamp"]), tz=timezone.utc).isoformat(),
+            "object_class": names[int(row["class_id"])],
+            "confidence": round(float(row["confidence"]), 4),
+            "bbox": {field: round(float(row[field]), 4) for field in ("x1", "y1", "x2", "y2")},
+            "distance_meters": None if math.isnan(distance) else round(distance, 2),
+            "frame_id": None if row["frame_id"] < 0 else int(row["frame_id"]),
+        }
+
+    def stats(self) -> dict:
+        with self._lock:
+            oldest = float(self._rows[self._next % self.capacity]["timestamp"]
+                           if self._size == self.capacity else self._rows[0]["timestamp"])
+            return {
+                "capacity": self.capacity,
+                "stored": self._size,
+                "total_added": self._total,
+                "oldest_age_s": round(time.time() - oldest, 1) if self._size else None,
+            }
+
+
+# ===========================================================================
+# AdmissionController — Single Responsibility: who gets the next inference slot
+# ===========================================================================
+class AdmissionRejected(Exception):
+    """Request shed by AdmissionController (→ HTTP 503 + Retry-After)."""
+
+    def __init__(self, reason: str, priority: str, retry_after_s: int):
+        super().__init__(f"{reason} ({priority})")
+        self.reason = reason
+        self.priority = priority
+        self.retry_after_s = retry_after_s
+
+
+class AdmissionController:
+    """
+    Priority queues + deadline-aware load shedding in front of inference.
+
+    Why?
+    - Dashboards uploading to POST /detect share the model with agv-control's
+      safety-critical GET /detect/latest polls
+    - Without admission, a burst of uploads queues ahead of the polls in the
+      threadpool until VisionClient times out (→ safe halt)
+
+    Rules:
+    - One FIFO queue per priority class; a slot always goes to the head of
+      the highest non-empty class
+    - Deadline known up front: if the estimated wait + one inference would
+      overrun it, reject immediately instead of queueing
+    - Deadline passes while queued: leave the queue, reject
+    - Class queue full: reject
+
+    The wait estimate uses an EWMA of recent inference times and the number
+    of requests running + queued at the same or higher priority.
+    """
+
+    EWMA_ALPHA = 0.2
+    WAIT_SAMPLES = 1000  # recent queue waits kept per class for percentiles
+
+    def __init__(self, concurrency: int = INFERENCE_CONCURRENCY,
+                 classes: tuple[str, ...] = PRIORITY_CLASSES,
+                 queue_limits: Optional[dict] = None):
+        self.concurrency = concurrency
+        self.classes = classes
+        self.queue_limits = queue_limits or PRIORITY_QUEUE_LIMITS
+        self._cond = threading.Condition()
+        self._waiting = {name: deque() for name in classes}
+        self._running = 0
+        self._service_s: Optional[float] = None
+        self._counters = {
+            name: {"admitted": 0, "shed_deadline": 0, "shed_expired": 0, "shed_queue_full": 0}
+            for name in classes
+        }
+        self._waits_ms = {name: deque(maxlen=self.WAIT_SAMPLES) for name in classes}
+
+    def _estimated_wait_s(self, priority: str) -> float:
+        """Time until a new `priority` request would start (lock held)."""
+        rank = self.classes.index(priority)
+        ahead = sum(len(self._waiting[name]) for name in self.classes[:rank + 1])
+        turns = max(0, self._running + ahead - self.concurrency + 1)
+        return turns / self.concurrency * (self._service_s or 0.0)
+
+    def _reject(self, reason: str, priority: str) -> AdmissionRejected:
+        self._counters[priority][f"shed_{reason}"] += 1
+        retry_after_s = max(1, math.ceil(self._estimated_wait_s(priority)))
+        return AdmissionRejected(reason, priority, retry_after_s)
+
+    def _is_next(self, ticket: object, priority: str) -> bool:
+        """Slot free, ticket heads its queue, no higher class waiting (lock held)."""
+        if self._running >= self.concurrency or self._waiting[priority][0] is not ticket:
+            return False
+        rank = self.classes.index(priority)
+        return not any(self._waiting[name] for name in self.classes[:rank])
+
+    @contextmanager
+    def slot(self, priority: str, deadline_mono: Optional[float] = None):
+        """
+        Hold an inference slot for the duration of the with-block.
+
+        Args:
+            priority: One of PRIORITY_CLASSES
+            deadline_mono: time.monotonic() by which the result is needed
+
+        Raises:
+            AdmissionRejected: queue full, deadline unreachable, or expired
+        """
+        ticket = object()
+        queued_at = time.monotonic()
+        with self._cond:
+            service_s = self._service_s or 0.0
+            if (deadline_mono is not None
+                    and queued_at + self._estimated_wait_s(priority) + service_s > deadline_mono):
+                raise self._reject("deadline", priority)
+            if len(self._waiting[priority]) >= self.queue_limits.get(priority, 0):
+                raise self._reject("queue_full", priority)
+
+            queue = self._waiting[priority]
+            queue.append(ticket)
+            while not self._is_next(ticket, priority):
+                timeout = None
+                if deadline_mono is not None:
+                    timeout = deadline_mono - (self._service_s or 0.0) - time.monotonic()
+                    if timeout <= 0:
+                        queue.remove(ticket)
+                        self._cond.notify_all()
+                        raise self._reject("expired", priority)
+                self._cond.wait(timeout)
+
+            queue.popleft()
+            self._running += 1
+            started_at = time.monotonic()
+            self._counters[priority]["admitted"] += 1
+            self._waits_ms[priority].append((started_at - queued_at) * 1000)
+
+        try:
+            yield
+        finally:
+            elapsed_s = time.monotonic() - started_at
+            with self._cond:
+                self._running -= 1
+                self._service_s = (elapsed_s if self._service_s is None else
+                                   self.EWMA_ALPHA * elapsed_s + (1 - self.EWMA_ALPHA) * self._service_s)
+                self._cond.notify_all()
+
+    def stats(self) -> dict:
+        with self._cond:
+            per_class = {}
+            for name in self.classes:
+                waits = sorted(self._waits_ms[name])
+                per_class[name] = {
+                    "queued": len(self._waiting[name]),
+                    **self._counters[name],
+                    "shed_total": sum(v for k, v in self._counters[name].items() if k.startswith("shed_")),
+                    "queue_wait_ms": {
+                        "p50": round(waits[len(waits) // 2], 2) if waits else None,
+                        "p95": round(waits[int(len(waits) * 0.95)], 2) if waits else None,
+                        "max": round(waits[-1], 2) if waits else None,
+                    },
                 }
+            return {
+                "concurrency": self.concurrency,
+                "running": self._running,
+                "service_ms_ewma": round(self._service_s * 1000, 2) if self._service_s else None,
+                "classes": per_class,
+            }
+
+
+# ===========================================================================
+# ModelReloader — Single Responsibility: background load + atomic swap ONLY
+# ===========================================================================
+class ModelReloader:
+    """
+    Zero-downtime model rollout.
+
+    Flow (background thread, serving never pauses):
+        build new YoloDetector → warm up on the smoke image → smoke check
+        → install() swaps the module-level `detector` reference
+
+    Why is the swap safe without locking requests?
+    - Rebinding a module global is atomic in CPython
+    - Each request takes ONE reference to the detector up front
+      (_detect_from_body), so in-flight requests finish on the old model
+      and the old model is freed when the last of them returns
+
+    Smoke check (against RELOAD_SMOKE_IMAGE_PATH when present):
+    - The new model must know every class name the current model knows
+      (agv-control and DistanceEstimator key on class names)
+    - Every class the current model detects on the smoke image must still
+      be detected by the new one
+    - The current model is serving traffic, so its reference run goes
+      through `admit()` (an admission slot) like any other request
+    """
+
+    def __init__(self, build: Callable[[Path], 'YoloDetector'],
+                 install: Callable[['YoloDetector'], None],
+                 current: Callable[[], Optional['YoloDetector']],
+                 smoke_image_path: Path = RELOAD_SMOKE_IMAGE_PATH,
+                 warmup_runs: int = RELOAD_WARMUP_RUNS,
+                 admit: Callable[[], ContextManager] = nullcontext):
+        self._build = build
+        self._install = install
+        self._current = current
+        self._admit = admit
+        self.smoke_image_path = smoke_image_path
+        self.warmup_runs = warmup_runs
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self.state = "idle"  # idle | loading | failed
+        self.target: Optional[str] = None
+        self.last_error: Optional[str] = None
+        self.last_reload: Optional[dict] = None
+        self.reloads = 0
+        self.failures = 0
+
+    def start(self, model_path: Path) -> bool:
+        """Begin a background reload; False if one is already running."""
+        with self._lock:
+            if self.state == "loading":
+                return False
+            self.state = "loading"
+            self.target = str(model_path)
+            self._thread = threading.Thread(
+                target=self._run, args=(Path(model_path),), name="model-reload", daemon=True
+            )
+            self._thread.start()
+            return True
+
+    def _run(self, model_path: Path) -> None:
+        start_time = time.perf_counter()
+        previous = self._current()
+        try:
+            candidate = self._build(model_path)
+            warm_ms = self._smoke_check(candidate, previous)
+        except Exception as e:
+            with self._lock:
+                self.state = "failed"
+                self.last_error = f"{type(e).__name__}: {e}"
+                self.failures += 1
+            logger.error(f"Model reload failed ({model_path}), keeping current model: {e}")
+            _log_system_event("error", "Model reload failed", "model_reload",
+                              {"model": str(model_path), "error": str(e)})
+            return
+
+        self._install(candidate)  # atomic — new requests use the new model from here
+        with self._lock:
+            self.state = "idle"
+            self.last_error = None
+            self.reloads += 1
+            self.last_reload = {
+                "from_version": previous.model_version if previous is not None else None,
+                "to_version": candidate.model_version,
+                "load_ms": round((time.perf_counter() - start_time) * 1000, 1),
+                "warm_inference_ms": warm_ms,
+                "at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            }
+        logger.info(f"Model swapped: {self.last_reload['from_version']} → {candidate.model_version}")
+        _log_system_event("info", "Model reloaded", "model_reload", self.last_reload)
+
+    def _smoke_check(self, candidate: 'YoloDetector',
+                     previous: Optional['YoloDetector']) -> float:
+        """
+        Warm up the candidate and compare it against the current model.
+
+        Returns:
+            Inference time (ms) of the last warm run
+
+        Raises:
+            RuntimeError: If the candidate fails the smoke check
+        """
+        image = None
+        if self.smoke_image_path is not None and Path(self.smoke_image_path).is_file():
+            image = cv2.imread(str(self.smoke_image_path))
+        has_smoke_image = image is not None
+        if image is None:
+            image = np.full((480, 640, 3), 114, dtype=np.uint8)
+
+        result = None
+        for _ in range(max(1, self.warmup_runs)):
+            result = candidate.detect(image, DEFAULT_CONFIDENCE_THRESHOLD)
+
+        if previous is None:
+            return result["timing_ms"]["inference"]
+
+        missing_names = set(previous.model.names.values()) - set(candidate.model.names.values())
+        if missing_names:
+            raise RuntimeError(f"New model lacks classes: {sorted(missing_names)}")
+
+        if has_smoke_image:
+            with self._admit():  # live model: queue behind polls, not beside them
+                reference = previous.detect(image, DEFAULT_CONFIDENCE_THRESHOLD)
+            expected = {d["object_class"] for d in reference["detections"]}
+            found = {d["object_class"] for d in result["detections"]}
+            if expected - found:
+                raise RuntimeError(f"Smoke image: new model misses {sorted(expected - found)}")
+        return result["timing_ms"]["inference"]
+
+    def status(self) -> dict:
+        with self._lock:
+            return {
+                "state": self.state,
+                "target": self.target,
+                "last_error": self.last_error,
+                "last_reload": self.last_reload,
+                "reloads": self.reloads,
+                "failures": self.failures,
+            }
+
+
+class ModelFileWatcher:
+    """
+    Poll the weights file and trigger a reload when it changes.
+
+    Polling (not inotify) keeps it dependency-free and works on Windows and
+    network shares. A change is acted on only once size + mtime are stable
+    for one interval, so a half-copied best.pt is never loaded. Deploy with
+    an atomic rename (copy to best.pt.tmp, then move) for best results.
+    """
+
+    def __init__(self, path: Path, reloader: ModelReloader,
+                 interval_s: float = MODEL_WATCH_INTERVAL_S or 2.0):
+        self.path = Path(path)
+        self.reloader = reloader
+        self.interval_s = interval_s
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _signature(self) -> Optional[tuple[int, int]]:
+        try:
+            stat = self.path.stat()
+            return stat.st_mtime_ns, stat.st_size
+        except OSError:
+            return None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="model-watch", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _run(self) -> None:
+        loaded = self._signature()
+        seen = loaded
+        while not self._stop.wait(self.interval_s):
+            current = self._signature()
+            if current is None or current == loaded:
+                seen = current
+                continue
+            if current != seen:
+                seen = current  # still changing — wait one more interval
+                continue
+            if self.reloader.start(self.path):
+                logger.info(f"Model file changed: {self.path} — reloading in background")
+                loaded = current
+
+
+# ===========================================================================
+# FramePrecomputer — Single Responsibility: detect new frames on arrival
+# ===========================================================================
+class FramePrecomputer:
+    """
+    Run detection on latest.jpg as soon as camera_server writes it.
+
+    Why?
+    - Without it, the first GET /detect/latest after a new frame pays the
+      whole inference synchronously; with it, the poll is a cache hit
+    - A poll that arrives while its frame is still being precomputed waits
+      for that run (wait_for) instead of starting a second inference
+
+    Wake-up: UDP event from camera_server (FrameEventListener), else an
+    mtime check every PRECOMPUTE_POLL_INTERVAL_S. Events are read on their
+    own thread, so a frame is marked pending the moment its event arrives,
+    even while the worker is still busy with the previous one; a poll for
+    it waits just like for an in-flight frame. Only polls at the default
+    threshold and ROI_REGION wait — other keys are never precomputed.
+
+    Superseded frames: the file is re-read only when the worker is free,
+    so frames written while inference runs are skipped — only the newest
+    is processed. Skips are counted from the gap in trace frame ids.
+
+    Push subscribers (gRPC StreamLatest) block in wait_next until the
+    next frame has been processed.
+    """
 
-                confidence = round(float(box.conf[0]), 4)
-                class_id = int(box.cls[0])
-                object_class = result.names[class_id]
+    def __init__(self, image_path: Path,
+                 process: Callable[[bytes, int], Optional[int]],
+                 listener: Optional[FrameEventListener] = None,
+                 poll_interval_s: float = PRECOMPUTE_POLL_INTERVAL_S):
+        """
+        Args:
+            image_path: File to watch (CAMERA_IMAGE_PATH)
+            process: (image_bytes, mtime_ns) → frame_id; runs detection,
+                fills the result cache, logs to DB
+            listener: Frame event socket, None = mtime polling only
+            poll_interval_s: Fallback mtime check interval
+        """
+        self.image_path = image_path
+        self._process = process
+        self.listener = listener
+        self.poll_interval_s = poll_interval_s
+        self._stop = threading.Event()
+        self._wakeup = threading.Event()
+        self._cond = threading.Condition()
+        self._pending = False                       # event seen, worker has not read the file yet
+        self._inflight_mtime_ns: Optional[int] = None
+        self.last_mtime_ns: Optional[int] = None   # last frame finished (ok or failed)
+        self._last_signature: Optional[tuple[int, int]] = None
+        self._last_frame_id: Optional[int] = None
+        self._thread: Optional[threading.Thread] = None
+        self._listen_thread: Optional[threading.Thread] = None
+        self.processed = 0
+        self.superseded = 0
+        self.failed = 0
+        self.events = 0
+        self.last_latency_ms: Optional[float] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="frame-precompute", daemon=True)
+        self._thread.start()
+        if self.listener is not None:
+            self._listen_thread = threading.Thread(
+                target=self._listen, name="frame-events", daemon=True
+            )
+            self._listen_thread.start()
 
-                # Estimate distance from bounding box height (pinhole camera model)
-                bbox_height_px = int(y2) - int(y1)
-                distance_meters = self.distance_estimator.estimate(
-                    object_class, bbox_height_px
-                )
+    def stop(self) -> None:
+        self._stop.set()
+        self._wakeup.set()
+        if self.listener is not None:
+            self.listener.close()
 
-                detections.append({
-                    "object_class": object_class,
-                    "confidence": confidence,
-                    "bbox": bbox_normalized,
-                    "bbox_pixels": bbox_pixels,
-                    "distance_meters": distance_meters,
-                })
+    def _signature(self) -> Optional[tuple[int, int]]:
+        try:
+            stat = self.image_path.stat()
+            return stat.st_mtime_ns, stat.st_size
+        except OSError:
+            return None
 
+    def _listen(self) -> None:
+        """Event thread: mark a frame pending and wake the worker."""
+        while not self._stop.is_set():
+            events = self.listener.wait(self.poll_interval_s)
+            if not events:
+                continue
+            self.events += len(events)
+            with self._cond:
+                self._pending = True
+            self._wakeup.set()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wakeup.wait(self.poll_interval_s)
+            self._wakeup.clear()
+
+            signature = self._signature()
+            if signature is None or signature == self._last_signature:
+                with self._cond:
+                    if self._pending:  # event for a frame already processed
+                        self._pending = False
+                        self._cond.notify_all()
+                continue
+            self._last_signature = signature
+            self._precompute(signature[0])
+
+    def _precompute(self, mtime_ns: int) -> None:
+        with self._cond:
+            # pending → in flight in one step, so a waiting poll never sees a gap
+            self._pending = False
+            self._inflight_mtime_ns = mtime_ns
+        start_time = time.perf_counter()
+        try:
+            frame_id = self._process(self.image_path.read_bytes(), mtime_ns)
+            self.processed += 1
+            self.last_latency_ms = round((time.perf_counter() - start_time) * 1000, 2)
+            if frame_id is not None and self._last_frame_id is not None:
+                self.superseded += max(0, frame_id - self._last_frame_id - 1)
+            if frame_id is not None:
+                self._last_frame_id = frame_id
+        except Exception as e:
+            # Stale (409), shed (503), torn read... the next frame retries
+            self.failed += 1
+            logger.debug(f"Precompute skipped: {e}")
+        finally:
+            with self._cond:
+                self._inflight_mtime_ns = None
+                self.last_mtime_ns = mtime_ns
+                self._cond.notify_all()
+
+    def is_computing(self, mtime_ns: int) -> bool:
+        """True if this frame is in flight, or announced and not yet processed."""
+        with self._cond:
+            return self._is_covered(mtime_ns)
+
+    def _is_covered(self, mtime_ns: int) -> bool:
+        """Lock held."""
+        return (self._inflight_mtime_ns == mtime_ns
+                or (self._pending and self.last_mtime_ns != mtime_ns))
+
+    def wait_for(self, mtime_ns: int, timeout_s: float = PRECOMPUTE_WAIT_MS / 1000) -> None:
+        """Block while the frame with this mtime is pending or being precomputed."""
+        with self._cond:
+            self._cond.wait_for(lambda: not self._is_covered(mtime_ns), timeout_s)
+
+    def wait_next(self, after_mtime_ns: Optional[int], timeout_s: float) -> Optional[int]:
+        """Block until a frame other than `after_mtime_ns` is processed; its mtime, None on timeout."""
+        with self._cond:
+            self._cond.wait_for(lambda: self.last_mtime_ns not in (None, after_mtime_ns), timeout_s)
+            return self.last_mtime_ns if self.last_mtime_ns != after_mtime_ns else None
+
+    def stats(self) -> dict:
         return {
-            "detections": detections,
-            "processing_time_ms": processing_time_ms,
-            "total_objects": len(detections),
+            "source": "events+mtime" if self.listener is not None else "mtime",
+            "processed": self.processed,
+            "superseded": self.superseded,
+            "failed": self.failed,
+            "events": self.events,
+            "last_latency_ms": self.last_latency_ms,
+        }
+
+
+# ===========================================================================
+# MemoryProfiler — Single Responsibility: tracemalloc snapshot diffs
+# ===========================================================================
+class MemoryProfiler:
+    """
+    "What has grown since the baseline?" for a live server.
+
+    tracemalloc is off by default: tracing slows every allocation and
+    costs memory per traced block. start() turns it on and takes the
+    baseline snapshot; diff() compares a new snapshot against it.
+    Only Python allocations are traced — native memory (torch, OpenCV
+    buffers) shows up in process RSS but not here.
+    """
+
+    # Allocations made by tracemalloc/import machinery are noise in a diff
+    NOISE_FILTERS = (
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        tracemalloc.Filter(False, "<unknown>"),
+    )
+
+    def __init__(self, frames: int = TRACEMALLOC_FRAMES):
+        self.frames = frames
+        self._lock = threading.Lock()  # snapshots are slow; one at a time
+        self._baseline: Optional[tracemalloc.Snapshot] = None
+        self._baseline_at: Optional[float] = None
+
+    @property
+    def tracing(self) -> bool:
+        return tracemalloc.is_tracing() and self._baseline is not None
+
+    def _snapshot(self) -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces(self.NOISE_FILTERS)
+
+    def start(self) -> None:
+        """Start tracing (if needed) and take the baseline."""
+        with self._lock:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(self.frames)
+            self._baseline = self._snapshot()
+            self._baseline_at = time.monotonic()
+
+    def stop(self) -> None:
+        """Stop tracing and free all trace memory."""
+        with self._lock:
+            tracemalloc.stop()
+            self._baseline = None
+            self._baseline_at = None
+
+    def diff(self, top: int = 25, group_by: str = "lineno", reset: bool = False) -> dict:
+        """
+        Top allocation sites by growth since the baseline.
+
+        Args:
+            top: Entries to return
+            group_by: "lineno" (one source line), "filename", or "traceback"
+                (full allocation stack — slower, best for finding the caller)
+            reset: Make this snapshot the new baseline afterwards
+
+        Returns:
+            Dict with baseline_age_s, traced/peak MB and the top entries
+        """
+        with self._lock:
+            snapshot = self._snapshot()
+            stats = snapshot.compare_to(self._baseline, group_by)
+            baseline_age_s = time.monotonic() - self._baseline_at
+            if reset:
+                self._baseline = snapshot
+                self._baseline_at = time.monotonic()
+
+        traced, peak = tracemalloc.get_traced_memory()
+        entries = []
+        for stat in stats[:top]:
+            # Most recent call first: frames[0] is the allocating line
+            frames = [f"{frame.filename}:{frame.lineno}" for frame in reversed(stat.traceback)]
+            entry = {
+                "location": frames[0] if frames else "?",
+                "size_diff_kb": round(stat.size_diff / 1024, 1),
+                "size_kb": round(stat.size / 1024, 1),
+                "count_diff": stat.count_diff,
+                "count": stat.count,
+            }
+            if group_by == "traceback":
+                entry["traceback"] = frames
+            entries.append(entry)
+
+        return {
+            "baseline_age_s": round(baseline_age_s, 1),
+            "baseline_reset": reset,
+            "traced_mb": round(traced / 2**20, 2),
+            "traced_peak_mb": round(peak / 2**20, 2),
+            "group_by": group_by,
+            "top": entries,
         }
 
 
@@ -241,6 +1755,48 @@ class YoloDetector:
 # ===========================================================================
 # Load model at startup (not per-request)
 detector: Optional[YoloDetector] = None
+# Tiled mode needs full-resolution pixels — no reduced-scale decode
+decoder = ImageDecoder(None if TILED_INFERENCE else MODEL_INPUT_SIZE)
+body_pool = BufferPool()
+result_cache = ResultCache()
+admission = AdmissionController()
+recent_detections = RecentDetections()
+precomputer: Optional[FramePrecomputer] = None
+grpc_server = None  # GrpcTransport when gRPC is enabled and installed
+memory_profiler = MemoryProfiler()
+calibration: Optional[CameraCalibration] = None
+corridor_projector = CorridorProjector()
+
+
+def _build_detector(model_path: Path) -> YoloDetector:
+    """Detector with the server's tiling/calibration settings."""
+    return YoloDetector(
+        model_path,
+        tile_planner=TilePlanner() if TILED_INFERENCE else None,
+        calibration=calibration,
+    )
+
+
+def _install_detector(new_detector: YoloDetector) -> None:
+    """Atomic swap: requests already running keep their reference."""
+    global detector
+    detector = new_detector
+
+
+def _log_system_event(level: str, message: str, event_type: str,
+                      details: Optional[dict] = None) -> None:
+    """Fire-and-forget system_logs entry (no-op without DB)."""
+    if not DB_AVAILABLE:
+        return
+    try:
+        getattr(system_logger, level)(component="vision-ai", message=message,
+                                      event_type=event_type, details=details)
+    except Exception as e:
+        logger.warning(f"Failed to log {event_type} to DB: {e}")
+
+
+model_reloader = ModelReloader(_build_detector, _install_detector, lambda: detector,
+                               admit=lambda: admission.slot("low"))
 
 
 @asynccontextmanager
@@ -251,8 +1807,42 @@ async def lifespan(app: FastAPI):
     - Before yield: startup logic (load model, log startup)
     - After yield: shutdown logic (log shutdown)
     """
-    global detector
-    detector = YoloDetector(MODEL_NAME)
+    global detector, calibration, corridor_projector
+    if TRACEMALLOC_AT_STARTUP:
+        memory_profiler.start()
+    calibration = CameraCalibration.load(CALIBRATION_PATH)  # remap tables built here, once
+    if calibration is not None:
+        logger.info(f"Camera calibration loaded: {CALIBRATION_PATH} (undistort: {UNDISTORT_MODE})")
+    corridor_projector = CorridorProjector.from_calibration(calibration)
+    detector = _build_detector(MODEL_NAME)
+
+    watcher = None
+    if MODEL_WATCH_INTERVAL_S is not None:
+        watcher = ModelFileWatcher(MODEL_NAME, model_reloader, MODEL_WATCH_INTERVAL_S)
+        watcher.start()
+
+    global precomputer
+    if PRECOMPUTE_ON_ARRIVAL:
+        listener = None
+        if FRAME_EVENTS_ENABLED:
+            try:
+                listener = FrameEventListener(FRAME_EVENT_HOST, FRAME_EVENT_PORT)
+            except OSError as e:
+                logger.warning(f"Frame event port {FRAME_EVENT_PORT} unavailable ({e}) — "
+                               f"precompute falls back to mtime polling")
+        precomputer = FramePrecomputer(CAMERA_IMAGE_PATH, _precompute_frame, listener)
+        precomputer.start()
+
+    global grpc_server
+    if GRPC_ENABLED and not GRPC_AVAILABLE:
+        logger.warning("grpcio/grpcio-tools not installed — gRPC transport disabled (HTTP only)")
+    elif GRPC_ENABLED:
+        servicer = VisionDetectionServicer(_grpc_detect_image, _grpc_detect_latest, _wait_for_new_frame)
+        addresses = [address for address in GRPC_ADDRESSES
+                     if not address.startswith("unix:") or hasattr(socket, "AF_UNIX")]
+        grpc_server = GrpcTransport(servicer, addresses, GRPC_MAX_WORKERS,
+                                    max_message_bytes=RAW_BODY_MAX_BYTES)
+        grpc_server.start()
 
     if DB_AVAILABLE:
         try:
@@ -267,6 +1857,13 @@ async def lifespan(app: FastAPI):
 
     yield  # --- Server is running ---
 
+    if watcher is not None:
+        watcher.stop()
+    if precomputer is not None:
+        precomputer.stop()
+    if grpc_server is not None:
+        grpc_server.stop()
+
     if DB_AVAILABLE:
         try:
             system_logger.info(
@@ -293,16 +1890,37 @@ app = FastAPI(
 # Helper: Log detections to database
 # ---------------------------------------------------------------------------
 def _log_detections_to_db(detections: list, processing_time_ms: int,
-                          image_path: Optional[str] = None) -> None:
+                          image_path: Optional[str] = None,
+                          trace: Optional[dict] = None) -> None:
     """
     Log detection results to PostgreSQL (fire-and-forget).
 
+    DETECTION_STORAGE picks the table: "frames" queues one detection_frames
+    row (never blocks), "rows" inserts one detections row per box.
+    `trace` is the response's trace dict — frame_id and frame_age_ms
+    are copied into every row.
+
     Does NOT raise exceptions — DB failure should never break detection API.
     """
     if not DB_AVAILABLE:
         return
 
+    frame_id = trace["frame_id"] if trace else None
+    # Clock skew between camera and vision-ai can make the age slightly negative
+    frame_age_ms = max(0, int(trace["frame_age_ms"])) if trace else None
+
     try:
+        if DETECTION_STORAGE in ("frames", "both"):
+            frame_logger.log_frame(
+                detections,
+                processing_time_ms=processing_time_ms,
+                image_path=image_path,
+                frame_id=frame_id,
+                frame_age_ms=frame_age_ms,
+                in_detections=DETECTION_STORAGE == "both",
+            )
+        if DETECTION_STORAGE not in ("rows", "both"):
+            return
         for det in detections:
             detection_logger.log_detection(
                 object_class=det["object_class"],
@@ -312,6 +1930,8 @@ def _log_detections_to_db(detections: list, processing_time_ms: int,
                 processing_time_ms=processing_time_ms,
                 image_path=image_path,
                 triggered_stop=False,
+                frame_id=frame_id,
+                frame_age_ms=frame_age_ms,
             )
     except Exception as e:
         logger.warning(f"Failed to log detections to DB: {e}")
@@ -320,18 +1940,503 @@ def _log_detections_to_db(detections: list, processing_time_ms: int,
 # ---------------------------------------------------------------------------
 # Helper: Read image from bytes
 # ---------------------------------------------------------------------------
-def _read_image_from_bytes(image_bytes: bytes) -> np.ndarray:
+def _read_image_from_bytes(image_bytes: bytes) -> tuple[np.ndarray, tuple[int, int], float]:
     """
-    Convert raw bytes to OpenCV image.
+    Convert raw bytes to OpenCV image (reduced-scale decode when possible).
+
+    Returns:
+        (image, original_size, decode_ms) — original_size is the source
+        (width, height) that detector.detect() maps boxes back to.
 
     Raises:
         HTTPException: If image cannot be decoded
     """
-    nparr = np.frombuffer(image_bytes, np.uint8)
-    image = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+    start_time = time.perf_counter()
+    image, original_size = decoder.decode(image_bytes)
+    decode_ms = (time.perf_counter() - start_time) * 1000
     if image is None:
         raise HTTPException(status_code=400, detail="Invalid image file — cannot decode")
-    return image
+    return image, original_size, decode_ms
+
+
+# ---------------------------------------------------------------------------
+# Helper: Run detector on decoded image and attach decode timing
+# ---------------------------------------------------------------------------
+def _run_detection(image: np.ndarray, original_size: tuple[int, int],
+                   decode_ms: float, threshold: float,
+                   trace: Optional[FrameTrace] = None,
+                   active_detector: Optional[YoloDetector] = None,
+                   roi: Optional[tuple] = None) -> dict:
+    """Run inference and prepend decode cost to the timing breakdown."""
+    active_detector = active_detector or detector
+    result = active_detector.detect(image, confidence_threshold=threshold,
+                                    original_size=original_size, trace=trace, roi=roi)
+    result["timing_ms"] = {"decode": round(decode_ms, 2), **result["timing_ms"]}
+    return result
+
+
+# ---------------------------------------------------------------------------
+# Helper: Stream request body into a pooled buffer
+# ---------------------------------------------------------------------------
+async def _read_body_into_buffer(request: Request) -> tuple[bytearray, int]:
+    """
+    Read the raw request body into a pooled bytearray.
+
+    Presized from Content-Length when the client sends it (HttpClient does),
+    so the common case is one buffer, no intermediate bytes objects.
+
+    Returns:
+        (buffer, length) — only buffer[:length] is valid
+
+    Raises:
+        HTTPException: 413 if body exceeds RAW_BODY_MAX_BYTES, 400 if empty
+            or Content-Length is malformed
+    """
+    try:
+        declared_length = int(request.headers.get("content-length") or 0)
+    except ValueError:
+        declared_length = -1
+    if declared_length < 0:
+        raise HTTPException(status_code=400, detail="Invalid Content-Length header")
+    if declared_length > RAW_BODY_MAX_BYTES:
+        raise HTTPException(status_code=413, detail="Request body too large")
+
+    buffer = body_pool.acquire(declared_length)
+    length = 0
+    async for chunk in request.stream():
+        end = length + len(chunk)
+        if end > RAW_BODY_MAX_BYTES:
+            body_pool.release(buffer)
+            raise HTTPException(status_code=413, detail="Request body too large")
+        if end > len(buffer):
+            # Grow into a fresh buffer (see BufferPool: never resize in place)
+            grown = bytearray(max(end, len(buffer) * 2))
+            grown[:length] = buffer[:length]
+            buffer = grown
+        buffer[length:end] = chunk
+        length = end
+
+    if length == 0:
+        body_pool.release(buffer)
+        raise HTTPException(status_code=400, detail="Empty request body")
+    return buffer, length
+
+
+# ---------------------------------------------------------------------------
+# Helper: Wrap raw BGR bytes as an image (no decode, no copy)
+# ---------------------------------------------------------------------------
+def _image_from_raw_bgr(body: memoryview, width: int,
+                        height: int) -> tuple[np.ndarray, tuple[int, int], float]:
+    """
+    View a packed BGR24 frame as an OpenCV image without copying.
+
+    Raises:
+        HTTPException: If body length does not match width × height × 3
+    """
+    expected = width * height * 3
+    if len(body) != expected:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Raw frame size mismatch: got {len(body)} bytes, "
+                   f"expected {expected} for {width}x{height} BGR"
+        )
+    image = np.frombuffer(body, np.uint8, count=expected).reshape(height, width, 3)
+    return image, (width, height), 0.0
+
+
+# ---------------------------------------------------------------------------
+# Helper: Frame trace — resolve, check age
+# ---------------------------------------------------------------------------
+def _resolve_trace(body, header_payload: Optional[str] = None,
+                   fallback_wall_ns: Optional[int] = None) -> Optional[FrameTrace]:
+    """
+    Find the frame trace for a request and mark it "received".
+
+    Priority: X-Frame-Trace header → JPEG COM segment → file mtime.
+    Returns None when the frame carries no timing information at all.
+    """
+    trace = None
+    if header_payload:
+        trace = FrameTrace.from_payload(header_payload.encode())
+    if trace is None:
+        trace = FrameTrace.from_jpeg(body)
+    if trace is None and fallback_wall_ns is not None:
+        trace = FrameTrace.from_wall_time(None, fallback_wall_ns)
+    if trace is not None:
+        trace.mark("received")
+    return trace
+
+
+def _check_frame_age(trace: Optional[FrameTrace]) -> None:
+    """
+    Reject stale frames before spending inference on them.
+
+    Raises:
+        HTTPException: 409 if frame is older than MAX_FRAME_AGE_MS
+    """
+    if MAX_FRAME_AGE_MS is None or trace is None:
+        return
+    age_ms = trace.age_ms()
+    if age_ms > MAX_FRAME_AGE_MS:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Stale frame {trace.frame_id}: {age_ms:.0f}ms old "
+                   f"(max {MAX_FRAME_AGE_MS:.0f}ms)"
+        )
+
+
+# ---------------------------------------------------------------------------
+# Helper: Priority class + absolute deadline for admission control
+# ---------------------------------------------------------------------------
+def _resolve_admission(default_priority: str, priority_header: Optional[str],
+                       deadline_ms_header: Optional[float],
+                       arrived_mono: float) -> tuple[str, Optional[float]]:
+    """
+    X-Priority overrides the endpoint's class; X-Deadline-Ms (budget from
+    arrival) overrides the class default deadline.
+
+    Raises:
+        HTTPException: 400 if X-Priority is not a known class
+    """
+    priority = (priority_header or default_priority).strip().lower()
+    if priority not in PRIORITY_CLASSES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown X-Priority '{priority_header}' (use {', '.join(PRIORITY_CLASSES)})"
+        )
+    deadline_ms = deadline_ms_header if deadline_ms_header is not None else DEFAULT_DEADLINE_MS.get(priority)
+    deadline_mono = arrived_mono + deadline_ms / 1000 if deadline_ms is not None else None
+    return priority, deadline_mono
+
+
+# ---------------------------------------------------------------------------
+# Helper: Region of interest from ?roi= / ?corridor= / ROI_REGION
+# ---------------------------------------------------------------------------
+def _parse_floats(value: str, name: str, counts: tuple[int, ...]) -> list[float]:
+    try:
+        numbers = [float(part) for part in value.split(",")]
+    except ValueError:
+        numbers = []
+    if len(numbers) not in counts or not all(math.isfinite(n) for n in numbers):
+        raise HTTPException(status_code=400,
+                            detail=f"{name} must be {' or '.join(map(str, counts))} comma-separated numbers")
+    return numbers
+
+
+def _resolve_roi(roi: Optional[str], corridor: Optional[str]) -> Optional[tuple]:
+    """
+    ?roi=x1,y1,x2,y2 (normalized) or ?corridor=half_width_m,range_m[,lateral_offset_m[,near_m]]
+    (projected by CorridorProjector); neither = ROI_REGION.
+
+    Raises:
+        HTTPException: 400 if malformed (see _resolve_region)
+    """
+    return _resolve_region(
+        _parse_floats(roi, "roi", (4,)) if roi is not None else None,
+        _parse_floats(corridor, "corridor", (2, 3, 4)) if corridor is not None else None,
+    )
+
+
+def _resolve_region(roi: Optional[tuple], corridor: Optional[tuple]) -> Optional[tuple]:
+    """
+    Region from parsed values (query strings above, gRPC Roi/Corridor messages).
+
+    A corridor that is not in view yields None (whole frame) — skipping
+    pixels is only safe when we know where the route is. A region covering
+    the whole frame (explicit or projected) is None too, so it costs no crop
+    and shares the full-frame cache entry.
+
+    Raises:
+        HTTPException: 400 if out of range, empty, or both are given
+    """
+    if roi is not None and corridor is not None:
+        raise HTTPException(status_code=400, detail="Send roi or corridor, not both")
+    if corridor is not None:
+        if not (corridor[0] > 0 and corridor[1] > 0 and all(map(math.isfinite, corridor))):
+            raise HTTPException(status_code=400, detail="corridor half_width_m and range_m must be > 0")
+        if len(corridor) > 3 and not 0 <= corridor[3] < corridor[1]:
+            raise HTTPException(status_code=400, detail="corridor near_m must satisfy 0 <= near_m < range_m")
+        region = corridor_projector.project(*corridor)
+    elif roi is None:
+        return ROI_REGION
+    else:
+        region = tuple(roi)
+        x1, y1, x2, y2 = region
+        if not (0.0 <= x1 < x2 <= 1.0 and 0.0 <= y1 < y2 <= 1.0):
+            raise HTTPException(status_code=400, detail="roi must satisfy 0 <= x1 < x2 <= 1, 0 <= y1 < y2 <= 1")
+    if region == (0.0, 0.0, 1.0, 1.0):
+        return None
+    return region
+
+
+# ---------------------------------------------------------------------------
+# Helper: Decode + detect from image bytes, via the result cache
+# ---------------------------------------------------------------------------
+def _detect_from_body(body, threshold: float,
+                      width: Optional[int] = None, height: Optional[int] = None,
+                      trace: Optional[FrameTrace] = None,
+                      priority: str = "normal",
+                      deadline_mono: Optional[float] = None,
+                      roi: Optional[tuple] = None) -> dict:
+    """
+    Decode JPEG/PNG (or view raw BGR) in place and run detection.
+
+    Cache hits return the stored result without decoding or inference;
+    the response carries `cache_hit` so callers can skip DB logging.
+    Misses wait for an inference slot (AdmissionController); a request
+    that cannot meet its deadline gets 503 + Retry-After instead.
+    The trace (frame_age_ms, stages) is attached after the cache, so a
+    hit still reports the frame's current age.
+
+    The detector is read ONCE: a hot reload mid-request cannot mix the
+    old model's cache key with the new model's result.
+
+    `roi` (resolved by _resolve_region) is part of the cache key: the same
+    frame with another ROI is a different result.
+    """
+    _check_frame_age(trace)
+    active_detector = detector
+
+    frame_shape = (width, height) if width is not None and height is not None else None
+    key = result_cache.make_key(body, threshold, active_detector.model_version, frame_shape, roi)
+    result = result_cache.get(key)
+    if result is not None:
+        result["cache_hit"] = True
+    else:
+        try:
+            with admission.slot(priority, deadline_mono):
+                if frame_shape is not None:
+                    image, original_size, decode_ms = _image_from_raw_bgr(body, width, height)
+                else:
+                    image, original_size, decode_ms = _read_image_from_bytes(body)
+                if trace is not None:
+                    trace.mark("decoded")
+                result = _run_detection(image, original_size, decode_ms, threshold, trace,
+                                        active_detector, roi)
+        except AdmissionRejected as e:
+            raise HTTPException(
+                status_code=503,
+                detail=f"Inference overloaded: {e}",
+                headers={"Retry-After": str(e.retry_after_s)},
+            )
+
+        result_cache.put(key, result)
+        result["cache_hit"] = False
+        # Distinct frames only — a re-polled frame is not seen twice
+        recent_detections.add(result["detections"],
+                              frame_id=trace.frame_id if trace is not None else None)
+
+    result["model_version"] = active_detector.model_version
+
+    if trace is not None:
+        trace.mark("responded")
+        result["trace"] = trace.to_response()
+        result["frame_age_ms"] = result["trace"]["frame_age_ms"]
+    else:
+        result["trace"] = None
+        result["frame_age_ms"] = None
+    return result
+
+
+# ---------------------------------------------------------------------------
+# Helper: Precompute a newly arrived latest.jpg (FramePrecomputer callback)
+# ---------------------------------------------------------------------------
+def _precompute_frame(image_bytes: bytes, mtime_ns: int) -> Optional[int]:
+    """
+    Same path as GET /detect/latest at the default threshold, so the next
+    poll is a cache hit. Logs to DB here — the poll will not (cache hit).
+
+    Returns:
+        Trace frame id (for superseded-frame accounting), if known
+    """
+    trace = _resolve_trace(image_bytes, fallback_wall_ns=mtime_ns)
+    result = _detect_from_body(image_bytes, DEFAULT_CONFIDENCE_THRESHOLD, trace=trace,
+                               priority="critical", roi=ROI_REGION)
+    if not result["cache_hit"]:
+        _log_detections_to_db(
+            result["detections"],
+            result["processing_time_ms"],
+            image_path=str(CAMERA_IMAGE_PATH),
+            trace=result["trace"],
+        )
+    return trace.frame_id if trace is not None else None
+
+
+def _is_precomputed_key(threshold: float, region: Optional[tuple]) -> bool:
+    """True if a latest-frame request hits the cache entry _precompute_frame fills."""
+    return round(threshold, 4) == round(DEFAULT_CONFIDENCE_THRESHOLD, 4) and region == ROI_REGION
+
+
+# ---------------------------------------------------------------------------
+# Helper: Detection entry points shared by HTTP and gRPC (blocking — threadpool)
+# ---------------------------------------------------------------------------
+def _detect_upload(body, threshold: float, width: Optional[int], height: Optional[int],
+                   frame_trace: Optional[str], image_path: Optional[str],
+                   priority: str, deadline_mono: Optional[float],
+                   region: Optional[tuple], source: str = "raw") -> dict:
+    """Uploaded frame (encoded or raw BGR) → result; logs distinct frames to DB."""
+    trace = _resolve_trace(body, header_payload=frame_trace)
+    result = _detect_from_body(body, threshold, width, height, trace,
+                               priority=priority, deadline_mono=deadline_mono, roi=region)
+
+    if not result["cache_hit"]:
+        _log_detections_to_db(
+            result["detections"],
+            result["processing_time_ms"],
+            image_path=image_path,
+            trace=result["trace"],
+        )
+
+    logger.info(
+        f"[{source}{' cache' if result['cache_hit'] else ''}] Detected {result['total_objects']} objects "
+        f"in {result['processing_time_ms']}ms "
+        f"({'bgr' if width else 'encoded'}, {len(body)} bytes)"
+    )
+    return result
+
+
+def _detect_pooled_upload(buffer: bytearray, length: int, *args) -> dict:
+    """_detect_upload on a body_pool buffer; returns it to the pool after the last read."""
+    try:
+        return _detect_upload(memoryview(buffer)[:length], *args)
+    finally:
+        body_pool.release(buffer)
+
+
+def _detect_latest_frame(threshold: float, priority: str, deadline_mono: Optional[float],
+                         region: Optional[tuple], source: str = "latest") -> dict:
+    """
+    camera/images/latest.jpg → result; logs distinct frames to DB.
+
+    Raises:
+        HTTPException: 404 no image, 409 stale, 503 shed, 500 unreadable
+    """
+    if not CAMERA_IMAGE_PATH.exists():
+        raise HTTPException(
+            status_code=404,
+            detail=f"No image found at {CAMERA_IMAGE_PATH}. Is camera module running?"
+        )
+
+    # Read image from file (bytes first, so the decoder can pick a reduced scale)
+    try:
+        mtime_ns = CAMERA_IMAGE_PATH.stat().st_mtime_ns
+        image_bytes = CAMERA_IMAGE_PATH.read_bytes()
+    except OSError:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to read image at {CAMERA_IMAGE_PATH}"
+        )
+
+    # Embedded trace from camera_server, else file mtime as capture time
+    trace = _resolve_trace(image_bytes, fallback_wall_ns=mtime_ns)
+
+    # Frame is announced or being precomputed → wait for that run, then hit the
+    # cache. Only if that run fills this request's entry: another threshold or
+    # region would wait for nothing and then infer anyway.
+    if (precomputer is not None and _is_precomputed_key(threshold, region)
+            and precomputer.is_computing(mtime_ns)):
+        precomputer.wait_for(mtime_ns)
+
+    # Run detection (same frame polled again → cached result)
+    try:
+        result = _detect_from_body(image_bytes, threshold, trace=trace,
+                                   priority=priority, deadline_mono=deadline_mono, roi=region)
+    except HTTPException as e:
+        if e.status_code in (409, 503):
+            raise  # stale frame / shed by admission control — pass through
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to read image at {CAMERA_IMAGE_PATH}"
+        )
+
+    # Log to database (once per distinct frame)
+    if not result["cache_hit"]:
+        _log_detections_to_db(
+            result["detections"],
+            result["processing_time_ms"],
+            image_path=str(CAMERA_IMAGE_PATH),
+            trace=result["trace"],
+        )
+
+    logger.info(
+        f"[{source}{' cache' if result['cache_hit'] else ''}] Detected {result['total_objects']} objects "
+        f"in {result['processing_time_ms']}ms"
+    )
+    return result
+
+
+def _wait_for_new_frame(after_mtime_ns: Optional[int], timeout_s: float) -> Optional[int]:
+    """
+    Block until latest.jpg is a frame other than `after_mtime_ns`; its mtime,
+    or None on timeout.
+
+    With the precomputer running, returns once the frame has been processed
+    (the next _detect_latest_frame is a cache hit); else polls the mtime.
+    """
+    if precomputer is not None:
+        return precomputer.wait_next(after_mtime_ns, timeout_s)
+
+    deadline = time.monotonic() + timeout_s
+    while True:
+        try:
+            mtime_ns = CAMERA_IMAGE_PATH.stat().st_mtime_ns
+            if mtime_ns != after_mtime_ns:
+                return mtime_ns
+        except OSError:
+            pass
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return None
+        time.sleep(min(remaining, PRECOMPUTE_POLL_INTERVAL_S))
+
+
+# ---------------------------------------------------------------------------
+# Helper: gRPC entry points (VisionDetectionServicer callbacks)
+# ---------------------------------------------------------------------------
+def _check_rpc_values(threshold: Optional[float], deadline_ms: Optional[float]) -> float:
+    """
+    The checks FastAPI applies to query/header values for HTTP.
+
+    Returns:
+        Threshold (DEFAULT_CONFIDENCE_THRESHOLD if not sent)
+
+    Raises:
+        HTTPException: 400 if out of range
+    """
+    if threshold is None:
+        threshold = DEFAULT_CONFIDENCE_THRESHOLD
+    elif not 0.0 <= threshold <= 1.0:
+        raise HTTPException(status_code=400, detail="threshold must be between 0 and 1")
+    if deadline_ms is not None and not deadline_ms > 0:
+        raise HTTPException(status_code=400, detail="deadline_ms must be > 0")
+    return threshold
+
+
+def _grpc_detect_image(body: bytes, threshold: Optional[float],
+                       width: Optional[int], height: Optional[int],
+                       frame_trace: Optional[str], image_path: Optional[str],
+                       priority: Optional[str], deadline_ms: Optional[float],
+                       roi: Optional[tuple], corridor: Optional[tuple]) -> dict:
+    """Detect / DetectStream — same defaults as POST /detect/raw ("normal" class)."""
+    arrived_mono = time.monotonic()
+    threshold = _check_rpc_values(threshold, deadline_ms)
+    if (width is None) != (height is None):
+        raise HTTPException(status_code=400, detail="width and height must be sent together")
+    priority, deadline_mono = _resolve_admission("normal", priority, deadline_ms, arrived_mono)
+    region = _resolve_region(roi, corridor)
+    return _detect_upload(body, threshold, width, height, frame_trace, image_path,
+                          priority, deadline_mono, region, source="grpc")
+
+
+def _grpc_detect_latest(threshold: Optional[float], priority: Optional[str],
+                        deadline_ms: Optional[float],
+                        roi: Optional[tuple], corridor: Optional[tuple]) -> dict:
+    """DetectLatest / StreamLatest — same defaults as GET /detect/latest ("critical" class)."""
+    arrived_mono = time.monotonic()
+    threshold = _check_rpc_values(threshold, deadline_ms)
+    priority, deadline_mono = _resolve_admission("critical", priority, deadline_ms, arrived_mono)
+    region = _resolve_region(roi, corridor)
+    return _detect_latest_frame(threshold, priority, deadline_mono, region, source="grpc latest")
 
 
 # ===========================================================================
@@ -345,13 +2450,129 @@ async def health_check():
 
     Returns model status and database connectivity.
     Used by agv-control (C#) to verify Vision AI is running.
+
+    `database` shows the circuit breaker (closed/open/half_open) and the
+    offline journal backlog; detection still works while it is open.
     """
     return {
         "status": "ok",
         "model": MODEL_NAME,
+        "model_version": detector.model_version if detector is not None else None,
+        "model_reload": model_reloader.state,
         "db_connected": DB_AVAILABLE,
+        "database": DatabaseConnection().status() if DB_AVAILABLE else None,
+    }
+
+
+@app.get("/stats")
+async def stats():
+    """
+    Runtime counters for dashboards and load testing.
+
+    - result_cache: hit/miss/eviction counts of the content-hash cache
+    - system_logger: async system_logs writer queue/dedup counters
+    - frame_logger: detection_frames writer queue/written/dropped counters
+    - admission: per priority class queue depth, shed counts, queue wait
+    - recent_detections: ring buffer fill level
+    - grpc: addresses the gRPC transport is serving on (None = disabled)
+    """
+    return {
+        "result_cache": result_cache.stats(),
+        "system_logger": system_logger.stats() if DB_AVAILABLE else None,
+        "frame_logger": frame_logger.stats() if DB_AVAILABLE else None,
+        "admission": admission.stats(),
+        "recent_detections": recent_detections.stats(),
+        "precompute": precomputer.stats() if precomputer is not None else None,
+        "grpc": {"addresses": grpc_server.bound} if grpc_server is not None else None,
     }
 
+
+@app.get("/detections/recent")
+async def detections_recent(
+    window_s: float = Query(
+        default=30.0, gt=0, le=RECENT_QUERY_MAX_WINDOW_S,
+        description="Look-back window in seconds"
+    ),
+    object_class: Optional[str] = Query(default=None, description="Only this class"),
+    min_confidence: float = Query(default=0.0, ge=0.0, le=1.0),
+    limit: int = Query(default=RECENT_QUERY_DEFAULT_LIMIT, ge=0, le=RECENT_DETECTIONS_CAPACITY),
+):
+    """
+    What has been seen recently — served from memory, no database query.
+
+    Covers every distinct frame processed by this server (all endpoints),
+    up to RECENT_DETECTIONS_CAPACITY detections. Newest first.
+    """
+    return {
+        "window_s": window_s,
+        **recent_detections.query(window_s, object_class, min_confidence, limit),
+    }
+
+
+@app.get("/admin/model")
+async def model_status():
+    """Active model version + state of the last/ongoing hot reload."""
+    return {
+        "model_version": detector.model_version if detector is not None else None,
+        "reload": model_reloader.status(),
+    }
+
+
+@app.post("/admin/model/reload", status_code=202)
+async def reload_model(
+    model_path: Optional[str] = Query(
+        default=None,
+        description="Weights file inside vision-ai/ (default: MODEL_NAME)"
+    ),
+):
+    """
+    Load, warm up and smoke-check a model in the background, then swap.
+
+    Returns immediately (202); poll GET /admin/model for the outcome.
+    Serving continues on the current model throughout, and stays on it if
+    the new one fails to load or fails the smoke check.
+    """
+    model_dir = Path(__file__).resolve().parent
+    target = (model_dir / model_path).resolve() if model_path else Path(MODEL_NAME).resolve()
+    allowed = target == Path(MODEL_NAME).resolve() or target.is_relative_to(model_dir)
+    if not allowed or not target.is_file():
+        raise HTTPException(status_code=400, detail=f"No model file at {model_path or MODEL_NAME}")
+
+    if not model_reloader.start(target):
+        raise HTTPException(status_code=409, detail="A model reload is already in progress")
+    return {"accepted": True, "reload": model_reloader.status()}
+
+
+@app.get("/debug/memory")
+def debug_memory(
+    top: int = Query(default=25, ge=1, le=MEMORY_DEBUG_MAX_TOP),
+    group_by: str = Query(default="lineno", pattern="^(lineno|filename|traceback)$"),
+    reset: bool = Query(default=False, description="Use this snapshot as the next baseline"),
+):
+    """
+    tracemalloc snapshot diff of the live server + process RSS/FDs/threads.
+
+    The first call starts tracing and returns only the baseline
+    ("tracemalloc": "started"); later calls list the allocation sites
+    that grew most since then. Leak hunting: call once, let traffic run,
+    call again. DELETE /debug/memory stops tracing (it is not free).
+
+    Sync handler: snapshots take hundreds of ms on a large heap.
+    """
+    process = sample_process()
+    if not memory_profiler.tracing:
+        memory_profiler.start()
+        return {"tracemalloc": "started", "frames": memory_profiler.frames, "process": process}
+    return {"tracemalloc": "tracing", "process": process,
+            **memory_profiler.diff(top, group_by, reset)}
+
+
+@app.delete("/debug/memory")
+def stop_memory_debug():
+    """Stop tracemalloc tracing and free its memory."""
+    memory_profiler.stop()
+    return {"tracemalloc": "stopped", "process": sample_process()}
+
 # Performance: Avoid blocking FastAPI event loop.
 # YOLO inference is CPU/GPU-bound and synchronous. If this endpoint were `async`,
 # the inference would run on the main event loop and block other requests.
@@ -365,6 +2586,20 @@ def detect_objects(
         le=1.0,
         description="Minimum confidence threshold (0-1)"
     ),
+    priority: Optional[str] = Header(
+        default=None, alias="X-Priority",
+        description="Admission class: critical, normal (default), low"
+    ),
+    deadline_ms: Optional[float] = Header(
+        default=None, alias="X-Deadline-Ms", gt=0,
+        description="Answer within this many ms or get 503 + Retry-After"
+    ),
+    roi: Optional[str] = Query(
+        default=None, description="Infer only on x1,y1,x2,y2 (normalized); default ROI_REGION"
+    ),
+    corridor: Optional[str] = Query(
+        default=None, description="ROI from the path ahead: half_width_m,range_m[,lateral_offset_m[,near_m]]"
+    ),
 ):
     """
     Detect objects in uploaded image.
@@ -382,22 +2617,29 @@ def detect_objects(
     Returns:
         JSON with detections, processing_time_ms, total_objects
     """
-    # Read uploaded image
-    image_bytes = file.file.read()
-    image = _read_image_from_bytes(image_bytes)
+    arrived_mono = time.monotonic()
+    priority, deadline_mono = _resolve_admission("normal", priority, deadline_ms, arrived_mono)
+    region = _resolve_roi(roi, corridor)
 
-    # Run detection
-    result = detector.detect(image, confidence_threshold=threshold)
-
-    # Log to database (non-blocking, fire-and-forget)
-    _log_detections_to_db(
-        result["detections"],
-        result["processing_time_ms"],
-        image_path=file.filename,
-    )
+    # Read uploaded image (trace survives C# re-uploading latest.jpg)
+    image_bytes = file.file.read()
+    trace = _resolve_trace(image_bytes)
+
+    # Run detection (identical bytes → cached result, no decode/inference)
+    result = _detect_from_body(image_bytes, threshold, trace=trace,
+                               priority=priority, deadline_mono=deadline_mono, roi=region)
+
+    # Log to database (non-blocking, fire-and-forget) — retries logged once
+    if not result["cache_hit"]:
+        _log_detections_to_db(
+            result["detections"],
+            result["processing_time_ms"],
+            image_path=file.filename,
+            trace=result["trace"],
+        )
 
     logger.info(
-        f"Detected {result['total_objects']} objects "
+        f"{'[cache] ' if result['cache_hit'] else ''}Detected {result['total_objects']} objects "
         f"in {result['processing_time_ms']}ms "
         f"(threshold={threshold})"
     )
@@ -405,59 +2647,166 @@ def detect_objects(
     return result
 
 
-@app.get("/detect/latest")
-async def detect_latest(
+@app.post("/detect/raw")
+async def detect_raw(
+    request: Request,
     threshold: float = Query(
         default=DEFAULT_CONFIDENCE_THRESHOLD,
         ge=0.0,
         le=1.0,
         description="Minimum confidence threshold (0-1)"
     ),
+    frame_width: Optional[int] = Header(
+        default=None, alias="X-Frame-Width", gt=0,
+        description="Width of a raw BGR24 frame (omit for JPEG/PNG body)"
+    ),
+    frame_height: Optional[int] = Header(
+        default=None, alias="X-Frame-Height", gt=0,
+        description="Height of a raw BGR24 frame (omit for JPEG/PNG body)"
+    ),
+    image_path: Optional[str] = Header(
+        default=None, alias="X-Image-Path",
+        description="Source image reference for the detections table"
+    ),
+    frame_trace: Optional[str] = Header(
+        default=None, alias="X-Frame-Trace",
+        description="FrameTrace JSON payload (raw BGR frames have no JPEG COM segment)"
+    ),
+    priority: Optional[str] = Header(
+        default=None, alias="X-Priority",
+        description="Admission class: critical, normal (default), low"
+    ),
+    deadline_ms: Optional[float] = Header(
+        default=None, alias="X-Deadline-Ms", gt=0,
+        description="Answer within this many ms or get 503 + Retry-After"
+    ),
+    roi: Optional[str] = Query(
+        default=None, description="Infer only on x1,y1,x2,y2 (normalized); default ROI_REGION"
+    ),
+    corridor: Optional[str] = Query(
+        default=None, description="ROI from the path ahead: half_width_m,range_m[,lateral_offset_m[,near_m]]"
+    ),
 ):
     """
-    Detect objects from camera's latest captured image.
+    Detect objects in an `application/octet-stream` request body.
 
-    Reads from camera/images/latest.jpg directly.
-    Useful for quick testing without uploading a file.
+    Faster alternative to POST /detect for co-located callers:
+    - No multipart parsing, no spooled temp file
+    - Body is read into a pooled buffer and decoded in place
+
+    Body formats:
+    - Encoded image (JPEG/PNG) — no frame headers
+    - Raw BGR24 frame — send X-Frame-Width and X-Frame-Height; JPEG is skipped
+      entirely (intended for localhost, ~0.9 MB per 640×480 frame)
+
+    Frame trace: X-Frame-Trace header, else the JPEG COM segment.
 
     Returns:
         JSON with detections, processing_time_ms, total_objects
     """
-    if not CAMERA_IMAGE_PATH.exists():
+    arrived_mono = time.monotonic()
+    if (frame_width is None) != (frame_height is None):
         raise HTTPException(
-            status_code=404,
-            detail=f"No image found at {CAMERA_IMAGE_PATH}. Is camera module running?"
+            status_code=400,
+            detail="X-Frame-Width and X-Frame-Height must be sent together"
         )
+    priority, deadline_mono = _resolve_admission("normal", priority, deadline_ms, arrived_mono)
+    region = _resolve_roi(roi, corridor)
+
+    buffer, length = await _read_body_into_buffer(request)
+    # Inference (and DB logging) is synchronous — keep it off the event loop.
+    # The worker releases the buffer: if this coroutine is cancelled (client
+    # gone), the pool must not hand the buffer out while it is still decoded.
+    return await run_in_threadpool(
+        _detect_pooled_upload, buffer, length, threshold, frame_width, frame_height,
+        frame_trace, image_path, priority, deadline_mono, region,
+    )
 
-    # Read image from file
-    image = cv2.imread(str(CAMERA_IMAGE_PATH))
-    if image is None:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Failed to read image at {CAMERA_IMAGE_PATH}"
-        )
 
-    # Run detection
-    result = detector.detect(image, confidence_threshold=threshold)
+@app.get("/detect/latest")
+async def detect_latest(
+    threshold: float = Query(
+        default=DEFAULT_CONFIDENCE_THRESHOLD,
+        ge=0.0,
+        le=1.0,
+        description="Minimum confidence threshold (0-1)"
+    ),
+    priority: Optional[str] = Header(
+        default=None, alias="X-Priority",
+        description="Admission class: critical (default), normal, low"
+    ),
+    deadline_ms: Optional[float] = Header(
+        default=None, alias="X-Deadline-Ms", gt=0,
+        description="Answer within this many ms or get 503 + Retry-After"
+    ),
+    roi: Optional[str] = Query(
+        default=None, description="Infer only on x1,y1,x2,y2 (normalized); default ROI_REGION"
+    ),
+    corridor: Optional[str] = Query(
+        default=None, description="ROI from the path ahead: half_width_m,range_m[,lateral_offset_m[,near_m]]"
+    ),
+):
+    """
+    Detect objects from camera's latest captured image.
 
-    # Log to database
-    _log_detections_to_db(
-        result["detections"],
-        result["processing_time_ms"],
-        image_path=str(CAMERA_IMAGE_PATH),
-    )
+    Reads from camera/images/latest.jpg directly.
+    Polled by agv-control VisionClient — admitted as "critical" by default,
+    ahead of uploads in the inference queue.
 
-    logger.info(
-        f"[latest] Detected {result['total_objects']} objects "
-        f"in {result['processing_time_ms']}ms"
-    )
+    Returns:
+        JSON with detections, processing_time_ms, total_objects
+    """
+    arrived_mono = time.monotonic()
+    priority, deadline_mono = _resolve_admission("critical", priority, deadline_ms, arrived_mono)
+    region = _resolve_roi(roi, corridor)
 
-    return result
+    # File read, precompute wait and inference are synchronous — off the event loop
+    return await run_in_threadpool(_detect_latest_frame, threshold, priority, deadline_mono, region)
 
 
 # ===========================================================================
 # Entry Point
 # ===========================================================================
-if __name__ == "__main__":
+def _bind_tcp_socket(config) -> socket.socket:
+    """
+    uvicorn's config.bind_socket() with TCP_NODELAY (inherited by accepted
+    connections). Pre-bound sockets have proto=0, so asyncio skips its usual
+    TCP_NODELAY — every response (headers, then body) would then wait ~40 ms
+    for the client's delayed ACK.
+    """
+    sock = config.bind_socket()
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    return sock
+
+
+def _bind_unix_socket(path: str) -> socket.socket:
+    """Bound AF_UNIX socket for uvicorn; replaces a stale socket file left by a crash."""
+    Path(path).unlink(missing_ok=True)
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.bind(path)
+    os.chmod(path, 0o660)  # owner + group only — no auth on this API
+    return sock
+
+
+def serve() -> None:
+    """
+    HTTP on HTTP_HOST:HTTP_PORT and HTTP_UDS_PATH — one server, one lifespan
+    (uvicorn.run listens on a single address). gRPC starts in the lifespan.
+    """
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    config = uvicorn.Config(app, host=HTTP_HOST, port=HTTP_PORT)
+    sockets = None
+    if HTTP_UDS_PATH is not None and hasattr(socket, "AF_UNIX"):
+        sockets = [_bind_tcp_socket(config), _bind_unix_socket(HTTP_UDS_PATH)]
+        logger.info(f"HTTP also on unix:{HTTP_UDS_PATH}")
+    try:
+        uvicorn.Server(config).run(sockets=sockets)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if sockets is not None:
+            Path(HTTP_UDS_PATH).unlink(missing_ok=True)
+
+
+if __name__ == "__main__":
+    serve()
@@ -0,0 +1,425 @@
+"""
+Vision AI Load Test — Saturation Curve
+=======================================
+Emulates N agv-control VisionClient instances against a local vision-ai
+server and reports throughput vs latency at each load step.
+
+Each emulated client behaves like AgvOrchestrator + VisionClient:
+- Polls GET /detect/latest every --poll-interval-ms (100ms control tick)
+- Waits for the response (HttpClient timeout = --timeout-ms), then sleeps
+  until the next tick; missed ticks are skipped, not queued
+
+Optional uploaders POST /detect at --upload-interval-ms each, emulating
+dashboards and test rigs that share the same inference capacity.
+
+Server modes:
+- Stub (default, no --url): starts app.py in-process with StubDetector, so no
+  weights or GPU are needed. --stub-latency-ms sets inference cost and
+  --stub-workers how many inferences may run at once (1 = one device).
+- --url http://host:port: targets an already-running server (real model)
+
+Usage:
+    python vision-ai/benchmarks/load_test.py --clients 1,2,4,8,16,32
+    python vision-ai/benchmarks/load_test.py --stub-latency-ms 80 --uploaders 2
+    python vision-ai/benchmarks/load_test.py --url http://127.0.0.1:8000 --csv out.csv
+"""
+
+import sys
+import csv
+import time
+import uuid
+import socket
+import logging
+import argparse
+import tempfile
+import threading
+import http.client
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import cv2
+import numpy as np
+
+# Allow `import app` from vision-ai/
+VISION_AI_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(VISION_AI_DIR))
+
+REPORT_COLUMNS = ["pollers", "uploaders", "kind", "offered_rps", "achieved_rps",
+                  "p50_ms", "p95_ms", "p99_ms", "max_ms", "error_rate", "timeout_rate"]
+
+logger = logging.getLogger("load-test")
+
+
+# ===========================================================================
+# StubDetector — drop-in for YoloDetector with configurable latency
+# ===========================================================================
+class StubDetector:
+    """
+    Fake YoloDetector: same detect() signature and result shape.
+
+    Args:
+        latency_ms: Time one inference takes
+        workers: Max concurrent inferences (emulates one GPU/CPU device)
+        busy: Spin the CPU instead of sleeping (emulates CPU-bound YOLO
+              holding a core; sleep emulates a GPU that releases the GIL)
+    """
+
+    def __init__(self, latency_ms: float = 50.0, workers: int = 1, busy: bool = False):
+        self.latency_ms = latency_ms
+        self.busy = busy
+        self.model_name = "stub"
+        self.model_version = f"stub-{latency_ms:g}ms"
+        self.input_size = 640
+        self.workers = workers
+        self._slots = threading.BoundedSemaphore(workers)
+
+    def _burn(self) -> None:
+        deadline = time.perf_counter() + self.latency_ms / 1000
+        if self.busy:
+            while time.perf_counter() < deadline:
+                pass
+        else:
+            time.sleep(max(0.0, deadline - time.perf_counter()))
+
+    def detect(self, image: np.ndarray, confidence_threshold: float = 0.5,
+               original_size: tuple[int, int] | None = None, trace=None, roi=None) -> dict:
+        start_time = time.perf_counter()
+        with self._slots:
+            self._burn()
+        elapsed_ms = (time.perf_counter() - start_time) * 1000
+
+        img_width, img_height = original_size or (image.shape[1], image.shape[0])
+        return {
+            "detections": [{
+                "object_class": "truck",
+                "confidence": 0.9,
+                "bbox": {"x1": 0.25, "y1": 0.4, "x2": 0.5, "y2": 0.8},
+                "bbox_pixels": {
+                    "x1": int(img_width * 0.25), "y1": int(img_height * 0.4),
+                    "x2": int(img_width * 0.5), "y2": int(img_height * 0.8),
+                },
+                "distance_meters": 0.87,
+            }],
+            "processing_time_ms": int(elapsed_ms),
+            "total_objects": 1,
+            "timing_ms": {"inference": round(elapsed_ms, 2), "postprocess": 0.0},
+        }
+
+
+# ===========================================================================
+# Local server — app.py in a background thread with StubDetector
+# ===========================================================================
+def _synthetic_jpeg(width: int = 640, height: int = 480) -> bytes:
+    """Encode a noisy synthetic frame (noise defeats trivial JPEG sizes)."""
+    rng = np.random.default_rng(0)
+    frame = rng.integers(0, 255, (height, width, 3), dtype=np.uint8)
+    ok, encoded = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, 90])
+    if not ok:
+        raise RuntimeError("cv2.imencode failed")
+    return encoded.tobytes()
+
+
+def start_stub_server(stub: StubDetector, image_bytes: bytes, port: int,
+                      keep_cache: bool = False, camera_image: Path | None = None,
+                      uds_path: str | None = None, grpc_addresses: tuple[str, ...] = (),
+                      frame_event_port: int | None = None):
+    """
+    Start vision-ai on 127.0.0.1:port with the stub detector.
+
+    HTTP is also served on uds_path if given; gRPC only on grpc_addresses
+    (none = off, so a stub never takes the production GRPC_ADDRESSES).
+    Frame events likewise: only on frame_event_port, else mtime polling.
+
+    Patches app.YoloDetector so lifespan builds the stub, points
+    CAMERA_IMAGE_PATH at a temp file holding image_bytes (or at
+    camera_image, written by a running camera_server), and disables DB
+    logging and (unless keep_cache) the result cache — otherwise every
+    poll of the unchanged latest.jpg would be a cache hit.
+
+    Returns:
+        (uvicorn.Server, thread)
+    """
+    import uvicorn
+    import app as vision_app
+
+    latest = camera_image
+    if latest is None:
+        latest = Path(tempfile.mkdtemp(prefix="vision-load-")) / "latest.jpg"
+        latest.write_bytes(image_bytes)
+
+    vision_app.YoloDetector = lambda *args, **kwargs: stub
+    vision_app.CAMERA_IMAGE_PATH = latest
+    vision_app.DB_AVAILABLE = False
+    vision_app.admission.concurrency = stub.workers  # admission slots = emulated device
+    vision_app.logger.setLevel(logging.WARNING)  # per-request INFO lines skew timing
+    vision_app.GRPC_ENABLED = bool(grpc_addresses)
+    vision_app.GRPC_ADDRESSES = grpc_addresses
+    vision_app.FRAME_EVENTS_ENABLED = frame_event_port is not None
+    if frame_event_port is not None:
+        vision_app.FRAME_EVENT_PORT = frame_event_port
+    if not keep_cache:
+        vision_app.result_cache.max_entries = 0
+
+    config = uvicorn.Config(vision_app.app, host="127.0.0.1", port=port,
+                            log_level="warning", access_log=False)
+    server = uvicorn.Server(config)
+    sockets = [vision_app._bind_tcp_socket(config)]
+    if uds_path is not None:
+        sockets.append(vision_app._bind_unix_socket(uds_path))
+    thread = threading.Thread(target=server.run, kwargs={"sockets": sockets},
+                              name="vision-ai-stub", daemon=True)
+    thread.start()
+
+    deadline = time.monotonic() + 30
+    while not server.started:
+        if time.monotonic() > deadline or not thread.is_alive():
+            raise RuntimeError("Stub vision-ai server failed to start")
+        time.sleep(0.05)
+    return server, thread
+
+
+# ===========================================================================
+# Emulated clients
+# ===========================================================================
+class StepStats:
+    """Thread-safe latency/outcome collector for one load step."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies_ms: dict[str, list[float]] = {}
+        self.errors: dict[str, int] = {}
+        self.timeouts: dict[str, int] = {}
+
+    def record(self, kind: str, outcome: str, latency_ms: float) -> None:
+        with self._lock:
+            if outcome == "ok":
+                self.latencies_ms.setdefault(kind, []).append(latency_ms)
+            elif outcome == "timeout":
+                self.timeouts[kind] = self.timeouts.get(kind, 0) + 1
+            else:
+                self.errors[kind] = self.errors.get(kind, 0) + 1
+
+
+class EmulatedClient(threading.Thread):
+    """
+    One VisionClient: fixed-interval requests over a keep-alive connection.
+
+    After each response the client sleeps until the next tick boundary,
+    so a slow server lowers the achieved rate instead of building a queue
+    (the same back-pressure the C# control loop applies).
+    """
+
+    def __init__(self, kind: str, host: str, port: int, interval_s: float,
+                 timeout_s: float, stats: StepStats, stop: threading.Event,
+                 body: bytes = b"", content_type: str = ""):
+        super().__init__(daemon=True, name=f"{kind}-client")
+        self.kind = kind
+        self.host = host
+        self.port = port
+        self.interval_s = interval_s
+        self.timeout_s = timeout_s
+        self.stats = stats
+        self.stop = stop
+        self.body = body
+        self.content_type = content_type
+        self._conn: http.client.HTTPConnection | None = None
+
+    def _request(self) -> int:
+        if self._conn is None:
+            self._conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout_s)
+        if self.kind == "latest":
+            self._conn.request("GET", "/detect/latest")
+        else:
+            self._conn.request("POST", "/detect", body=self.body,
+                               headers={"Content-Type": self.content_type})
+        response = self._conn.getresponse()
+        response.read()
+        return response.status
+
+    def run(self) -> None:
+        # Spread clients across the tick so they do not fire in lockstep
+        next_tick = time.perf_counter() + np.random.uniform(0, self.interval_s)
+        while not self.stop.is_set():
+            delay = next_tick - time.perf_counter()
+            if delay > 0 and self.stop.wait(delay):
+                break
+
+            start_time = time.perf_counter()
+            try:
+                status = self._request()
+                outcome = "ok" if status == 200 else "error"
+            except (socket.timeout, TimeoutError):
+                outcome = "timeout"
+                self._reset()
+            except (OSError, http.client.HTTPException):
+                outcome = "error"
+                self._reset()
+            self.stats.record(self.kind, outcome, (time.perf_counter() - start_time) * 1000)
+
+            # Skip ticks that were missed while waiting
+            now = time.perf_counter()
+            next_tick += self.interval_s
+            if next_tick < now:
+                next_tick += ((now - next_tick) // self.interval_s + 1) * self.interval_s
+
+        self._reset()
+
+    def _reset(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+def _multipart_body(image_bytes: bytes) -> tuple[bytes, str]:
+    """Build a multipart/form-data body with one 'file' part."""
+    boundary = uuid.uuid4().hex
+    body = (
+        f"--{boundary}\r\n"
+        f'Content-Disposition: form-data; name="file"; filename="load.jpg"\r\n'
+        f"Content-Type: image/jpeg\r\n\r\n"
+    ).encode() + image_bytes + f"\r\n--{boundary}--\r\n".encode()
+    return body, f"multipart/form-data; boundary={boundary}"
+
+
+# ===========================================================================
+# Load steps and report
+# ===========================================================================
+def _percentile(values: list[float], q: float) -> float:
+    return float(np.percentile(values, q)) if values else float("nan")
+
+
+def run_step(host: str, port: int, pollers: int, uploaders: int, args,
+             upload_body: bytes, upload_type: str) -> list[dict]:
+    """Run one load step and return one row per request kind + total."""
+    stats = StepStats()
+    stop = threading.Event()
+    timeout_s = args.timeout_ms / 1000
+
+    clients = [
+        EmulatedClient("latest", host, port, args.poll_interval_ms / 1000,
+                       timeout_s, stats, stop)
+        for _ in range(pollers)
+    ] + [
+        EmulatedClient("upload", host, port, args.upload_interval_ms / 1000,
+                       timeout_s, stats, stop, upload_body, upload_type)
+        for _ in range(uploaders)
+    ]
+    for client in clients:
+        client.start()
+    time.sleep(args.step_duration_s)
+    stop.set()
+    for client in clients:
+        client.join(timeout=timeout_s + 1)
+
+    offered = {
+        "latest": pollers * 1000 / args.poll_interval_ms,
+        "upload": uploaders * 1000 / args.upload_interval_ms,
+    }
+    rows = []
+    for kind in ("latest", "upload", "total"):
+        kinds = ("latest", "upload") if kind == "total" else (kind,)
+        latencies = [v for k in kinds for v in stats.latencies_ms.get(k, [])]
+        errors = sum(stats.errors.get(k, 0) for k in kinds)
+        timeouts = sum(stats.timeouts.get(k, 0) for k in kinds)
+        attempts = len(latencies) + errors + timeouts
+        if attempts == 0:
+            continue
+        rows.append({
+            "pollers": pollers,
+            "uploaders": uploaders,
+            "kind": kind,
+            "offered_rps": round(sum(offered[k] for k in kinds), 1),
+            "achieved_rps": round(len(latencies) / args.step_duration_s, 1),
+            "p50_ms": round(_percentile(latencies, 50), 1),
+            "p95_ms": round(_percentile(latencies, 95), 1),
+            "p99_ms": round(_percentile(latencies, 99), 1),
+            "max_ms": round(max(latencies), 1) if latencies else float("nan"),
+            "error_rate": round(errors / attempts, 4),
+            "timeout_rate": round(timeouts / attempts, 4),
+        })
+    return rows
+
+
+def print_report(rows: list[dict]) -> None:
+    """Print the saturation curve and flag the first saturated step."""
+    print()
+    print("  ".join(f"{c:>12}" for c in REPORT_COLUMNS))
+    for row in rows:
+        print("  ".join(f"{row[c]:>12}" for c in REPORT_COLUMNS))
+
+    # Saturated = server no longer keeps up with offered load or times out
+    for row in rows:
+        if row["kind"] != "total":
+            continue
+        if (row["achieved_rps"] < 0.9 * row["offered_rps"]
+                or row["timeout_rate"] > 0.01 or row["error_rate"] > 0.01):
+            print(f"\nSaturation at {row['pollers']} pollers + {row['uploaders']} uploaders: "
+                  f"{row['achieved_rps']}/{row['offered_rps']} req/s, p99={row['p99_ms']}ms, "
+                  f"timeouts={row['timeout_rate']:.1%}")
+            return
+    print("\nNo saturation within tested load steps")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Vision AI load test (saturation curve)")
+    parser.add_argument("--url", help="Target an existing server instead of the stub")
+    parser.add_argument("--port", type=int, default=8765, help="Port for the stub server")
+    parser.add_argument("--clients", default="1,2,4,8,16,32",
+                        help="Comma-separated poller counts, one load step each")
+    parser.add_argument("--uploaders", type=int, default=0,
+                        help="POST /detect clients per step")
+    parser.add_argument("--poll-interval-ms", type=float, default=100.0)
+    parser.add_argument("--upload-interval-ms", type=float, default=500.0)
+    parser.add_argument("--timeout-ms", type=float, default=2000.0,
+                        help="Client timeout (VisionAiSettings.TimeoutMs)")
+    parser.add_argument("--step-duration-s", type=float, default=10.0)
+    parser.add_argument("--stub-latency-ms", type=float, default=50.0)
+    parser.add_argument("--stub-workers", type=int, default=1)
+    parser.add_argument("--stub-busy", action="store_true",
+                        help="Stub spins the CPU instead of sleeping")
+    parser.add_argument("--keep-cache", action="store_true",
+                        help="Leave the result cache enabled on the stub server")
+    parser.add_argument("--csv", type=Path, help="Write rows to this CSV file")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
+    image_bytes = _synthetic_jpeg()
+    upload_body, upload_type = _multipart_body(image_bytes)
+
+    server = None
+    if args.url:
+        target = urlsplit(args.url)
+        host, port = target.hostname, target.port or 80
+        logger.info(f"Target: {args.url}")
+    else:
+        host, port = "127.0.0.1", args.port
+        stub = StubDetector(args.stub_latency_ms, args.stub_workers, args.stub_busy)
+        server, _ = start_stub_server(stub, image_bytes, port, args.keep_cache)
+        logger.info(f"Stub server on {host}:{port} "
+                    f"(latency={args.stub_latency_ms}ms, workers={args.stub_workers})")
+
+    rows = []
+    try:
+        for pollers in (int(n) for n in args.clients.split(",")):
+            logger.info(f"Step: {pollers} pollers, {args.uploaders} uploaders, "
+                        f"{args.step_duration_s}s")
+            rows.extend(run_step(host, port, pollers, args.uploaders, args,
+                                 upload_body, upload_type))
+    finally:
+        if server is not None:
+            server.should_exit = True
+
+    print_report(rows)
+
+    if args.csv:
+        with args.csv.open("w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=REPORT_COLUMNS)  # header only if no requests completed
+            writer.writeheader()
+            writer.writerows(rows)
+        logger.info(f"Wrote {args.csv}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,157 @@
+"""
+ROI Inference Benchmark — Speedup vs Full Frame
+===============================================
+Measures what region-of-interest inference buys on this machine and model:
+the same frames are detected full-frame and with the ROI, alternating, and
+the report shows latency, speedup, fraction of the frame skipped, and how
+many full-frame detections inside the ROI the crop still finds.
+
+The per-response `roi.estimated_speedup` is a pixel-count estimate; this
+script measures the real one (fixed-shape exported models, e.g. static
+ONNX, gain nothing from a smaller imgsz — check here before relying on it).
+
+Usage (from the repository root):
+    python vision-ai/benchmarks/roi_benchmark.py --roi 0,0.35,1,1
+    python vision-ai/benchmarks/roi_benchmark.py --corridor 0.4,3 --images recordings/run1/
+    python vision-ai/benchmarks/roi_benchmark.py --roi 0.2,0.4,0.8,1 --model vision-ai/best.pt --runs 200
+"""
+
+import sys
+import time
+import logging
+import argparse
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+VISION_AI_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(VISION_AI_DIR))
+
+import app as vision_app
+from app import YoloDetector, CorridorProjector, CameraCalibration
+
+IMAGE_SUFFIXES = (".jpg", ".jpeg", ".png", ".bmp")
+MATCH_IOU = 0.5
+
+logger = logging.getLogger("roi-benchmark")
+
+
+def load_frames(images: Path | None, limit: int) -> list[np.ndarray]:
+    """Frames from a directory, a single image, or camera/images/latest.jpg."""
+    source = images or vision_app.CAMERA_IMAGE_PATH
+    paths = (sorted(p for p in source.iterdir() if p.suffix.lower() in IMAGE_SUFFIXES)
+             if source.is_dir() else [source])
+    frames = [cv2.imread(str(path)) for path in paths[:limit]]
+    frames = [frame for frame in frames if frame is not None]
+    if not frames:
+        raise FileNotFoundError(f"No readable images at {source}")
+    return frames
+
+
+def _iou(a: dict, b: dict) -> float:
+    x1, y1 = max(a["x1"], b["x1"]), max(a["y1"], b["y1"])
+    x2, y2 = min(a["x2"], b["x2"]), min(a["y2"], b["y2"])
+    inter = max(0, x2 - x1) * max(0, y2 - y1)
+    area_a = (a["x2"] - a["x1"]) * (a["y2"] - a["y1"])
+    area_b = (b["x2"] - b["x1"]) * (b["y2"] - b["y1"])
+    return inter / (area_a + area_b - inter) if inter else 0.0
+
+
+def agreement(full: list[dict], cropped: list[dict], roi: tuple) -> tuple[int, int]:
+    """
+    (matched, expected): full-frame detections whose box centre lies in the
+    ROI, and how many of those the ROI run found (same class, IoU >= 0.5).
+    """
+    expected = matched = 0
+    for det in full:
+        box = det["bbox"]
+        cx, cy = (box["x1"] + box["x2"]) / 2, (box["y1"] + box["y2"]) / 2
+        if not (roi[0] <= cx <= roi[2] and roi[1] <= cy <= roi[3]):
+            continue
+        expected += 1
+        matched += any(other["object_class"] == det["object_class"]
+                       and _iou(box, other["bbox"]) >= MATCH_IOU for other in cropped)
+    return matched, expected
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark ROI inference against full-frame")
+    region = parser.add_mutually_exclusive_group(required=True)
+    region.add_argument("--roi", help="Normalized x1,y1,x2,y2")
+    region.add_argument("--corridor", help="half_width_m,range_m[,lateral_offset_m[,near_m]] (CorridorProjector)")
+    parser.add_argument("--images", type=Path, help="Image directory or file (default: latest.jpg)")
+    parser.add_argument("--model", type=Path, default=vision_app.MODEL_NAME)
+    parser.add_argument("--limit", type=int, default=50, help="Max images to load")
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--runs", type=int, default=100, help="Timed runs per mode")
+    parser.add_argument("--threshold", type=float, default=vision_app.DEFAULT_CONFIDENCE_THRESHOLD)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    vision_app.logger.setLevel(logging.WARNING)
+
+    calibration = CameraCalibration.load(vision_app.CALIBRATION_PATH)
+    if args.roi:
+        roi = tuple(float(v) for v in args.roi.split(","))
+    else:
+        roi = CorridorProjector.from_calibration(calibration).project(
+            *(float(v) for v in args.corridor.split(","))
+        )
+        if roi is None:
+            logger.error("Corridor is not in view with the configured camera mounting")
+            return 1
+        logger.info(f"Corridor {args.corridor} → ROI {roi}")
+
+    frames = load_frames(args.images, args.limit)
+    detector = YoloDetector(args.model, calibration=calibration)
+    logger.info(f"{len(frames)} frames, model {detector.model_version}, ROI {roi}")
+
+    for index in range(args.warmup):
+        frame = frames[index % len(frames)]
+        detector.detect(frame, args.threshold)
+        detector.detect(frame, args.threshold, roi=roi)
+
+    # Alternate modes per frame so thermal/turbo drift hits both equally
+    latencies = {"full": [], "roi": []}
+    matched = expected = 0
+    report = None
+    for index in range(args.runs):
+        frame = frames[index % len(frames)]
+        start_time = time.perf_counter()
+        full = detector.detect(frame, args.threshold)
+        latencies["full"].append((time.perf_counter() - start_time) * 1000)
+
+        start_time = time.perf_counter()
+        cropped = detector.detect(frame, args.threshold, roi=roi)
+        latencies["roi"].append((time.perf_counter() - start_time) * 1000)
+
+        report = cropped["roi"]
+        hit, total = agreement(full["detections"], cropped["detections"], roi)
+        matched += hit
+        expected += total
+
+    p50 = {mode: float(np.percentile(values, 50)) for mode, values in latencies.items()}
+    p95 = {mode: float(np.percentile(values, 95)) for mode, values in latencies.items()}
+    print()
+    print(f"{'mode':>6}  {'p50_ms':>8}  {'p95_ms':>8}")
+    for mode in ("full", "roi"):
+        print(f"{mode:>6}  {p50[mode]:>8.1f}  {p95[mode]:>8.1f}")
+    # Tiled mode reports no imgsz / estimate: the ROI only limits the tiles
+    imgsz = report.get("imgsz")
+    print(f"\nROI {report['region']}: {report['skipped_fraction']:.0%} of the frame skipped"
+          + (f", imgsz {imgsz}" if imgsz is not None else " (tiled)"))
+    speedup = f"Speedup (p50): {p50['full'] / p50['roi']:.2f}x measured"
+    if report.get("estimated_speedup") is not None:
+        speedup += f", {report['estimated_speedup']:.2f}x estimated from input pixels"
+    print(speedup)
+    if expected:
+        print(f"Full-frame detections inside the ROI found by ROI inference: "
+              f"{matched}/{expected} ({matched / expected:.1%})")
+    else:
+        print("No full-frame detections inside the ROI to compare")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,473 @@
+"""
+Vision AI Soak Test — Memory / Leak Check
+==========================================
+Runs camera_server and vision-ai as child processes for hours on synthetic
+frames and fails if memory, file descriptors or threads keep growing.
+
+Pipeline under test (the production one, in a temp work dir):
+    camera_server --replay synthetic frames --loop → <work dir>/camera/latest.jpg
+        → UDP frame event → vision-ai precompute → GET /detect/latest pollers
+    + optional uploaders on POST /detect
+The live camera/images/latest.jpg and the production FRAME_EVENT_PORT are
+never touched: camera_server gets --output-dir / --notify-port, and
+vision-ai reads that file and listens on that (free) port.
+
+Every --sample-interval-s, per process (common/process_metrics.py):
+- RSS, open file descriptors, thread count
+Every --tracemalloc-every samples, for vision-ai (GET /debug/memory):
+- Top Python allocation sites grown since the end of warm-up
+
+Pass/fail — baseline = median of the first 3 samples after --warmup-s
+(model buffers, caches, pools and the recent-detections ring fill up first):
+- RSS grew more than --max-rss-growth-mb (median of the last 3 samples), or
+  the RSS trend (least squares) exceeds --max-rss-slope-mb-h over a
+  post-warm-up span of at least SLOPE_MIN_SPAN_S
+- Open FDs or threads grew more than --max-fd-growth / --max-thread-growth
+- Request error+timeout rate above --max-error-rate
+- A child process exited
+
+vision-ai modes:
+- Stub (default): app.py with load_test.StubDetector — no weights needed,
+  everything but the model is exercised
+- --real-model: app.py with the configured MODEL_NAME (gRPC off)
+- --url + --pid: an already-running server (sampled by PID); it reads its
+  own camera, so camera_server is not started
+
+Usage:
+    python vision-ai/benchmarks/soak_test.py --duration-h 4
+    python vision-ai/benchmarks/soak_test.py --duration-h 0.25 --warmup-s 120 --csv soak.csv
+    python vision-ai/benchmarks/soak_test.py --url http://127.0.0.1:8000 --pid 4242 --no-camera
+"""
+
+import sys
+import csv
+import json
+import time
+import socket
+import logging
+import argparse
+import tempfile
+import threading
+import subprocess
+import http.client
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import cv2
+import numpy as np
+
+VISION_AI_DIR = Path(__file__).resolve().parent.parent
+PROJECT_ROOT = VISION_AI_DIR.parent
+sys.path.insert(0, str(VISION_AI_DIR))
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from common.process_metrics import sample_process
+from load_test import (StubDetector, StepStats, EmulatedClient, start_stub_server,
+                       _synthetic_jpeg, _multipart_body, _percentile)
+
+CAMERA_SERVER = PROJECT_ROOT / "camera" / "camera_server.py"
+HOST = "127.0.0.1"
+SYNTHETIC_FRAME_COUNT = 60       # distinct replay frames (looped)
+BASELINE_SAMPLES = 3             # median of N samples = baseline / final value
+SLOPE_MIN_SPAN_S = 1800.0        # shorter runs: growth check only (slope too noisy)
+STARTUP_TIMEOUT_S = 120.0        # real model load can take a while
+TOP_ALLOCATORS = 10
+
+logger = logging.getLogger("soak-test")
+
+
+# ===========================================================================
+# Synthetic frames + child processes
+# ===========================================================================
+def write_synthetic_frames(directory: Path, count: int = SYNTHETIC_FRAME_COUNT) -> None:
+    """Noise background + a moving box, so consecutive frames differ."""
+    rng = np.random.default_rng(0)
+    background = rng.integers(0, 255, (480, 640, 3), dtype=np.uint8)
+    for index in range(count):
+        frame = background.copy()
+        x = 40 + (index * 9) % 480
+        cv2.rectangle(frame, (x, 200), (x + 120, 420), (30, 140, 220), -1)
+        cv2.imwrite(str(directory / f"frame_{index:04d}.jpg"), frame)
+
+
+class ChildProcess:
+    """One server under test: started with its output in a log file, stopped at the end."""
+
+    def __init__(self, name: str, command: list[str], cwd: Path, log_dir: Path):
+        self.name = name
+        self.command = command
+        self.cwd = cwd
+        self.log_path = log_dir / f"{name}.log"
+        self._log_file = None
+        self.process: subprocess.Popen | None = None
+
+    @property
+    def pid(self) -> int:
+        return self.process.pid
+
+    def start(self) -> None:
+        self._log_file = self.log_path.open("wb")
+        self.process = subprocess.Popen(self.command, cwd=self.cwd,
+                                        stdout=self._log_file, stderr=subprocess.STDOUT)
+        logger.info(f"Started {self.name} (pid {self.pid}), log: {self.log_path}")
+
+    def alive(self) -> bool:
+        return self.process is not None and self.process.poll() is None
+
+    def stop(self, timeout_s: float = 10.0) -> None:
+        if self.alive():
+            self.process.terminate()
+            try:
+                self.process.wait(timeout_s)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+        if self._log_file is not None:
+            self._log_file.close()
+
+
+def free_udp_port() -> int:
+    """A currently unused localhost UDP port (for the frame events of this run)."""
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        sock.bind((HOST, 0))
+        return sock.getsockname()[1]
+
+
+def serve_stub(args) -> int:
+    """Child mode (--serve-stub): vision-ai with StubDetector on the soak's latest.jpg."""
+    logging.basicConfig(level=logging.WARNING)
+    stub = StubDetector(args.stub_latency_ms, args.stub_workers)
+    _, thread = start_stub_server(stub, _synthetic_jpeg(), args.port, keep_cache=True,
+                                  camera_image=args.camera_image,
+                                  frame_event_port=args.frame_event_port)
+    thread.join()
+    return 0
+
+
+def serve_app(args) -> int:
+    """Child mode (--serve-app): vision-ai with the real model on the soak's latest.jpg."""
+    import uvicorn
+    import app as vision_app
+
+    vision_app.CAMERA_IMAGE_PATH = args.camera_image
+    vision_app.FRAME_EVENT_PORT = args.frame_event_port
+    vision_app.GRPC_ENABLED = False  # never take the production GRPC_ADDRESSES
+    uvicorn.run(vision_app.app, host=HOST, port=args.port, log_level="warning", access_log=False)
+    return 0
+
+
+def wait_until_ready(host: str, port: int, timeout_s: float = STARTUP_TIMEOUT_S) -> None:
+    """Poll GET /health until the server answers 200."""
+    deadline = time.monotonic() + timeout_s
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection(host, port, timeout=2)
+            conn.request("GET", "/health")
+            if conn.getresponse().status == 200:
+                conn.close()
+                return
+        except OSError:
+            pass
+        time.sleep(0.5)
+    raise RuntimeError(f"vision-ai not ready on {host}:{port} after {timeout_s:.0f}s")
+
+
+def get_memory_debug(host: str, port: int, reset: bool = False) -> dict | None:
+    """GET /debug/memory (first call starts tracemalloc on the server)."""
+    try:
+        conn = http.client.HTTPConnection(host, port, timeout=30)
+        conn.request("GET", f"/debug/memory?top={TOP_ALLOCATORS}&reset={str(reset).lower()}")
+        response = conn.getresponse()
+        body = response.read()
+        conn.close()
+        return json.loads(body) if response.status == 200 else None
+    except (OSError, ValueError) as e:
+        logger.warning(f"GET /debug/memory failed: {e}")
+        return None
+
+
+# ===========================================================================
+# Evaluation — growth after warm-up
+# ===========================================================================
+def _mb(value: int | None) -> float | None:
+    return round(value / 2**20, 1) if value is not None else None
+
+
+def evaluate(samples: list[dict], warmup_s: float, args) -> tuple[list[dict], list[str]]:
+    """
+    Per-process summary rows + failure messages (empty = pass).
+
+    Args:
+        samples: Rows {process, t_s, rss_mb, open_fds, threads}
+    """
+    summary, failures = [], []
+    for name in dict.fromkeys(sample["process"] for sample in samples):
+        rows = [s for s in samples if s["process"] == name and s["t_s"] >= warmup_s]
+        if len(rows) < 2 * BASELINE_SAMPLES:
+            failures.append(f"{name}: only {len(rows)} samples after warm-up — run longer")
+            continue
+
+        row = {"process": name, "samples": len(rows)}
+        for metric, limit in (("rss_mb", args.max_rss_growth_mb),
+                              ("open_fds", args.max_fd_growth),
+                              ("threads", args.max_thread_growth)):
+            values = [r[metric] for r in rows if r[metric] is not None]
+            if len(values) < 2 * BASELINE_SAMPLES:
+                row[f"{metric}_growth"] = None
+                continue
+            baseline = float(np.median(values[:BASELINE_SAMPLES]))
+            final = float(np.median(values[-BASELINE_SAMPLES:]))
+            growth = round(final - baseline, 1)
+            row[f"{metric}_baseline"] = round(baseline, 1)
+            row[f"{metric}_final"] = round(final, 1)
+            row[f"{metric}_max"] = max(values)
+            row[f"{metric}_growth"] = growth
+            if growth > limit:
+                failures.append(f"{name}: {metric} grew {growth:g} (limit {limit:g}) "
+                                f"from {baseline:g} to {final:g}")
+
+        # Trend: steady creep that a short run or a GC-noisy median can hide
+        rss = [(r["t_s"], r["rss_mb"]) for r in rows if r["rss_mb"] is not None]
+        row["rss_slope_mb_h"] = None
+        if len(rss) >= 2 * BASELINE_SAMPLES and rss[-1][0] - rss[0][0] >= SLOPE_MIN_SPAN_S:
+            t_h = np.array([t for t, _ in rss]) / 3600
+            slope = float(np.polyfit(t_h, [v for _, v in rss], 1)[0])
+            row["rss_slope_mb_h"] = round(slope, 2)
+            if slope > args.max_rss_slope_mb_h:
+                failures.append(f"{name}: RSS trend {slope:.2f} MB/h "
+                                f"(limit {args.max_rss_slope_mb_h:g} MB/h)")
+        summary.append(row)
+    return summary, failures
+
+
+def print_report(summary: list[dict], stats: StepStats, elapsed_s: float,
+                 allocators: dict | None, failures: list[str]) -> None:
+    print()
+    columns = ["process", "samples", "rss_mb_baseline", "rss_mb_final", "rss_mb_max",
+               "rss_mb_growth", "rss_slope_mb_h", "open_fds_baseline", "open_fds_final",
+               "threads_baseline", "threads_final"]
+    print("  ".join(f"{c:>17}" for c in columns))
+    for row in summary:
+        print("  ".join(f"{str(row.get(c, '')):>17}" for c in columns))
+
+    print(f"\nRequests over {elapsed_s / 3600:.2f} h:")
+    for kind, latencies in stats.latencies_ms.items():
+        print(f"  {kind:>7}: ok={len(latencies)} errors={stats.errors.get(kind, 0)} "
+              f"timeouts={stats.timeouts.get(kind, 0)} "
+              f"p50={_percentile(latencies, 50):.1f}ms p99={_percentile(latencies, 99):.1f}ms")
+
+    if allocators and allocators.get("top"):
+        print(f"\nvision-ai top allocators since warm-up "
+              f"({allocators['baseline_age_s']:.0f}s, traced {allocators['traced_mb']} MB):")
+        for entry in allocators["top"]:
+            print(f"  {entry['size_diff_kb']:>+10.1f} KB  {entry['count_diff']:>+8}  "
+                  f"{entry['location']}")
+
+    if failures:
+        print("\nFAIL")
+        for failure in failures:
+            print(f"  - {failure}")
+    else:
+        print("\nPASS — no growth beyond thresholds")
+
+
+# ===========================================================================
+# Main loop
+# ===========================================================================
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Soak test: memory/FD/thread growth over hours")
+    parser.add_argument("--duration-h", type=float, default=4.0)
+    parser.add_argument("--warmup-s", type=float, default=600.0,
+                        help="Samples before this are excluded from the baseline")
+    parser.add_argument("--sample-interval-s", type=float, default=30.0)
+    parser.add_argument("--tracemalloc-every", type=int, default=10,
+                        help="Fetch vision-ai top allocators every N samples (0 = off)")
+    parser.add_argument("--max-rss-growth-mb", type=float, default=50.0)
+    parser.add_argument("--max-rss-slope-mb-h", type=float, default=5.0)
+    parser.add_argument("--max-fd-growth", type=float, default=10)
+    parser.add_argument("--max-thread-growth", type=float, default=5)
+    parser.add_argument("--max-error-rate", type=float, default=0.01)
+    parser.add_argument("--pollers", type=int, default=2, help="GET /detect/latest clients")
+    parser.add_argument("--uploaders", type=int, default=1, help="POST /detect clients")
+    parser.add_argument("--poll-interval-ms", type=float, default=100.0)
+    parser.add_argument("--upload-interval-ms", type=float, default=1000.0)
+    parser.add_argument("--timeout-ms", type=float, default=2000.0)
+    parser.add_argument("--camera-fps", type=float, default=10.0)
+    parser.add_argument("--no-camera", action="store_true",
+                        help="Do not start camera_server (pollers re-read the same frame)")
+    parser.add_argument("--real-model", action="store_true",
+                        help="Run app.py with the real model instead of the stub")
+    parser.add_argument("--url", help="Soak an already-running vision-ai")
+    parser.add_argument("--pid", type=int, help="PID of the --url server (for RSS/FD/threads)")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--stub-latency-ms", type=float, default=30.0)
+    parser.add_argument("--stub-workers", type=int, default=1)
+    parser.add_argument("--log-dir", type=Path, help="Child logs (default: temp dir)")
+    parser.add_argument("--csv", type=Path, help="Write all samples to this CSV file")
+    parser.add_argument("--serve-stub", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--serve-app", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--camera-image", type=Path, help=argparse.SUPPRESS)
+    parser.add_argument("--frame-event-port", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve_stub:
+        return serve_stub(args)
+    if args.serve_app:
+        return serve_app(args)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    work_dir = Path(tempfile.mkdtemp(prefix="vision-soak-"))
+    log_dir = args.log_dir or work_dir
+    log_dir.mkdir(parents=True, exist_ok=True)
+
+    # Camera output + frame events stay inside this run
+    camera_dir = work_dir / "camera"
+    camera_dir.mkdir()
+    camera_image = camera_dir / "latest.jpg"
+    frame_event_port = free_udp_port()
+
+    children: list[ChildProcess] = []
+    if args.url:
+        if not args.no_camera:
+            logger.info("--url: camera_server not started (the server reads its own camera)")
+    elif args.no_camera:
+        camera_image.write_bytes(_synthetic_jpeg())
+    else:
+        frames_dir = work_dir / "frames"
+        frames_dir.mkdir()
+        write_synthetic_frames(frames_dir)
+        children.append(ChildProcess(
+            "camera_server",
+            [sys.executable, str(CAMERA_SERVER), "--replay", str(frames_dir),
+             "--pace", "fps", "--fps", str(args.camera_fps), "--loop",
+             "--output-dir", str(camera_dir), "--notify-port", str(frame_event_port)],
+            PROJECT_ROOT, log_dir,
+        ))
+
+    if args.url:
+        target = urlsplit(args.url)
+        host, port = target.hostname, target.port or 80
+    else:
+        host, port = HOST, args.port
+        command = [sys.executable, str(Path(__file__).resolve()),
+                   "--serve-app" if args.real_model else "--serve-stub",
+                   "--port", str(port), "--camera-image", str(camera_image),
+                   "--frame-event-port", str(frame_event_port)]
+        if not args.real_model:
+            command += ["--stub-latency-ms", str(args.stub_latency_ms),
+                        "--stub-workers", str(args.stub_workers)]
+        children.append(ChildProcess("vision-ai", command, VISION_AI_DIR, log_dir))
+
+    sampled: dict[str, int] = {}  # process name → pid
+    stats = StepStats()
+    stop = threading.Event()
+    samples: list[dict] = []
+    failures: list[str] = []
+    allocators = None
+    baseline_reset = False
+    started_at = time.monotonic()
+
+    try:
+        for child in children:
+            child.start()
+            sampled[child.name] = child.pid
+        if args.url and args.pid:
+            sampled["vision-ai"] = args.pid
+        wait_until_ready(host, port)
+
+        # Same bytes every time: exercises multipart parsing and the result cache
+        upload_body, upload_type = _multipart_body(_synthetic_jpeg())
+        timeout_s = args.timeout_ms / 1000
+        clients = [
+            EmulatedClient("latest", host, port, args.poll_interval_ms / 1000, timeout_s, stats, stop)
+            for _ in range(args.pollers)
+        ] + [
+            EmulatedClient("upload", host, port, args.upload_interval_ms / 1000, timeout_s,
+                           stats, stop, upload_body, upload_type)
+            for _ in range(args.uploaders)
+        ]
+        for client in clients:
+            client.start()
+
+        if args.tracemalloc_every:
+            get_memory_debug(host, port)  # start tracing now: its overhead lands in warm-up
+
+        duration_s = args.duration_h * 3600
+        sample_index = 0
+        started_at = time.monotonic()
+        logger.info(f"Soaking for {args.duration_h:g} h (warm-up {args.warmup_s:g}s), "
+                    f"sampling {', '.join(sampled)} every {args.sample_interval_s:g}s")
+
+        while time.monotonic() - started_at < duration_s:
+            time.sleep(args.sample_interval_s)
+            t_s = round(time.monotonic() - started_at, 1)
+
+            dead = [child.name for child in children if not child.alive()]
+            if dead:
+                failures.append(f"{', '.join(dead)} exited during the soak (see {log_dir})")
+                break
+
+            lost = False
+            for name, pid in sampled.items():
+                try:
+                    metrics = sample_process(pid)
+                except ProcessLookupError:
+                    failures.append(f"{name} (pid {pid}) disappeared")
+                    lost = True
+                    continue
+                samples.append({"process": name, "t_s": t_s,
+                                "rss_mb": _mb(metrics["rss_bytes"]),
+                                "open_fds": metrics["open_fds"],
+                                "threads": metrics["threads"]})
+            if lost:
+                break
+
+            sample_index += 1
+            if args.tracemalloc_every:
+                if not baseline_reset and t_s >= args.warmup_s:
+                    get_memory_debug(host, port, reset=True)  # allocators diffed from here
+                    baseline_reset = True
+                elif baseline_reset and sample_index % args.tracemalloc_every == 0:
+                    allocators = get_memory_debug(host, port) or allocators
+                    if allocators and allocators.get("top"):
+                        top = allocators["top"][0]
+                        logger.info(f"Top allocator: {top['size_diff_kb']:+.1f} KB {top['location']}")
+
+            latest = {s["process"]: s for s in samples if s["t_s"] == t_s}
+            logger.info(f"t={t_s / 60:.1f} min " + "  ".join(
+                f"{name}: rss={s['rss_mb']}MB fds={s['open_fds']} threads={s['threads']}"
+                for name, s in latest.items()))
+    except KeyboardInterrupt:
+        logger.info("Interrupted — evaluating samples collected so far")
+    finally:
+        stop.set()
+        vision_alive = args.url or any(c.alive() for c in children if c.name == "vision-ai")
+        if args.tracemalloc_every and vision_alive and baseline_reset:
+            allocators = get_memory_debug(host, port) or allocators
+        for child in children:
+            child.stop()
+
+    elapsed_s = time.monotonic() - started_at
+    summary, growth_failures = evaluate(samples, args.warmup_s, args)
+    failures.extend(growth_failures)
+
+    attempts = sum(len(v) for v in stats.latencies_ms.values()) \
+        + sum(stats.errors.values()) + sum(stats.timeouts.values())
+    failed = sum(stats.errors.values()) + sum(stats.timeouts.values())
+    if attempts and failed / attempts > args.max_error_rate:
+        failures.append(f"request error+timeout rate {failed / attempts:.2%} "
+                        f"(limit {args.max_error_rate:.2%})")
+
+    print_report(summary, stats, elapsed_s, allocators, failures)
+
+    if args.csv and samples:
+        with args.csv.open("w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(samples[0].keys()))
+            writer.writeheader()
+            writer.writerows(samples)
+        logger.info(f"Wrote {args.csv}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
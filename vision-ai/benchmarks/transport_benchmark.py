@@ -0,0 +1,288 @@
+"""
+Transport Benchmark — HTTP vs Unix Socket vs gRPC Round Trip
+============================================================
+Round-trip latency for one co-located client over each transport. The
+client follows agv-control's pattern: sequential requests on one
+kept-alive connection.
+
+    http-tcp      HTTP/1.1 + JSON on 127.0.0.1 (current path)
+    http-uds      same API on a Unix domain socket (HTTP_UDS_PATH)
+    grpc-tcp      gRPC unary on 127.0.0.1
+    grpc-uds      gRPC unary on a Unix domain socket
+    grpc-stream   upload only: DetectStream, frames on one bidi stream
+
+Workloads:
+    latest   GET /detect/latest  vs  DetectLatest   (tiny request, ~1 KB result)
+    upload   POST /detect/raw    vs  Detect          (640×480 JPEG, --bgr = raw 0.9 MB)
+
+vision-ai runs as a child process with load_test.StubDetector and the
+result cache on, so after the first request the server side is a cache
+hit. What is left is transport + (de)serialization, which is the part
+that differs. Client-side parsing (json.loads / protobuf) is included,
+since a real client pays it too. Modes are interleaved per request so
+that drift hits all of them equally.
+
+Push (StreamLatest) is not in the table: it removes the wait for the next
+poll (up to one 100 ms control tick), not round-trip time.
+
+Usage (from the repository root, Linux/macOS):
+    python vision-ai/benchmarks/transport_benchmark.py
+    python vision-ai/benchmarks/transport_benchmark.py --workload upload --bgr --requests 2000
+"""
+
+import sys
+import json
+import time
+import queue
+import socket
+import logging
+import argparse
+import tempfile
+import http.client
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+VISION_AI_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(VISION_AI_DIR))
+
+from load_test import StubDetector, start_stub_server, _synthetic_jpeg, _percentile
+from soak_test import ChildProcess, wait_until_ready
+
+try:
+    import grpc
+    from grpc_transport import vision_pb2, vision_pb2_grpc
+    GRPC_AVAILABLE = True
+except (ImportError, NotImplementedError):
+    GRPC_AVAILABLE = False
+
+HOST = "127.0.0.1"
+GRPC_READY_TIMEOUT_S = 30.0
+
+logger = logging.getLogger("transport-benchmark")
+
+
+# ===========================================================================
+# Clients — one call() = one request/response round trip, result parsed
+# ===========================================================================
+class UnixHTTPConnection(http.client.HTTPConnection):
+    """http.client over AF_UNIX (the Host header is irrelevant on a socket file)."""
+
+    def __init__(self, path: str, timeout: float = 10.0):
+        super().__init__("localhost", timeout=timeout)
+        self.path = path
+
+    def connect(self) -> None:
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.path)
+
+
+class HttpClient:
+    """Keep-alive HTTP/1.1 client (like HttpClient in agv-control)."""
+
+    def __init__(self, conn: http.client.HTTPConnection, workload: str,
+                 body: bytes, frame_shape: tuple[int, int] | None):
+        self.conn = conn
+        if workload == "latest":
+            self.method, self.path, self.body, self.headers = "GET", "/detect/latest", None, {}
+        else:
+            self.method, self.path, self.body = "POST", "/detect/raw", body
+            self.headers = {"Content-Type": "application/octet-stream"}
+            if frame_shape is not None:
+                self.headers.update({"X-Frame-Width": str(frame_shape[0]),
+                                     "X-Frame-Height": str(frame_shape[1])})
+
+    def call(self) -> dict:
+        self.conn.request(self.method, self.path, body=self.body, headers=self.headers)
+        response = self.conn.getresponse()
+        payload = response.read()
+        if response.status != 200:
+            raise RuntimeError(f"HTTP {response.status}: {payload[:200]!r}")
+        return json.loads(payload)
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+class GrpcUnaryClient:
+    """DetectLatest / Detect on one channel."""
+
+    def __init__(self, address: str, workload: str, body: bytes,
+                 frame_shape: tuple[int, int] | None):
+        self.channel = grpc.insecure_channel(address)
+        grpc.channel_ready_future(self.channel).result(timeout=GRPC_READY_TIMEOUT_S)
+        stub = vision_pb2_grpc.VisionDetectionStub(self.channel)
+        if workload == "latest":
+            self._rpc, self._request = stub.DetectLatest, vision_pb2.LatestRequest()
+        else:
+            self._rpc, self._request = stub.Detect, _detect_request(body, frame_shape)
+
+    def call(self):
+        return self._rpc(self._request)
+
+    def close(self) -> None:
+        self.channel.close()
+
+
+class GrpcStreamClient:
+    """DetectStream: one request in, one result out, on a single long-lived stream."""
+
+    def __init__(self, address: str, body: bytes, frame_shape: tuple[int, int] | None):
+        self.channel = grpc.insecure_channel(address)
+        grpc.channel_ready_future(self.channel).result(timeout=GRPC_READY_TIMEOUT_S)
+        self._request = _detect_request(body, frame_shape)
+        self._requests = _RequestQueue()
+        self._responses = vision_pb2_grpc.VisionDetectionStub(self.channel).DetectStream(
+            iter(self._requests)
+        )
+
+    def call(self):
+        self._requests.put(self._request)
+        return next(self._responses)
+
+    def close(self) -> None:
+        self._requests.put(None)
+        self._responses.cancel()
+        self.channel.close()
+
+
+class _RequestQueue:
+    """Request iterator fed by call(); None ends the stream."""
+
+    def __init__(self):
+        self._queue = queue.Queue()
+
+    def put(self, item) -> None:
+        self._queue.put(item)
+
+    def __iter__(self):
+        while (item := self._queue.get()) is not None:
+            yield item
+
+
+def _detect_request(body: bytes, frame_shape: tuple[int, int] | None):
+    if frame_shape is None:
+        return vision_pb2.DetectRequest(image=body)
+    return vision_pb2.DetectRequest(image=body, width=frame_shape[0], height=frame_shape[1])
+
+
+# ===========================================================================
+# Stub server (child process) + measurement
+# ===========================================================================
+def serve_stub(args) -> int:
+    """Child mode (--serve-stub): StubDetector, result cache on, HTTP TCP+UDS and gRPC."""
+    logging.basicConfig(level=logging.WARNING)
+    stub = StubDetector(args.stub_latency_ms)
+    grpc_addresses = (f"{HOST}:{args.grpc_port}", f"unix:{args.grpc_uds}") if GRPC_AVAILABLE else ()
+    _, thread = start_stub_server(stub, _synthetic_jpeg(), args.port, keep_cache=True,
+                                  uds_path=args.http_uds, grpc_addresses=grpc_addresses)
+    thread.join()
+    return 0
+
+
+def build_clients(args, body: bytes, frame_shape: tuple[int, int] | None) -> dict:
+    clients = {
+        "http-tcp": HttpClient(http.client.HTTPConnection(HOST, args.port, timeout=10),
+                               args.workload, body, frame_shape),
+        "http-uds": HttpClient(UnixHTTPConnection(args.http_uds), args.workload, body, frame_shape),
+    }
+    if GRPC_AVAILABLE:
+        clients["grpc-tcp"] = GrpcUnaryClient(f"{HOST}:{args.grpc_port}", args.workload, body, frame_shape)
+        clients["grpc-uds"] = GrpcUnaryClient(f"unix:{args.grpc_uds}", args.workload, body, frame_shape)
+        if args.workload == "upload":
+            clients["grpc-stream"] = GrpcStreamClient(f"unix:{args.grpc_uds}", body, frame_shape)
+    else:
+        logger.warning("grpcio/grpcio-tools not installed — HTTP modes only")
+    return clients
+
+
+def measure(clients: dict, warmup: int, requests: int) -> dict[str, list[float]]:
+    """Round-trip ms per mode; modes interleaved request by request."""
+    for _ in range(warmup):
+        for client in clients.values():
+            client.call()
+
+    latencies = {mode: [] for mode in clients}
+    for _ in range(requests):
+        for mode, client in clients.items():
+            start_time = time.perf_counter()
+            client.call()
+            latencies[mode].append((time.perf_counter() - start_time) * 1000)
+    return latencies
+
+
+def print_report(latencies: dict[str, list[float]], workload: str, body_bytes: int) -> None:
+    baseline = _percentile(latencies["http-tcp"], 50)
+    print()
+    print(f"workload: {workload}" + (f" ({body_bytes} byte body)" if workload == "upload" else ""))
+    print(f"{'mode':>12}  {'p50_ms':>8}  {'p95_ms':>8}  {'p99_ms':>8}  {'mean_ms':>8}  {'vs_http_tcp':>11}")
+    for mode, values in latencies.items():
+        p50 = _percentile(values, 50)
+        print(f"{mode:>12}  {p50:>8.3f}  {_percentile(values, 95):>8.3f}  "
+              f"{_percentile(values, 99):>8.3f}  {float(np.mean(values)):>8.3f}  "
+              f"{baseline / p50:>10.2f}x")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Round-trip latency: HTTP TCP vs Unix socket vs gRPC")
+    parser.add_argument("--workload", choices=("latest", "upload"), default="latest")
+    parser.add_argument("--bgr", action="store_true", help="upload: raw BGR24 body instead of JPEG")
+    parser.add_argument("--requests", type=int, default=1000, help="Timed requests per mode")
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--port", type=int, default=8767)
+    parser.add_argument("--grpc-port", type=int, default=50061)
+    parser.add_argument("--stub-latency-ms", type=float, default=0.0,
+                        help="Stub inference cost (first request only — the rest are cache hits)")
+    parser.add_argument("--log-dir", type=Path, help="Child log (default: temp dir)")
+    parser.add_argument("--serve-stub", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--http-uds", help=argparse.SUPPRESS)
+    parser.add_argument("--grpc-uds", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve_stub:
+        return serve_stub(args)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    if not hasattr(socket, "AF_UNIX"):
+        logger.error("Unix domain sockets are not available on this platform")
+        return 1
+
+    work_dir = Path(tempfile.mkdtemp(prefix="vision-transport-"))
+    args.http_uds = str(work_dir / "http.sock")
+    args.grpc_uds = str(work_dir / "grpc.sock")
+
+    frame_shape = None
+    body = _synthetic_jpeg()
+    if args.workload == "upload" and args.bgr:
+        image = cv2.imdecode(np.frombuffer(body, np.uint8), cv2.IMREAD_COLOR)
+        body, frame_shape = image.tobytes(), (image.shape[1], image.shape[0])
+
+    server = ChildProcess(
+        "vision-ai",
+        [sys.executable, str(Path(__file__).resolve()), "--serve-stub",
+         "--port", str(args.port), "--grpc-port", str(args.grpc_port),
+         "--http-uds", args.http_uds, "--grpc-uds", args.grpc_uds,
+         "--stub-latency-ms", str(args.stub_latency_ms)],
+        VISION_AI_DIR, args.log_dir or work_dir,
+    )
+    clients = {}
+    try:
+        server.start()
+        wait_until_ready(HOST, args.port)
+        clients = build_clients(args, body, frame_shape)
+        logger.info(f"Measuring {', '.join(clients)}: {args.warmup} warm-up + "
+                    f"{args.requests} requests each ({args.workload})")
+        latencies = measure(clients, args.warmup, args.requests)
+    finally:
+        for client in clients.values():
+            client.close()
+        server.stop()
+
+    print_report(latencies, args.workload, len(body))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,249 @@
+"""
+Camera Calibration Module
+=========================
+Chessboard calibration + cached undistortion for DistanceEstimator.
+
+Why?
+- FOCAL_LENGTH_PX = 554 is a guess from a nominal 60° FOV
+- Wide webcam lenses have barrel distortion: objects near frame edges look
+  smaller → bbox height too small → distance overestimated
+
+Two ways to use a calibration in vision-ai:
+- "frame":  cv2.remap the whole frame with maps precomputed ONCE by
+            cv2.initUndistortRectifyMap (YOLO sees a rectified image)
+- "points": run YOLO on the raw frame, then undistort only the box corners
+            with cv2.undistortPoints — 4 points per box instead of
+            307,200 pixels per frame
+
+Both produce boxes in the same rectified pixel space, where the calibrated
+focal length (new camera matrix) applies.
+
+Usage:
+    # 1. Print a chessboard (e.g. 9×6 inner corners, 25 mm squares), take
+    #    15-30 photos with the AGV camera from different angles/distances
+    # 2. Calibrate:
+    python vision-ai/calibration.py --images calib_images/ --pattern 9x6 --square-mm 25
+    # 3. Restart vision-ai — it loads vision-ai/calibration.json at startup
+"""
+
+import sys
+import json
+import logging
+import argparse
+from pathlib import Path
+from typing import Optional
+
+import cv2
+import numpy as np
+
+DEFAULT_CALIBRATION_PATH = Path(__file__).resolve().parent / "calibration.json"
+
+logger = logging.getLogger("vision-ai.calibration")
+
+
+# ===========================================================================
+# Calibration — chessboard images → intrinsics
+# ===========================================================================
+def calibrate_from_chessboard(image_paths: list[Path], pattern: tuple[int, int],
+                              square_size_m: float) -> dict:
+    """
+    Estimate camera matrix and distortion from chessboard photos.
+
+    Args:
+        image_paths: Photos of the chessboard taken with the AGV camera
+        pattern: Inner corners (columns, rows), e.g. (9, 6)
+        square_size_m: Chessboard square edge in meters
+
+    Returns:
+        Dict with camera_matrix, dist_coeffs, image_size, rms_error, images_used
+
+    Raises:
+        ValueError: If fewer than 3 images contain a detectable chessboard
+    """
+    # 3D corner positions on the board plane (z = 0)
+    board = np.zeros((pattern[0] * pattern[1], 3), np.float32)
+    board[:, :2] = np.mgrid[0:pattern[0], 0:pattern[1]].T.reshape(-1, 2) * square_size_m
+
+    criteria = (cv2.TERM_CRITERIA_EPS + cv2.TERM_CRITERIA_MAX_ITER, 30, 0.001)
+    object_points, image_points = [], []
+    image_size = None
+
+    for path in image_paths:
+        gray = cv2.imread(str(path), cv2.IMREAD_GRAYSCALE)
+        if gray is None:
+            logger.warning(f"Unreadable image: {path}")
+            continue
+        size = (gray.shape[1], gray.shape[0])
+        if image_size is None:
+            image_size = size
+        elif size != image_size:
+            logger.warning(f"Skipping {path}: {size} differs from {image_size}")
+            continue
+
+        found, corners = cv2.findChessboardCorners(gray, pattern)
+        if not found:
+            logger.info(f"No chessboard found: {path.name}")
+            continue
+        corners = cv2.cornerSubPix(gray, corners, (11, 11), (-1, -1), criteria)
+        object_points.append(board)
+        image_points.append(corners)
+
+    if len(object_points) < 3:
+        raise ValueError(f"Need >= 3 chessboard views, found {len(object_points)}")
+
+    rms, camera_matrix, dist_coeffs, _, _ = cv2.calibrateCamera(
+        object_points, image_points, image_size, None, None
+    )
+    return {
+        "camera_matrix": camera_matrix.tolist(),
+        "dist_coeffs": dist_coeffs.reshape(-1).tolist(),
+        "image_size": list(image_size),
+        "rms_error": round(float(rms), 4),
+        "images_used": len(object_points),
+        "pattern": list(pattern),
+        "square_size_m": square_size_m,
+    }
+
+
+# ===========================================================================
+# CameraCalibration — Single Responsibility: Undistortion ONLY
+# ===========================================================================
+class CameraCalibration:
+    """
+    Loaded intrinsics + precomputed remap tables.
+
+    The calibration is valid for one resolution. Frames decoded at another
+    size (reduced-scale JPEG decode, different camera mode) get a camera
+    matrix scaled to that size; remap tables are built once per size and
+    cached.
+    """
+
+    def __init__(self, camera_matrix: np.ndarray, dist_coeffs: np.ndarray,
+                 image_size: tuple[int, int], alpha: float = 0.0):
+        """
+        Args:
+            camera_matrix: 3×3 intrinsics at image_size
+            dist_coeffs: Distortion coefficients (k1, k2, p1, p2, k3, ...)
+            image_size: (width, height) the calibration was done at
+            alpha: 0 = crop to valid pixels only, 1 = keep all source pixels
+        """
+        self.camera_matrix = np.asarray(camera_matrix, dtype=np.float64)
+        self.dist_coeffs = np.asarray(dist_coeffs, dtype=np.float64)
+        self.image_size = tuple(int(v) for v in image_size)
+        self.alpha = alpha
+        self._per_size: dict[tuple[int, int], dict] = {}
+        self._prepare(self.image_size)  # precompute at startup
+
+    @classmethod
+    def load(cls, path: Path = DEFAULT_CALIBRATION_PATH) -> Optional['CameraCalibration']:
+        """Load calibration JSON; None if the file does not exist."""
+        if not Path(path).is_file():
+            return None
+        data = json.loads(Path(path).read_text())
+        return cls(data["camera_matrix"], data["dist_coeffs"], data["image_size"])
+
+    def _prepare(self, size: tuple[int, int]) -> dict:
+        """Camera matrices + remap tables for one frame size (cached)."""
+        entry = self._per_size.get(size)
+        if entry is not None:
+            return entry
+
+        sx = size[0] / self.image_size[0]
+        sy = size[1] / self.image_size[1]
+        camera_matrix = self.camera_matrix.copy()
+        camera_matrix[0, :] *= sx
+        camera_matrix[1, :] *= sy
+
+        new_matrix, _ = cv2.getOptimalNewCameraMatrix(
+            camera_matrix, self.dist_coeffs, size, self.alpha, size
+        )
+        # CV_16SC2 maps: fastest remap variant
+        map1, map2 = cv2.initUndistortRectifyMap(
+            camera_matrix, self.dist_coeffs, None, new_matrix, size, cv2.CV_16SC2
+        )
+        entry = {
+            "camera_matrix": camera_matrix,
+            "new_matrix": new_matrix,
+            "map1": map1,
+            "map2": map2,
+        }
+        self._per_size[size] = entry
+        return entry
+
+    def focal_length_px(self, size: tuple[int, int]) -> float:
+        """Vertical focal length (fy) of the rectified image at this size."""
+        return float(self._prepare(size)["new_matrix"][1, 1])
+
+    def rectified_matrix(self, size: tuple[int, int]) -> np.ndarray:
+        """Camera matrix of the rectified image at this size (copy)."""
+        return self._prepare(size)["new_matrix"].copy()
+
+    def undistort_frame(self, image: np.ndarray) -> np.ndarray:
+        """Rectify a whole frame with the cached remap tables."""
+        size = (image.shape[1], image.shape[0])
+        entry = self._prepare(size)
+        return cv2.remap(image, entry["map1"], entry["map2"], cv2.INTER_LINEAR)
+
+    def undistort_boxes(self, boxes: np.ndarray, size: tuple[int, int]) -> np.ndarray:
+        """
+        Rectify xyxy boxes via their 4 corners (batched, one cv2 call).
+
+        Args:
+            boxes: (N, 4) xyxy in distorted pixels of a `size` frame
+
+        Returns:
+            (N, 4) xyxy in rectified pixels, clipped to the frame
+        """
+        if len(boxes) == 0:
+            return boxes
+        entry = self._prepare(size)
+        x1, y1, x2, y2 = boxes.T
+        corners = np.stack([
+            np.column_stack([x1, y1]), np.column_stack([x2, y1]),
+            np.column_stack([x1, y2]), np.column_stack([x2, y2]),
+        ], axis=1).reshape(-1, 1, 2).astype(np.float64)
+
+        rectified = cv2.undistortPoints(
+            corners, entry["camera_matrix"], self.dist_coeffs, P=entry["new_matrix"]
+        ).reshape(-1, 4, 2)
+
+        result = np.column_stack([
+            rectified[:, :, 0].min(axis=1), rectified[:, :, 1].min(axis=1),
+            rectified[:, :, 0].max(axis=1), rectified[:, :, 1].max(axis=1),
+        ])
+        result[:, [0, 2]] = result[:, [0, 2]].clip(0, size[0])
+        result[:, [1, 3]] = result[:, [1, 3]].clip(0, size[1])
+        return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Calibrate the AGV camera from chessboard photos")
+    parser.add_argument("--images", type=Path, required=True, help="Directory of chessboard photos")
+    parser.add_argument("--pattern", default="9x6", help="Inner corners, COLSxROWS")
+    parser.add_argument("--square-mm", type=float, default=25.0, help="Square edge in mm")
+    parser.add_argument("--out", type=Path, default=DEFAULT_CALIBRATION_PATH)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO,
+                        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
+    cols, rows = (int(v) for v in args.pattern.lower().split("x"))
+    paths = sorted(p for p in args.images.iterdir()
+                   if p.suffix.lower() in (".jpg", ".jpeg", ".png", ".bmp"))
+    try:
+        result = calibrate_from_chessboard(paths, (cols, rows), args.square_mm / 1000)
+    except ValueError as e:
+        logger.error(str(e))
+        return 1
+
+    args.out.write_text(json.dumps(result, indent=2))
+    fy = result["camera_matrix"][1][1]
+    logger.info(f"Saved {args.out}: {result['images_used']} views, "
+                f"RMS reprojection error {result['rms_error']} px, fy={fy:.1f} px")
+    if result["rms_error"] > 1.0:
+        logger.warning("RMS error > 1 px — retake photos (sharper, more angles)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
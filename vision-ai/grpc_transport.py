@@ -0,0 +1,272 @@
+"""
+gRPC Transport Module
+=====================
+Typed, streaming alternative to the HTTP/JSON API for co-located clients
+(agv-control on the same machine). Schema: proto/vision.proto.
+
+Why?
+- Per HTTP poll: request line + headers parsed, ~1-2 KB of JSON built and
+  parsed again by the client — small, but paid every 100 ms tick
+- gRPC: one long-lived HTTP/2 connection, protobuf messages, and
+  StreamLatest pushes each new frame's result instead of being polled
+- On a Unix domain socket ("unix:/path") the TCP loopback stack is
+  skipped as well
+
+The .proto is compiled at import time (grpc.protos_and_services, needs
+grpcio-tools) — no generated *_pb2.py files to keep in sync.
+
+Detection is NOT implemented here: app.py passes its own functions, so
+gRPC shares the result cache, admission control, ROI and DB logging with
+the HTTP endpoints. Their HTTPException status codes map to gRPC codes.
+"""
+
+import sys
+import logging
+from concurrent import futures
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+import grpc
+
+PROTO_DIR = Path(__file__).resolve().parent / "proto"
+if str(PROTO_DIR) not in sys.path:
+    sys.path.insert(0, str(PROTO_DIR))  # protos_and_services finds .proto files via sys.path
+
+vision_pb2, vision_pb2_grpc = grpc.protos_and_services("vision.proto")
+
+STREAM_WAIT_S = 1.0  # StreamLatest re-checks for client cancellation this often
+
+# HTTPException.status_code (app.py helpers) → gRPC status
+HTTP_STATUS_TO_GRPC = {
+    400: grpc.StatusCode.INVALID_ARGUMENT,
+    404: grpc.StatusCode.NOT_FOUND,
+    409: grpc.StatusCode.FAILED_PRECONDITION,   # stale frame
+    413: grpc.StatusCode.RESOURCE_EXHAUSTED,
+    503: grpc.StatusCode.UNAVAILABLE,           # shed by admission control — retry
+}
+SKIPPABLE_STREAM_STATUS = (409, 503)  # StreamLatest drops this frame, waits for the next
+
+logger = logging.getLogger("vision-ai.grpc")
+
+
+# ===========================================================================
+# Message conversion — dict (HTTP JSON shape) ↔ protobuf
+# ===========================================================================
+def region_from_message(message) -> tuple[Optional[tuple], Optional[tuple]]:
+    """(roi, corridor) from a DetectRequest/LatestRequest; unset fields → None."""
+    roi = corridor = None
+    if message.HasField("roi"):
+        roi = (message.roi.x1, message.roi.y1, message.roi.x2, message.roi.y2)
+    if message.HasField("corridor"):
+        corridor = (message.corridor.half_width_m, message.corridor.range_m,
+                    message.corridor.lateral_offset_m)
+        if message.corridor.HasField("near_m"):
+            corridor += (message.corridor.near_m,)
+    return roi, corridor
+
+
+def result_to_message(result: dict):
+    """Detection response dict → DetectionResult (same fields as the JSON)."""
+    message = vision_pb2.DetectionResult(
+        processing_time_ms=int(result["processing_time_ms"]),
+        total_objects=int(result["total_objects"]),
+        cache_hit=bool(result.get("cache_hit")),
+        model_version=result.get("model_version") or "",
+    )
+    for det in result["detections"]:
+        item = message.detections.add(
+            object_class=det["object_class"],
+            confidence=det["confidence"],
+        )
+        item.bbox.x1, item.bbox.y1 = det["bbox"]["x1"], det["bbox"]["y1"]
+        item.bbox.x2, item.bbox.y2 = det["bbox"]["x2"], det["bbox"]["y2"]
+        pixels = det.get("bbox_pixels")
+        if pixels:
+            item.bbox_pixels.x1, item.bbox_pixels.y1 = int(pixels["x1"]), int(pixels["y1"])
+            item.bbox_pixels.x2, item.bbox_pixels.y2 = int(pixels["x2"]), int(pixels["y2"])
+        if det.get("distance_meters") is not None:
+            item.distance_meters = det["distance_meters"]
+
+    for stage, value in (result.get("timing_ms") or {}).items():
+        if value is not None:
+            message.timing_ms[stage] = value
+    trace = result.get("trace")
+    if trace and trace.get("frame_id") is not None:
+        message.frame_id = trace["frame_id"]
+    if result.get("frame_age_ms") is not None:
+        message.frame_age_ms = result["frame_age_ms"]
+    roi = result.get("roi")
+    if roi:
+        x1, y1, x2, y2 = roi["region"]
+        message.roi.region.x1, message.roi.region.y1 = x1, y1
+        message.roi.region.x2, message.roi.region.y2 = x2, y2
+        message.roi.skipped_fraction = roi["skipped_fraction"]
+        # Tiled inference reports the region only (no single input size)
+        if "imgsz" in roi:
+            message.roi.imgsz = roi["imgsz"]
+        if "estimated_speedup" in roi:
+            message.roi.estimated_speedup = roi["estimated_speedup"]
+    return message
+
+
+# ===========================================================================
+# VisionDetectionServicer — Single Responsibility: RPC ↔ injected detection calls
+# ===========================================================================
+class VisionDetectionServicer(vision_pb2_grpc.VisionDetectionServicer):
+    """
+    Implements proto/vision.proto on top of callables from app.py.
+
+    Callables (keyword arguments; None = "not sent", same defaults as HTTP):
+        detect_image(body, threshold, width, height, frame_trace, image_path,
+                     priority, deadline_ms, roi, corridor) → result dict
+        detect_latest(threshold, priority, deadline_ms, roi, corridor) → result dict
+        wait_for_frame(after, timeout_s) → frame token, or None on timeout
+
+    Each RPC holds a server thread; a StreamLatest subscriber holds one
+    for as long as it stays connected.
+    """
+
+    def __init__(self, detect_image: Callable[..., dict],
+                 detect_latest: Callable[..., dict],
+                 wait_for_frame: Callable[[Optional[int], float], Optional[int]]):
+        self._detect_image = detect_image
+        self._detect_latest = detect_latest
+        self._wait_for_frame = wait_for_frame
+
+    # --- argument mapping ---------------------------------------------------
+    @staticmethod
+    def _image_kwargs(request) -> dict:
+        roi, corridor = region_from_message(request)
+        return {
+            "body": request.image,
+            "threshold": request.threshold if request.HasField("threshold") else None,
+            "width": request.width or None,
+            "height": request.height or None,
+            "frame_trace": request.frame_trace or None,
+            "image_path": request.image_path or None,
+            "priority": request.priority or None,
+            "deadline_ms": request.deadline_ms if request.HasField("deadline_ms") else None,
+            "roi": roi,
+            "corridor": corridor,
+        }
+
+    @staticmethod
+    def _latest_kwargs(request) -> dict:
+        roi, corridor = region_from_message(request)
+        return {
+            "threshold": request.threshold if request.HasField("threshold") else None,
+            "priority": request.priority or None,
+            "deadline_ms": request.deadline_ms if request.HasField("deadline_ms") else None,
+            "roi": roi,
+            "corridor": corridor,
+        }
+
+    @staticmethod
+    def _abort(context, error: Exception):
+        """HTTPException (duck-typed: status_code/detail/headers) → gRPC status."""
+        status = getattr(error, "status_code", None)
+        if status is None:
+            logger.exception("gRPC detection failed")
+            context.abort(grpc.StatusCode.INTERNAL, str(error))
+        retry_after = (getattr(error, "headers", None) or {}).get("Retry-After")
+        if retry_after is not None:
+            context.set_trailing_metadata((("retry-after", str(retry_after)),))
+        context.abort(HTTP_STATUS_TO_GRPC.get(status, grpc.StatusCode.INTERNAL),
+                      str(getattr(error, "detail", error)))
+
+    # --- RPCs -----------------------------------------------------------------
+    def Detect(self, request, context):
+        try:
+            return result_to_message(self._detect_image(**self._image_kwargs(request)))
+        except Exception as e:
+            self._abort(context, e)
+
+    def DetectLatest(self, request, context):
+        try:
+            return result_to_message(self._detect_latest(**self._latest_kwargs(request)))
+        except Exception as e:
+            self._abort(context, e)
+
+    def StreamLatest(self, request, context):
+        """
+        Push one result per new frame. The first message is the current
+        frame; after that, each frame once it has been processed (with the
+        precomputer running, the detect below is a cache hit).
+
+        Stale (409) and shed (503) frames are skipped, not fatal — a
+        streaming client cannot retry a single frame anyway.
+        """
+        kwargs = self._latest_kwargs(request)
+        token = None
+        while context.is_active():
+            next_token = self._wait_for_frame(token, STREAM_WAIT_S)
+            if next_token is None:
+                continue
+            token = next_token
+            try:
+                yield result_to_message(self._detect_latest(**kwargs))
+            except Exception as e:
+                if getattr(e, "status_code", None) in SKIPPABLE_STREAM_STATUS:
+                    logger.debug(f"StreamLatest skipped frame: {getattr(e, 'detail', e)}")
+                    continue
+                self._abort(context, e)
+
+    def DetectStream(self, request_iterator: Iterable, context):
+        for request in request_iterator:
+            try:
+                yield result_to_message(self._detect_image(**self._image_kwargs(request)))
+            except Exception as e:
+                self._abort(context, e)
+
+
+# ===========================================================================
+# GrpcTransport — Single Responsibility: gRPC server lifecycle
+# ===========================================================================
+class GrpcTransport:
+    """
+    gRPC server on one or more addresses ("127.0.0.1:50051",
+    "unix:/tmp/agv-vision-ai-grpc.sock"). An address that cannot be bound
+    is logged and skipped — HTTP keeps working either way.
+    """
+
+    def __init__(self, servicer: VisionDetectionServicer,
+                 addresses: Iterable[str], max_workers: int = 16,
+                 max_message_bytes: int = 4 * 1024 * 1024):
+        """
+        Args:
+            servicer: RPC implementation
+            addresses: gRPC listen addresses (host:port or unix:path)
+            max_workers: Concurrent RPCs (thread pool size)
+            max_message_bytes: Largest DetectRequest accepted (raw frames are big)
+        """
+        self.addresses = list(addresses)
+        self.bound: list[str] = []
+        self._server = grpc.server(
+            futures.ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="grpc"),
+            options=[("grpc.max_receive_message_length", max_message_bytes)],
+        )
+        vision_pb2_grpc.add_VisionDetectionServicer_to_server(servicer, self._server)
+
+    def start(self) -> list[str]:
+        """Bind and start; returns the addresses actually bound."""
+        for address in self.addresses:
+            if address.startswith("unix:"):
+                Path(address[len("unix:"):]).unlink(missing_ok=True)  # stale socket from a crash
+            try:
+                if self._server.add_insecure_port(address):
+                    self.bound.append(address)
+                    continue
+            except RuntimeError:
+                pass
+            logger.warning(f"gRPC could not bind {address} — skipped")
+        if self.bound:
+            self._server.start()
+            logger.info(f"gRPC serving on {', '.join(self.bound)}")
+        return self.bound
+
+    def stop(self, grace_s: float = 1.0) -> None:
+        if self.bound:
+            self._server.stop(grace_s).wait()
+        for address in self.bound:
+            if address.startswith("unix:"):
+                Path(address[len("unix:"):]).unlink(missing_ok=True)
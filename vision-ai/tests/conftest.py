@@ -0,0 +1,8 @@
+"""Make vision-ai modules (app, calibration, ...) and common/ importable from the tests."""
+
+import sys
+from pathlib import Path
+
+VISION_AI_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(VISION_AI_DIR))
+sys.path.insert(0, str(VISION_AI_DIR.parent))
@@ -0,0 +1,48 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+import app
+from app import AdmissionController, AdmissionRejected
+
+
+def test_unreachable_deadline_is_rejected_up_front():
+    admission = AdmissionController(concurrency=1)
+    admission._service_s = 0.2  # learned inference time
+    with admission.slot("normal"):
+        with pytest.raises(AdmissionRejected) as error:
+            with admission.slot("critical", deadline_mono=time.monotonic() + 0.1):
+                pass
+    assert error.value.reason == "deadline"
+    assert error.value.retry_after_s >= 1
+    assert admission.stats()["classes"]["critical"]["shed_deadline"] == 1
+
+
+def test_higher_priority_goes_first():
+    admission = AdmissionController(concurrency=1)
+    order = []
+
+    def run(priority):
+        with admission.slot(priority):
+            order.append(priority)
+
+    with admission.slot("normal"):
+        waiters = [threading.Thread(target=run, args=(p,)) for p in ("low", "critical")]
+        for waiter in waiters:
+            waiter.start()
+            time.sleep(0.05)  # both queued while the slot is taken
+    for waiter in waiters:
+        waiter.join(5)
+    assert order == ["critical", "low"]
+
+
+def test_shed_request_is_503_with_retry_after(monkeypatch):
+    monkeypatch.setattr(app, "detector", SimpleNamespace(model_version="test"))
+    monkeypatch.setattr(app, "admission", AdmissionController(queue_limits={"normal": 0}))
+    with pytest.raises(HTTPException) as error:
+        app._detect_from_body(b"never-cached-frame", 0.5, priority="normal")
+    assert error.value.status_code == 503
+    assert int(error.value.headers["Retry-After"]) >= 1
@@ -0,0 +1,29 @@
+import numpy as np
+
+import app
+from app import CorridorProjector, YoloDetector
+
+
+def _skipped_fraction(region) -> float:
+    image = np.zeros((480, 640, 3), np.uint8)
+    return YoloDetector._roi_report(YoloDetector.__new__(YoloDetector), image, region)["skipped_fraction"]
+
+
+def test_narrow_corridor_crops_with_default_mount():
+    region = app._resolve_region(None, (0.3, 3.0))
+    assert region is not None
+    assert _skipped_fraction(region) > 0
+
+
+def test_near_m_crops_the_sides():
+    default = CorridorProjector().project(0.3, 3.0)
+    farther = CorridorProjector().project(0.3, 3.0, near_m=1.0)
+    assert farther[0] > default[0] and farther[2] < default[2]
+    assert _skipped_fraction(farther) > _skipped_fraction(default)
+
+
+def test_full_frame_projection_collapses_to_none(monkeypatch):
+    projector = CorridorProjector(pitch_deg=20.0, margin=0.1)
+    assert projector.project(2.0, 10.0) == (0.0, 0.0, 1.0, 1.0)
+    monkeypatch.setattr(app, "corridor_projector", projector)
+    assert app._resolve_region(None, (2.0, 10.0)) is None
@@ -0,0 +1,44 @@
+import threading
+import time
+
+import psycopg2
+import pytest
+
+from common import db_logger
+from common.db_logger import CircuitOpenError, DatabaseConnection
+
+
+@pytest.fixture
+def db(monkeypatch):
+    monkeypatch.setattr(DatabaseConnection, "_instance", None)
+    monkeypatch.setattr(DatabaseConnection, "_connection", None)
+    return DatabaseConnection()
+
+
+def test_callers_fail_fast_while_another_thread_connects(db, monkeypatch):
+    connecting, give_up = threading.Event(), threading.Event()
+
+    def slow_connect(**kwargs):
+        connecting.set()
+        give_up.wait(5)  # stands in for connect_timeout
+        raise psycopg2.OperationalError("timeout expired")
+
+    monkeypatch.setattr(db_logger.psycopg2, "connect", slow_connect)
+    def first_caller():
+        with pytest.raises(psycopg2.OperationalError):
+            with db.get_cursor():
+                pass
+
+    probe = threading.Thread(target=first_caller)
+    probe.start()
+    assert connecting.wait(5)
+
+    start_time = time.monotonic()
+    with pytest.raises(CircuitOpenError):
+        with db.get_cursor():
+            pass
+    assert time.monotonic() - start_time < 0.5
+
+    give_up.set()
+    probe.join(5)
+    assert db.status()["circuit"] == "open"
@@ -0,0 +1,80 @@
+import re
+from pathlib import Path
+
+import app
+from common.db_logger import FrameLogger
+
+DATABASE_DIR = Path(__file__).resolve().parents[2] / "database"
+SQL_FILES = [DATABASE_DIR / "init.sql", DATABASE_DIR / "migrations" / "002_detection_frames.sql"]
+
+DETECTIONS = [
+    {"object_class": "truck", "confidence": 0.87,
+     "bbox": {"x1": 0.12, "y1": 0.34, "x2": 0.56, "y2": 0.78}, "distance_meters": 2.4},
+    {"object_class": "fan", "confidence": 0.64,
+     "bbox": {"x1": 0.6, "y1": 0.2, "x2": 0.7, "y2": 0.5}, "distance_meters": None},
+]
+
+
+def test_frame_row_matches_columns(monkeypatch):
+    frame_logger = FrameLogger()
+    monkeypatch.setattr(frame_logger, "_ensure_worker", lambda: None)
+    frame_logger.log_frame(DETECTIONS, processing_time_ms=45, image_path="latest.jpg",
+                           frame_id=1042, frame_age_ms=61, in_detections=True)
+    row = dict(zip(FrameLogger.COLUMNS, frame_logger._drain(1)[0], strict=True))
+
+    assert row["object_classes"] == ["truck", "fan"]
+    assert row["confidences"] == [0.87, 0.64]
+    assert row["boxes"] == [0.12, 0.34, 0.56, 0.78, 0.6, 0.2, 0.7, 0.5]
+    assert row["distances"] == [2.4, None]
+    assert row["triggered_stops"] is None
+    assert row["in_detections"] is True
+    assert (row["frame_id"], row["frame_age_ms"]) == (1042, 61)
+
+
+def test_empty_frame_packs_to_empty_arrays():
+    assert FrameLogger.pack([]) == ([], [], [], None, None)
+
+
+def _section(sql: str, pattern: str) -> str:
+    """Statement starting at `pattern`, up to its terminating semicolon."""
+    return sql[re.search(pattern, sql).start():].split(";", 1)[0]
+
+
+def test_schema_has_every_logged_column():
+    for path in SQL_FILES:
+        sql = path.read_text()
+        table = _section(sql, r"CREATE TABLE (IF NOT EXISTS )?detection_frames")
+        columns = re.findall(r"^\s+(\w+) ", table, flags=re.MULTILINE)
+        assert set(FrameLogger.COLUMNS) <= set(columns), path.name
+
+
+def test_view_skips_frames_already_in_detections():
+    views = []
+    for path in SQL_FILES:
+        sql = path.read_text()
+        view = _section(sql, r"VIEW detections_all AS")
+        assert re.search(r"FROM detection_frames f\b.*\bWHERE NOT f\.in_detections\s*$", view, re.DOTALL), path.name
+        views.append(view)
+    assert views[0] == views[1]
+
+
+def test_both_mode_marks_frames_in_detections(monkeypatch):
+    frames, rows = [], []
+
+    class FakeFrameLogger:
+        def log_frame(self, detections, **kwargs):
+            frames.append(kwargs)
+
+    class FakeDetectionLogger:
+        def log_detection(self, **kwargs):
+            rows.append(kwargs)
+
+    monkeypatch.setattr(app, "DB_AVAILABLE", True)
+    monkeypatch.setattr(app, "frame_logger", FakeFrameLogger(), raising=False)
+    monkeypatch.setattr(app, "detection_logger", FakeDetectionLogger(), raising=False)
+
+    for storage in ("frames", "both"):
+        monkeypatch.setattr(app, "DETECTION_STORAGE", storage)
+        app._log_detections_to_db(DETECTIONS, 45)
+    assert [frame["in_detections"] for frame in frames] == [False, True]
+    assert len(rows) == len(DETECTIONS)
@@ -0,0 +1,90 @@
+import queue
+import threading
+import time
+
+import app
+from app import FramePrecomputer
+
+
+class FakeListener:
+    def __init__(self):
+        self._events = queue.Queue()
+
+    def send(self) -> None:
+        self._events.put({"frame_id": None})
+
+    def wait(self, timeout_s):
+        try:
+            return [self._events.get(timeout=timeout_s)]
+        except queue.Empty:
+            return []
+
+    def close(self) -> None:
+        pass
+
+
+def test_frame_announced_while_worker_busy_is_pending(tmp_path):
+    image_path = tmp_path / "latest.jpg"
+    listener = FakeListener()
+    release = threading.Event()
+    processed = []
+
+    def process(image_bytes, mtime_ns):
+        processed.append(image_bytes)
+        if image_bytes == b"first":
+            release.wait(5)
+
+    precomputer = FramePrecomputer(image_path, process, listener, poll_interval_s=60)
+    precomputer.start()
+    try:
+        image_path.write_bytes(b"first")
+        listener.send()
+        while not processed:  # worker is now busy with "first"
+            time.sleep(0.01)
+
+        image_path.write_bytes(b"second!")
+        mtime_ns = image_path.stat().st_mtime_ns
+        listener.send()
+        for _ in range(500):  # the event thread marks "second!" pending
+            if precomputer.is_computing(mtime_ns):
+                break
+            time.sleep(0.01)
+        assert precomputer.is_computing(mtime_ns)
+
+        release.set()
+        precomputer.wait_for(mtime_ns, timeout_s=5)
+        assert processed == [b"first", b"second!"]
+        assert not precomputer.is_computing(mtime_ns)
+    finally:
+        release.set()
+        precomputer.stop()
+
+
+class RecordingPrecomputer:
+    def __init__(self):
+        self.waited = []
+
+    def is_computing(self, mtime_ns):
+        return True
+
+    def wait_for(self, mtime_ns, timeout_s=None):
+        self.waited.append(mtime_ns)
+
+
+def test_only_polls_for_the_precomputed_key_wait(tmp_path, monkeypatch):
+    image_path = tmp_path / "latest.jpg"
+    image_path.write_bytes(b"frame")
+    recorder = RecordingPrecomputer()
+    monkeypatch.setattr(app, "CAMERA_IMAGE_PATH", image_path)
+    monkeypatch.setattr(app, "precomputer", recorder)
+    monkeypatch.setattr(app, "ROI_REGION", None)
+    monkeypatch.setattr(app, "_detect_from_body", lambda *args, **kwargs: {
+        "cache_hit": True, "total_objects": 0, "processing_time_ms": 0.0,
+    })
+
+    app._detect_latest_frame(app.DEFAULT_CONFIDENCE_THRESHOLD + 0.1, "critical", None, None)
+    app._detect_latest_frame(app.DEFAULT_CONFIDENCE_THRESHOLD, "critical", None, (0.0, 0.5, 1.0, 1.0))
+    assert recorder.waited == []
+
+    app._detect_latest_frame(app.DEFAULT_CONFIDENCE_THRESHOLD, "critical", None, None)
+    assert recorder.waited == [image_path.stat().st_mtime_ns]
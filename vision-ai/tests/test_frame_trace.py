@@ -0,0 +1,43 @@
+import cv2
+import numpy as np
+
+from common.frame_trace import FrameTrace
+
+
+def _jpeg() -> bytes:
+    image = np.full((48, 64, 3), 127, np.uint8)
+    return cv2.imencode(".jpg", image)[1].tobytes()
+
+
+def test_trace_round_trips_through_com_segment():
+    trace = FrameTrace(frame_id=42)
+    trace.mark("encoded")
+    data = trace.embed_in_jpeg(_jpeg())
+
+    parsed = FrameTrace.from_jpeg(memoryview(data))
+    assert parsed is not None
+    assert parsed.frame_id == 42
+    assert parsed.capture_mono_ns == trace.capture_mono_ns
+    assert parsed.capture_wall_ns == trace.capture_wall_ns
+    assert parsed.host == trace.host
+    assert parsed.stages == trace.stages
+
+    # The COM segment is invisible to decoders
+    decoded = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR)
+    assert decoded.shape == (48, 64, 3)
+
+
+def test_foreign_comment_and_plain_jpeg_have_no_trace():
+    jpeg = _jpeg()
+    assert FrameTrace.from_jpeg(jpeg) is None
+
+    body = b"made by some other camera"
+    foreign = jpeg[:2] + b"\xff\xfe" + (len(body) + 2).to_bytes(2, "big") + body + jpeg[2:]
+    assert FrameTrace.from_jpeg(foreign) is None
+    assert FrameTrace(frame_id=7).embed_in_jpeg(foreign)[:2] == b"\xff\xd8"
+    assert FrameTrace.from_jpeg(FrameTrace(frame_id=7).embed_in_jpeg(foreign)).frame_id == 7
+
+
+def test_non_jpeg_is_left_unchanged():
+    assert FrameTrace(frame_id=1).embed_in_jpeg(b"not a jpeg") == b"not a jpeg"
+    assert FrameTrace.from_jpeg(b"not a jpeg") is None
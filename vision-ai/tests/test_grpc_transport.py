@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from app import YoloDetector
+
+grpc_transport = pytest.importorskip("grpc_transport")  # optional, like GRPC_AVAILABLE in app.py
+
+
+def _result(roi_report: dict | None = None) -> dict:
+    return {
+        "detections": [{
+            "object_class": "truck", "confidence": 0.87,
+            "bbox": {"x1": 0.1, "y1": 0.2, "x2": 0.3, "y2": 0.4},
+            "bbox_pixels": {"x1": 64, "y1": 96, "x2": 192, "y2": 192},
+            "distance_meters": None,
+        }],
+        "processing_time_ms": 45,
+        "total_objects": 1,
+        "timing_ms": {"inference": 40.5, "decode": None},
+        "cache_hit": False,
+        "model_version": "abc123",
+        "trace": {"frame_id": 1042},
+        "frame_age_ms": 61.0,
+        "roi": roi_report,
+    }
+
+
+def _roi_report(imgsz: int | None) -> dict:
+    detector = YoloDetector.__new__(YoloDetector)
+    detector.input_size = 640
+    image = np.zeros((480, 640, 3), np.uint8)
+    return detector._roi_report(image, (0.0, 0.5, 1.0, 1.0), imgsz)
+
+
+def test_result_converts_to_message():
+    message = grpc_transport.result_to_message(_result())
+    detection = message.detections[0]
+
+    assert (message.total_objects, message.processing_time_ms) == (1, 45)
+    assert detection.object_class == "truck" and detection.bbox_pixels.x2 == 192
+    assert not detection.HasField("distance_meters")
+    assert dict(message.timing_ms) == {"inference": 40.5}
+    assert (message.frame_id, message.frame_age_ms) == (1042, 61.0)
+    assert not message.HasField("roi")
+
+
+def test_single_pass_roi_sets_imgsz_and_speedup():
+    report = _roi_report(imgsz=320)
+    roi = grpc_transport.result_to_message(_result(report)).roi
+
+    assert roi.HasField("imgsz") and roi.imgsz == 320
+    assert roi.estimated_speedup == pytest.approx(report["estimated_speedup"])
+
+
+def test_tiled_roi_leaves_imgsz_and_speedup_unset():
+    report = _roi_report(imgsz=None)
+    assert "imgsz" not in report
+    roi = grpc_transport.result_to_message(_result(report)).roi
+
+    assert roi.region.y1 == pytest.approx(0.5)
+    assert roi.skipped_fraction == pytest.approx(0.5)
+    assert not roi.HasField("imgsz") and not roi.HasField("estimated_speedup")
+
+
+def test_region_from_message():
+    pb2 = grpc_transport.vision_pb2
+    assert grpc_transport.region_from_message(pb2.LatestRequest()) == (None, None)
+
+    request = pb2.LatestRequest()
+    request.corridor.half_width_m, request.corridor.range_m = 0.5, 3.0
+    roi, corridor = grpc_transport.region_from_message(request)
+    assert roi is None and corridor == (0.5, 3.0, 0.0)
+
+    request.corridor.near_m = 1.0
+    assert grpc_transport.region_from_message(request)[1] == (0.5, 3.0, 0.0, 1.0)
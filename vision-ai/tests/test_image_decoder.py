@@ -0,0 +1,42 @@
+import struct
+
+import cv2
+import numpy as np
+
+from app import ImageDecoder
+
+
+def _jpeg(width: int, height: int) -> bytes:
+    image = np.zeros((height, width, 3), np.uint8)
+    image[:, : width // 2] = 255  # left half white — orientation is visible
+    ok, encoded = cv2.imencode(".jpg", image)
+    assert ok
+    return encoded.tobytes()
+
+
+def _with_exif_orientation(jpeg: bytes, orientation: int) -> bytes:
+    """Insert an APP1 Exif segment holding only the Orientation tag (0x0112)."""
+    tiff = (b"MM\x00\x2a\x00\x00\x00\x08"                      # big-endian TIFF, IFD0 at 8
+            + struct.pack(">H", 1)                              # one IFD entry
+            + struct.pack(">HHIHH", 0x0112, 3, 1, orientation, 0)
+            + struct.pack(">I", 0))                             # no next IFD
+    payload = b"Exif\x00\x00" + tiff
+    app1 = b"\xff\xe1" + struct.pack(">H", len(payload) + 2) + payload
+    return jpeg[:2] + app1 + jpeg[2:]
+
+
+def test_reduced_decode_reports_source_size():
+    image, size = ImageDecoder(640).decode(_jpeg(1920, 1080))
+    assert size == (1920, 1080)
+    assert image.shape[:2] == (540, 960)  # factor 2
+
+
+def test_exif_rotated_jpeg_size_matches_decoded_orientation():
+    data = _with_exif_orientation(_jpeg(1280, 480), 6)  # 6 = rotate 90° CW
+    assert ImageDecoder.jpeg_dimensions(data) == (1280, 480)
+
+    for decoder in (ImageDecoder(640), ImageDecoder(None)):
+        image, (width, height) = decoder.decode(data)
+        img_height, img_width = image.shape[:2]
+        assert (width, height) == (480, 1280)
+        assert width / img_width == height / img_height  # one scale for x and y
@@ -0,0 +1,42 @@
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+
+from app import ModelReloader
+
+
+class FakeDetector:
+    def __init__(self, classes, admitted=None):
+        self.model = SimpleNamespace(names=dict(enumerate(classes)))
+        self.classes = classes
+        self.admitted = admitted
+        self.calls = []  # admission state at each detect()
+
+    def detect(self, image, threshold):
+        self.calls.append(self.admitted[0] if self.admitted is not None else None)
+        return {"detections": [{"object_class": c} for c in self.classes],
+                "timing_ms": {"inference": 1.0}}
+
+
+def test_smoke_check_runs_current_model_inside_admission(tmp_path):
+    smoke = tmp_path / "smoke.jpg"
+    cv2.imwrite(str(smoke), np.zeros((48, 64, 3), np.uint8))
+    admitted = [False]
+
+    @contextmanager
+    def admit():
+        admitted[0] = True
+        try:
+            yield
+        finally:
+            admitted[0] = False
+
+    previous = FakeDetector(["box", "person"], admitted)
+    candidate = FakeDetector(["box", "person"])
+    reloader = ModelReloader(None, None, lambda: previous, smoke_image_path=smoke,
+                             warmup_runs=1, admit=admit)
+
+    assert reloader._smoke_check(candidate, previous) == 1.0
+    assert previous.calls == [True]
@@ -0,0 +1,63 @@
+import asyncio
+import contextlib
+import threading
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+import app
+from app import _read_body_into_buffer
+
+
+def _request(content_length: str, body: bytes = b"x") -> Request:
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    scope = {"type": "http", "method": "POST", "path": "/detect/raw",
+             "headers": [(b"content-length", content_length.encode())]}
+    return Request(scope, receive)
+
+
+@pytest.mark.parametrize("content_length", ["abc", "1.5", "-1"])
+def test_malformed_content_length_is_400(content_length):
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(_read_body_into_buffer(_request(content_length)))
+    assert error.value.status_code == 400
+
+
+def test_body_read_into_buffer():
+    buffer, length = asyncio.run(_read_body_into_buffer(_request("5", b"hello")))
+    assert bytes(buffer[:length]) == b"hello"
+
+
+def test_buffer_returns_to_pool_only_after_worker_finishes(monkeypatch):
+    worker_started, finish = threading.Event(), threading.Event()
+    seen = {}
+
+    def slow_upload(body, *args):
+        seen["buffer"] = body.obj
+        worker_started.set()
+        finish.wait(5)
+        seen["pooled_while_reading"] = any(b is body.obj for b in app.body_pool._free)
+        return {}
+
+    monkeypatch.setattr(app, "_detect_upload", slow_upload)
+    monkeypatch.setattr(app.body_pool, "_free", [])
+
+    async def client_disconnects():
+        task = asyncio.ensure_future(app.detect_raw(
+            _request("5", b"hello"), threshold=0.5, frame_width=None, frame_height=None,
+            image_path=None, frame_trace=None, priority=None, deadline_ms=None,
+            roi=None, corridor=None,
+        ))
+        await asyncio.get_running_loop().run_in_executor(None, worker_started.wait, 5)
+        task.cancel()
+        await asyncio.sleep(0.05)
+        finish.set()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+
+    asyncio.run(client_disconnects())
+    assert seen["pooled_while_reading"] is False
+    assert any(b is seen["buffer"] for b in app.body_pool._free)
@@ -0,0 +1,32 @@
+from app import ResultCache
+
+
+def test_key_separates_threshold_model_and_shape():
+    key = ResultCache.make_key(b"frame", 0.5, "best-1")
+    assert key == ResultCache.make_key(bytearray(b"frame"), 0.50001, "best-1")
+    assert key != ResultCache.make_key(b"frame", 0.6, "best-1")
+    assert key != ResultCache.make_key(b"frame", 0.5, "best-2")
+    assert key != ResultCache.make_key(b"frame", 0.5, "best-1", (640, 480))
+    assert key != ResultCache.make_key(b"other", 0.5, "best-1")
+
+
+def test_lru_eviction_and_copies():
+    cache = ResultCache(max_entries=2, ttl_s=60)
+    cache.put("a", {"detections": []})
+    cache.put("b", {"detections": []})
+    assert cache.get("a") is not None   # "a" is now most recently used
+    cache.put("c", {"detections": []})  # evicts "b"
+
+    assert cache.get("b") is None
+    assert cache.get("c") is not None
+    assert cache.evictions == 1
+
+    cache.get("a")["detections"].append("mutated")
+    assert cache.get("a") == {"detections": []}
+
+
+def test_expired_entry_is_a_miss():
+    cache = ResultCache(max_entries=4, ttl_s=-1)
+    cache.put("a", {})
+    assert cache.get("a") is None
+    assert cache.stats()["expirations"] == 1
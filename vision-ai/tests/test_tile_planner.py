@@ -0,0 +1,39 @@
+import numpy as np
+
+from app import TilePlanner
+
+
+def test_object_split_across_tiles_merges_to_one_box():
+    planner = TilePlanner(tile_size=640, overlap=0.25, max_tiles=8, region=None,
+                          include_full_frame=False, nms_iou=0.5)
+    plan = planner.plan(np.zeros((640, 1120, 3), np.uint8))
+    assert plan["grid"] == (2, 1)
+
+    # The same 100×100 object at x=500..600, seen by both tiles in the overlap
+    left = planner.to_frame(np.array([[500.0, 100.0, 600.0, 200.0]]), plan["origins"][0], plan)
+    right = planner.to_frame(np.array([[20.0, 102.0, 122.0, 200.0]]), plan["origins"][1], plan)
+    boxes = np.vstack([left, right])
+    np.testing.assert_allclose(left[0], [500, 100, 600, 200])
+    np.testing.assert_allclose(right[0], [500, 102, 602, 200])
+
+    keep = planner.merge(boxes, np.array([0.6, 0.9]), np.array([0, 0]))
+    assert keep.tolist() == [1]
+
+
+def test_merge_is_class_aware():
+    planner = TilePlanner(nms_iou=0.5)
+    boxes = np.array([[0.0, 0.0, 100.0, 100.0], [2.0, 2.0, 100.0, 100.0]])
+    keep = planner.merge(boxes, np.array([0.9, 0.8]), np.array([0, 1]))
+    assert sorted(keep.tolist()) == [0, 1]
+
+
+def test_downscaled_region_maps_back_to_source_pixels():
+    planner = TilePlanner(tile_size=640, overlap=0.25, max_tiles=2,
+                          region=(0.0, 0.5, 1.0, 1.0), include_full_frame=False)
+    plan = planner.plan(np.zeros((1080, 1920, 3), np.uint8))
+    assert plan["scale"] < 1.0 and plan["offset"] == (0, 540)
+
+    origin = plan["origins"][-1]
+    mapped = planner.to_frame(np.array([[0.0, 0.0, 64.0, 64.0]]), origin, plan)
+    np.testing.assert_allclose(mapped[0, :2], origin / plan["scale"] + [0, 540])
+    np.testing.assert_allclose(mapped[0, 2:] - mapped[0, :2], [64 / plan["scale"]] * 2)
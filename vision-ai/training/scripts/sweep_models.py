@@ -0,0 +1,290 @@
+"""
+Model Sweep — Latency / Accuracy Pareto Table
+==============================================
+Choose which best.pt to ship in vision-ai.
+
+For every (weights × backend × input size) combination, on CPU:
+- Accuracy on the validation split: mAP@50 + per-class recall
+  (truck, fan, bolling-pin — recall is the safety metric, see README)
+- Latency: p50/p99 of single-image predict() on validation images,
+  the same call pattern as YoloDetector.detect() (batch 1, pre+post incl.)
+
+Rows that are not beaten on both mAP@50 and p99 by another row are marked
+Pareto-optimal. With --budget-ms, the best Pareto row within the latency
+budget is recommended (default 100 ms = one agv-control tick). Only the
+backends in SERVABLE_BACKENDS get a "Ship:" instruction — vision-ai/app.py
+loads best.pt through ultralytics as a PyTorch model, so an exported winner
+is reported along with the best row it can actually serve today.
+
+Usage (from vision-ai/):
+    python training/scripts/sweep_models.py \
+        --weights training/runs/warehouse_v1/weights/best.pt training/runs/warehouse_v2/weights/best.pt \
+        --imgsz 320,480,640 --backends pytorch,onnx,openvino \
+        --csv training/runs/sweep.csv
+"""
+
+import sys
+import csv
+import time
+import logging
+import argparse
+from pathlib import Path
+
+import numpy as np
+from ultralytics import YOLO
+from ultralytics.data.utils import check_det_dataset, IMG_FORMATS
+
+TRAINING_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_DATA = TRAINING_DIR / "configs" / "warehouse_finetune.yaml"
+DEFAULT_CLASSES = ("truck", "fan", "bolling-pin")
+CONTROL_TICK_MS = 100.0
+
+# Ultralytics export format per backend name ("pytorch" = no export)
+BACKEND_FORMATS = {
+    "pytorch": None,
+    "torchscript": "torchscript",
+    "onnx": "onnx",
+    "openvino": "openvino",
+}
+# Backends vision-ai/app.py can serve as-is (it loads best.pt, no exports)
+SERVABLE_BACKENDS = ("pytorch",)
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger("model-sweep")
+
+
+# ===========================================================================
+# Model loading (export per backend + input size)
+# ===========================================================================
+def load_backend(weights: Path, backend: str, imgsz: int) -> YOLO:
+    """
+    Load weights for a backend, exporting at this input size if needed.
+
+    Exported models have static input shapes, so each imgsz is its own export.
+    """
+    export_format = BACKEND_FORMATS[backend]
+    if export_format is None:
+        return YOLO(str(weights))
+
+    exported = YOLO(str(weights)).export(format=export_format, imgsz=imgsz,
+                                         device="cpu", verbose=False)
+    return YOLO(str(exported), task="detect")
+
+
+# ===========================================================================
+# Accuracy — mAP@50 + per-class recall on the validation split
+# ===========================================================================
+def evaluate_accuracy(model: YOLO, data: Path, imgsz: int,
+                      classes: tuple[str, ...]) -> dict:
+    """Run ultralytics val on CPU and extract the metrics we ship on."""
+    metrics = model.val(data=str(data), split="val", imgsz=imgsz, batch=1,
+                        device="cpu", plots=False, verbose=False)
+    box = metrics.box
+    names = metrics.names
+
+    # box.r is per class in box.ap_class_index order (classes present in val)
+    recall_by_class = {
+        names[int(class_index)]: float(recall)
+        for class_index, recall in zip(box.ap_class_index, box.r)
+    }
+    row = {"map50": round(float(box.map50), 4)}
+    for name in classes:
+        recall = recall_by_class.get(name)
+        row[f"recall_{name}"] = round(recall, 4) if recall is not None else None
+    return row
+
+
+# ===========================================================================
+# Latency — p50/p99 of single-image predict on CPU
+# ===========================================================================
+def validation_images(data: Path, limit: int) -> list[Path]:
+    """Resolve the val split from the dataset yaml and list its images."""
+    dataset = check_det_dataset(str(data))
+    val_entries = dataset["val"] if isinstance(dataset["val"], list) else [dataset["val"]]
+
+    images = []
+    for entry in val_entries:
+        entry = Path(entry)
+        if entry.is_dir():
+            images.extend(sorted(p for p in entry.rglob("*")
+                                 if p.suffix.lower().lstrip(".") in IMG_FORMATS))
+        elif entry.suffix == ".txt":
+            images.extend(Path(line.strip()) for line in entry.read_text().splitlines() if line.strip())
+    if not images:
+        raise FileNotFoundError(f"No validation images found for {data}")
+    return images[:limit]
+
+
+def measure_latency(model: YOLO, images: list[Path], imgsz: int,
+                    warmup: int, runs: int) -> dict:
+    """
+    Time predict() one image at a time (decode excluded, pre/post included).
+
+    Images are decoded once up front so disk and JPEG cost do not pollute
+    the model latency.
+    """
+    import cv2
+
+    frames = [cv2.imread(str(path)) for path in images]
+    frames = [frame for frame in frames if frame is not None]
+
+    for index in range(warmup):
+        model.predict(frames[index % len(frames)], imgsz=imgsz, device="cpu", verbose=False)
+
+    latencies_ms = []
+    for index in range(runs):
+        frame = frames[index % len(frames)]
+        start_time = time.perf_counter()
+        model.predict(frame, imgsz=imgsz, device="cpu", verbose=False)
+        latencies_ms.append((time.perf_counter() - start_time) * 1000)
+
+    return {
+        "p50_ms": round(float(np.percentile(latencies_ms, 50)), 1),
+        "p99_ms": round(float(np.percentile(latencies_ms, 99)), 1),
+    }
+
+
+# ===========================================================================
+# Pareto table
+# ===========================================================================
+def mark_pareto(rows: list[dict]) -> None:
+    """Set row['pareto'] = True unless another row has >= mAP and <= p99 (one strict)."""
+    for row in rows:
+        row["pareto"] = not any(
+            other is not row
+            and other["map50"] >= row["map50"]
+            and other["p99_ms"] <= row["p99_ms"]
+            and (other["map50"] > row["map50"] or other["p99_ms"] < row["p99_ms"])
+            for other in rows
+        )
+
+
+def _cell(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "✓" if value else ""
+    return str(value)
+
+
+def print_table(rows: list[dict], classes: tuple[str, ...]) -> None:
+    columns = (["weights", "backend", "imgsz", "map50"]
+               + [f"recall_{name}" for name in classes]
+               + ["p50_ms", "p99_ms", "pareto"])
+    print()
+    print("| " + " | ".join(columns) + " |")
+    print("|" + "|".join("---" for _ in columns) + "|")
+    for row in sorted(rows, key=lambda r: (r["p99_ms"], -r["map50"])):
+        print("| " + " | ".join(_cell(row[c]) for c in columns) + " |")
+
+
+def recommend(rows: list[dict], budget_ms: float, classes: tuple[str, ...]) -> dict | None:
+    """Highest mAP@50 Pareto row whose p99 fits the budget (ties → min recall)."""
+    candidates = [row for row in rows if row["pareto"] and row["p99_ms"] <= budget_ms]
+    if not candidates:
+        return None
+
+    def min_recall(row):
+        recalls = [row[f"recall_{name}"] for name in classes if row[f"recall_{name}"] is not None]
+        return min(recalls) if recalls else 0.0
+
+    return max(candidates, key=lambda row: (row["map50"], min_recall(row)))
+
+
+def print_ship(best: dict, rows: list[dict], budget_ms: float,
+               classes: tuple[str, ...]) -> None:
+    """Shipping instruction for the recommendation, limited to servable backends."""
+    if best["backend"] in SERVABLE_BACKENDS:
+        print(f"Ship: copy to vision-ai/best.pt and set MODEL_INPUT_SIZE = {best['imgsz']}")
+        return
+
+    print(f"Warning: vision-ai/app.py cannot serve {best['backend']} exports yet — "
+          f"falling back to the best {'/'.join(SERVABLE_BACKENDS)} row")
+    # Pareto is re-marked within the servable rows: an export may dominate them all
+    servable = [dict(row) for row in rows if row["backend"] in SERVABLE_BACKENDS]
+    mark_pareto(servable)
+    fallback = recommend(servable, budget_ms, classes)
+    if fallback is None:
+        print(f"No {'/'.join(SERVABLE_BACKENDS)} model meets p99 <= {budget_ms:g} ms")
+        return
+    print(f"Ship ({fallback['backend']}): {fallback['weights']} @ {fallback['imgsz']} "
+          f"— mAP50={fallback['map50']}, p99={fallback['p99_ms']}ms")
+    print(f"  copy to vision-ai/best.pt and set MODEL_INPUT_SIZE = {fallback['imgsz']}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Latency/accuracy sweep over candidate weights")
+    parser.add_argument("--weights", nargs="+", type=Path, required=True,
+                        help="Candidate .pt files")
+    parser.add_argument("--data", type=Path, default=DEFAULT_DATA,
+                        help="Dataset yaml (val split is used)")
+    parser.add_argument("--imgsz", default="320,480,640",
+                        help="Comma-separated input sizes")
+    parser.add_argument("--backends", default="pytorch,onnx",
+                        help=f"Comma-separated: {', '.join(BACKEND_FORMATS)}")
+    parser.add_argument("--classes", default=",".join(DEFAULT_CLASSES),
+                        help="Classes to report recall for")
+    parser.add_argument("--latency-images", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--runs", type=int, default=100)
+    parser.add_argument("--budget-ms", type=float, default=CONTROL_TICK_MS,
+                        help="p99 latency budget for the recommendation")
+    parser.add_argument("--csv", type=Path, help="Write the table to CSV")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.imgsz.split(",")]
+    backends = [backend.strip() for backend in args.backends.split(",")]
+    classes = tuple(name.strip() for name in args.classes.split(","))
+    unknown = [backend for backend in backends if backend not in BACKEND_FORMATS]
+    if unknown:
+        parser.error(f"Unknown backend(s): {', '.join(unknown)}")
+
+    images = validation_images(args.data, args.latency_images)
+    logger.info(f"{len(images)} validation images for latency, "
+                f"{len(args.weights)} weights × {len(backends)} backends × {len(sizes)} sizes")
+
+    rows = []
+    for weights in args.weights:
+        for backend in backends:
+            for imgsz in sizes:
+                label = f"{weights} [{backend} @ {imgsz}]"
+                try:
+                    model = load_backend(weights, backend, imgsz)
+                    row = {"weights": str(weights), "backend": backend, "imgsz": imgsz}
+                    row.update(evaluate_accuracy(model, args.data, imgsz, classes))
+                    row.update(measure_latency(model, images, imgsz, args.warmup, args.runs))
+                except Exception as e:
+                    logger.error(f"Skipping {label}: {e}")
+                    continue
+                logger.info(f"{label}: mAP50={row['map50']} p50={row['p50_ms']}ms p99={row['p99_ms']}ms")
+                rows.append(row)
+
+    if not rows:
+        logger.error("No combination could be evaluated")
+        return 1
+
+    mark_pareto(rows)
+    print_table(rows, classes)
+
+    best = recommend(rows, args.budget_ms, classes)
+    if best is None:
+        print(f"\nNo Pareto-optimal model meets p99 <= {args.budget_ms:g} ms")
+    else:
+        print(f"\nRecommended (p99 <= {args.budget_ms:g} ms): {best['weights']} "
+              f"[{best['backend']} @ {best['imgsz']}] — mAP50={best['map50']}, p99={best['p99_ms']}ms")
+        print_ship(best, rows, args.budget_ms, classes)
+
+    if args.csv:
+        with args.csv.open("w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+            writer.writeheader()
+            writer.writerows(rows)
+        logger.info(f"Wrote {args.csv}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())